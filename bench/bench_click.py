@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Counts WebDriver commands (and wall time) per click against a fake driver.
+
+    $ python bench/bench_click.py [latency_ms]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from seleniumwrapper.wrapper import SeleniumWrapper
+
+
+class CountingDriver(WebDriver):
+    """Answers every command locally, as a resting, visible and clickable element."""
+
+    responses = {Command.GET_ELEMENT_LOCATION: {"x": 10, "y": 20},
+                 Command.IS_ELEMENT_DISPLAYED: True,
+                 Command.CLICK_ELEMENT: None,
+                 Command.GET_ELEMENT_TAG_NAME: "a",
+                 Command.EXECUTE_SCRIPT: {"x": 10, "y": 20, "displayed": True, "blockers": [],
+                                          "visibility": "visible", "display": "inline",
+                                          "height": "10px", "width": "10px"}}
+
+    def __init__(self, latency=0):
+        self.session_id = "bench"
+        self.w3c = False
+        self.latency = latency
+        self.commands = 0
+
+    def execute(self, driver_command, params=None):
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return {"value": self.responses[driver_command]}
+
+
+def run(scripted, latency, clicks=20):
+    driver = CountingDriver(latency)
+    element = SeleniumWrapper(WebElement(driver, "element-1"))
+    started = time.time()
+    for i in range(clicks):
+        element.click(scripted=scripted)
+    elapsed = time.time() - started
+    return float(driver.commands) / clicks, elapsed / clicks * 1000
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.02
+    for label, scripted in (("polling trio", False), ("scripted", True)):
+        commands, msec = run(scripted, latency)
+        print("{0:>14}: {1:5.1f} commands/click {2:8.1f} ms/click".format(label, commands, msec))
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Fills a form of text inputs, checkboxes and selects on FakeWebDriver:
+field by field (by_name, clear and send_keys, click or Select) and with
+fill_form. Commands, simulated milliseconds (at latency milliseconds per
+command) and CPU milliseconds are reported.
+
+    $ python bench/bench_form.py [latency_ms] [fields]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.wrapper import SeleniumWrapper
+from seleniumwrapper_testing.fake import FakeWebDriver
+
+URL = "http://bench/"
+KINDS = ("text", "checkbox", "select")
+
+
+def field(i):
+    kind = KINDS[i % len(KINDS)]
+    if kind == "select":
+        return "<select name='f{0}'><option>no</option><option>yes</option></select>".format(i)
+    return "<input type='{1}' name='f{0}'>".format(i, kind)
+
+
+def values(fields):
+    return dict(("f{0}".format(i), [str(i), True, "yes"][i % len(KINDS)]) for i in range(fields))
+
+
+def per_field(wrapper, mapping):
+    for name, value in sorted(mapping.items()):
+        element = wrapper.by_name(name)
+        if value is True:
+            element.click()
+        elif value == "yes":
+            element.to_select.select_by_visible_text(value)
+        else:
+            element.clear()
+            element.send_keys(value)
+
+
+def one_shot(wrapper, mapping):
+    results = wrapper.fill_form(mapping)
+    assert all([result.ok for result in results.values()])
+
+
+def run(fill, latency, fields):
+    clock = VirtualClock()
+    html = "<html><body><form>{0}</form></body></html>".format("".join([field(i) for i in range(fields)]))
+    driver = FakeWebDriver({URL: html}, clock=clock, latency=latency)
+    wrapper = SeleniumWrapper(driver, clock=clock)
+    wrapper.get(URL)
+    before = driver.browser.total
+    simulated, started = clock.time(), time.time()
+    fill(wrapper, values(fields))
+    return driver.browser.total - before, (clock.time() - simulated) * 1000, (time.time() - started) * 1000
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.002
+    fields = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    for name, fill in (("per field", per_field), ("fill_form", one_shot)):
+        commands, simulated, cpu = run(fill, latency, fields)
+        print("{0:>10}: {1:5d} commands {2:9.1f} ms simulated {3:8.1f} ms cpu".format(name, commands, simulated, cpu))
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Compares building locators per call with the memoised ones and, given a
+drivername, CSS with XPath lookups of the same locators on a fixture page.
+
+    $ python bench/bench_locator.py [drivername]
+"""
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from seleniumwrapper import locator
+from seleniumwrapper.locator import tag
+
+ROWS = 2000
+
+LOCATORS = {"checkbox": tag("input").attr("type", "checkbox").attr("name", "row-1999"),
+            "class": tag("a").has_class("nav").contains("href", "/page/1999"),
+            "button": tag("input").attr("type", ("submit", "button")).attr("value", "Send")}
+
+
+def fixture():
+    rows = ["<tr><td><input type='checkbox' name='row-{0}'></td>"
+            "<td><a class='item nav' href='/page/{0}'>page {0}</a></td></tr>".format(i) for i in range(ROWS)]
+    html = "<html><body><table>{0}</table><form><input type='submit' value='Send'></form></body></html>"
+    handle, path = tempfile.mkstemp(suffix=".html")
+    with os.fdopen(handle, "w") as f:
+        f.write(html.format("".join(rows)))
+    return path
+
+
+def bench_compile(number=20000):
+    per_call = timeit.timeit(lambda: tag("input").attr("type", "checkbox").attr("name", "agree").compile(),
+                             number=number)
+    memoised = timeit.timeit(lambda: locator.by_tag("input", {"type": "checkbox", "name": "agree"}),
+                             number=number)
+    print("{0:>10}: {1:8.2f} us/locator".format("built", per_call / number * 1e6))
+    print("{0:>10}: {1:8.2f} us/locator".format("memoised", memoised / number * 1e6))
+
+
+def bench_lookup(drivername, number=50):
+    from seleniumwrapper import create
+    path = fixture()
+    br = create(drivername)
+    try:
+        br.get("file://" + path)
+        for name, loc in sorted(LOCATORS.items()):
+            type, target = loc.compile()
+            xpath = loc._xpath()
+            for label, args in ((type, (type, target)), ("xpath", ("xpath", xpath))):
+                started = time.time()
+                for i in range(number):
+                    br.waitfor(*args, eager=True)
+                msec = (time.time() - started) / number * 1000
+                print("{0:>10} {1:>6}: {2:8.2f} ms/lookup".format(name, label, msec))
+    finally:
+        br.quit()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    bench_compile()
+    if len(sys.argv) > 1:
+        bench_lookup(sys.argv[1])
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Measures the cost of attribute delegation and the size of wrapper objects.
+
+    $ python bench/bench_proxy.py
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from seleniumwrapper.wrapper import SeleniumWrapper, SeleniumContainerWrapper
+
+
+class FakeDriver(WebDriver):
+    def __init__(self):
+        self.session_id = "bench"
+        self.element = FakeElement(self, "element-1")
+
+    def find_element_by_id(self, target):
+        return self.element
+
+    def execute_script(self, script, *args):
+        return None
+
+    @property
+    def title(self):
+        return "bench"
+
+
+class FakeElement(WebElement):
+    @property
+    def text(self):
+        return "text"
+
+
+def per_call(stmt, namespace, number=200000):
+    best = min(timeit.repeat(stmt, globals=namespace, number=number, repeat=5))
+    return best / number * 1e9
+
+
+def bytes_per_wrapper(factory, count=10000):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory() for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    allocated -= sys.getsizeof(objects)
+    return float(allocated) / count
+
+
+if __name__ == "__main__":
+    driver = FakeDriver()
+    namespace = {"driver": driver,
+                 "wrapper": SeleniumWrapper(driver),
+                 "element": SeleniumWrapper(driver.element),
+                 "container": SeleniumContainerWrapper([driver.element] * 10)}
+    cases = [("raw method call", "driver.execute_script('')"),
+             ("delegated method call", "wrapper.execute_script('')"),
+             ("delegated method (wrapping)", "wrapper.find_element_by_id('hoge')"),
+             ("delegated property", "wrapper.title"),
+             ("element property", "element.text"),
+             ("container delegation", "container.count(None)"),
+             ("explicit attribute", "wrapper.timeout")]
+    for label, stmt in cases:
+        print("{0:>28}: {1:8.1f} ns/call".format(label, per_call(stmt, namespace)))
+    print("{0:>28}: {1:8.1f} bytes".format("SeleniumWrapper",
+                                           bytes_per_wrapper(lambda: SeleniumWrapper(driver.element))))
+    print("{0:>28}: {1:8.1f} bytes".format("SeleniumContainerWrapper",
+                                           bytes_per_wrapper(lambda: SeleniumContainerWrapper([]))))
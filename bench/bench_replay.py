@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Records a scenario on FakeWebDriver, then runs it again on the recording
+at zero latency: commands by name, milliseconds the commands took when
+recorded and CPU milliseconds spent by the wrapper (and replay) per command.
+
+    $ python bench/bench_replay.py
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.replay import ReplayWebDriver, load, record
+from seleniumwrapper.wrapper import SeleniumWrapper
+from seleniumwrapper_testing.fake import FakePage, FakeWebDriver
+
+URL = "http://bench/"
+HTML = """<html><body><div id='main'>
+<ul>{0}</ul><form><input type='text' name='q'><button id='go'>Go</button></form>
+</div></body></html>""".format("".join(["<li><a href='/{0}'>{0}</a></li>".format(i) for i in range(50)]))
+
+
+def scenario(wrapper):
+    wrapper.get(URL)
+    wrapper.by_name("q").send_keys("query")
+    wrapper.by_id("go").click()
+    links = wrapper.css("li a", eager=True)
+    return list(zip(links.texts(), links.attrs("href")))
+
+
+def recorded():
+    clock = VirtualClock()
+    page = FakePage(HTML).on("id", "go", appears=0.2, blocked=0.3)
+    driver = FakeWebDriver({URL: page}, clock=clock, latency=0.002)
+    wrapper = SeleniumWrapper(driver, clock=clock)
+    target = io.StringIO()
+    recorder = record(wrapper, target)
+    scenario(wrapper)
+    recorder.flush()
+    target.seek(0)
+    return load(target)
+
+
+if __name__ == "__main__":
+    records = recorded()
+    clock = VirtualClock()
+    driver = ReplayWebDriver(records, clock=clock)
+    wrapper = SeleniumWrapper(driver, clock=clock)
+    started = time.time()
+    scenario(wrapper)
+    cpu = (time.time() - started) * 1000
+    total = sum(driver.commands.values())
+    for name, count in sorted(driver.commands.items()):
+        print("{0:>24}: {1:5d}".format(name, count))
+    print("{0:>24}: {1:5d} commands {2:9.1f} ms recorded {3:8.3f} ms cpu/command".format(
+        "total", total, sum([r["t"] for r in records]) * 1000, cpu / max(total, 1)))
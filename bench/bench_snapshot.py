@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Reads text and href of every link of a page on FakeWebDriver: per element,
+with bulk reads of a container, and from a snapshot with each parser.
+Commands, simulated milliseconds (at latency milliseconds per command) and
+CPU milliseconds are reported.
+
+    $ python bench/bench_snapshot.py [latency_ms] [links]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from seleniumwrapper import snapshot
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.wrapper import SeleniumWrapper
+from seleniumwrapper_testing.fake import FakeWebDriver
+
+URL = "http://bench/"
+
+
+def page(links):
+    rows = ["<li><a class='item' href='/page/{0}'>page {0}</a></li>".format(i) for i in range(links)]
+    return "<html><body><ul>{0}</ul></body></html>".format("".join(rows))
+
+
+def per_element(wrapper):
+    links = wrapper.css("a.item", eager=True)
+    return [(link.text, link.get_attribute("href")) for link in links]
+
+
+def bulk(wrapper):
+    links = wrapper.css("a.item", eager=True)
+    return list(zip(links.texts(), links.attrs("href")))
+
+
+def snapshotted(parser):
+    def read(wrapper):
+        links = wrapper.snapshot(parser).css("a.item", eager=True)
+        return list(zip(links.texts(), links.attrs("href")))
+    return read
+
+
+def run(read, latency, links):
+    clock = VirtualClock()
+    driver = FakeWebDriver({URL: page(links)}, clock=clock, latency=latency)
+    wrapper = SeleniumWrapper(driver, clock=clock)
+    wrapper.get(URL)
+    before = driver.browser.total
+    simulated, started = clock.time(), time.time()
+    rows = read(wrapper)
+    assert len(rows) == links
+    return driver.browser.total - before, (clock.time() - simulated) * 1000, (time.time() - started) * 1000
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.002
+    links = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    readers = [("per element", per_element), ("bulk", bulk)]
+    readers += [("snapshot " + parser, snapshotted(parser)) for parser in sorted(snapshot._TREES)]
+    for name, read in readers:
+        commands, simulated, cpu = run(read, latency, links)
+        print("{0:>14}: {1:5d} commands {2:9.1f} ms simulated {3:8.1f} ms cpu".format(
+            name, commands, simulated, cpu))
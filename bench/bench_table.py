@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Extracts a table on FakeWebDriver: cell by cell over rows found with
+xpath, and with table() at a few chunk sizes. Commands, simulated
+milliseconds (at latency milliseconds per command) and CPU milliseconds
+are reported.
+
+    $ python bench/bench_table.py [latency_ms] [rows]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.wrapper import SeleniumWrapper
+from seleniumwrapper_testing.fake import FakeWebDriver
+
+URL = "http://bench/"
+COLUMNS = 5
+
+
+def page(rows):
+    head = "<tr>{0}</tr>".format("".join(["<th>c{0}</th>".format(i) for i in range(COLUMNS)]))
+    body = "".join(["<tr>{0}</tr>".format("".join(["<td>{0}.{1}</td>".format(r, c) for c in range(COLUMNS)]))
+                    for r in range(rows)])
+    return "<html><body><table id='data'><thead>{0}</thead><tbody>{1}</tbody></table></body></html>".format(
+        head, body)
+
+
+def per_cell(wrapper):
+    rows = wrapper.xpath("//table[@id='data']/tbody/tr", eager=True)
+    return [[cell.text for cell in row.xpath("./td", eager=True)] for row in rows]
+
+
+def chunked(size):
+    def extract(wrapper):
+        return list(wrapper.table("#data", chunk_size=size))
+    return extract
+
+
+def run(extract, latency, rows):
+    clock = VirtualClock()
+    driver = FakeWebDriver({URL: page(rows)}, clock=clock, latency=latency)
+    wrapper = SeleniumWrapper(driver, clock=clock)
+    wrapper.get(URL)
+    before = driver.browser.total
+    simulated, started = clock.time(), time.time()
+    extracted = extract(wrapper)
+    assert len(extracted) == rows and extracted[-1][-1] == "{0}.{1}".format(rows - 1, COLUMNS - 1)
+    return driver.browser.total - before, (clock.time() - simulated) * 1000, (time.time() - started) * 1000
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.002
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    extractors = [("per cell", per_cell)] + [("table({0})".format(size), chunked(size)) for size in (50, 200, 1000)]
+    for name, extract in extractors:
+        commands, simulated, cpu = run(extract, latency, rows)
+        print("{0:>12}: {1:5d} commands {2:9.1f} ms simulated {3:8.1f} ms cpu".format(name, commands, simulated, cpu))
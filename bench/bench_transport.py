@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""Measures HTTP requests and latency (p50/p99) per operation of connect()
+sessions against a local fake WebDriver server, for each transport.
+
+    $ python bench/bench_transport.py [operations]
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import selenium.webdriver
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from seleniumwrapper.transport import PooledRemoteConnection
+from seleniumwrapper.wrapper import SeleniumWrapper
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+
+
+class FakeWebDriverHandler(BaseHTTPRequestHandler):
+    """Answers the JSON wire protocol as a page with one resting, visible link."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    requests = 0
+    readiness = {"x": 10, "y": 20, "displayed": True, "blockers": [],
+                 "visibility": "visible", "display": "inline", "height": "10px", "width": "10px"}
+
+    def _value(self):
+        path = self.path.rstrip("/")
+        if path.endswith("/session"):
+            return {"browserName": "fake"}
+        if path.endswith("/element"):
+            return {"ELEMENT": "element-1"}
+        if path.endswith("/execute"):
+            return self.readiness
+        if path.endswith("/location"):
+            return {"x": 10, "y": 20}
+        if path.endswith("/displayed"):
+            return True
+        if path.endswith("/title"):
+            return "fake"
+        return None
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        FakeWebDriverHandler.requests += 1
+        data = json.dumps({"sessionId": "bench", "status": 0, "value": self._value()}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_DELETE = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeWebDriverServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100.0))]
+
+
+OPERATIONS = (("title", lambda br: br.title),
+              ("find+click", lambda br: br.by_id("link").click()),
+              ("find+click scripted", lambda br: br.by_id("link").click(scripted=True)),
+              ("dump", lambda br: br.by_id("link")._dump()))
+
+
+def run(url, transport, operation, count):
+    executor = {"urllib": lambda: RemoteConnection(url, resolve_ip=False),
+                "keep_alive": lambda: RemoteConnection(url, keep_alive=True, resolve_ip=False),
+                "pooled": lambda: PooledRemoteConnection(url, resolve_ip=False)}[transport]()
+    br = SeleniumWrapper(selenium.webdriver.Remote(executor, {}))
+    operation(br)
+    FakeWebDriverHandler.requests = 0
+    samples = []
+    for i in range(count):
+        started = time.time()
+        operation(br)
+        samples.append((time.time() - started) * 1000)
+    return float(FakeWebDriverHandler.requests) / count, percentile(samples, 50), percentile(samples, 99)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    server = FakeWebDriverServer(("127.0.0.1", 0), FakeWebDriverHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = "http://127.0.0.1:{0}/wd/hub".format(server.server_port)
+    for label, operation in OPERATIONS:
+        for transport in ("urllib", "keep_alive", "pooled"):
+            requests, p50, p99 = run(url, transport, operation, count)
+            template = "{0:>20} {1:>10}: {2:4.1f} requests/op p50 {3:6.2f} ms p99 {4:6.2f} ms"
+            print(template.format(label, transport, requests, p50, p99))
+    server.shutdown()
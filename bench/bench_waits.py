@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Commands and time taken by waits of SeleniumWrapper on FakeWebDriver
+scenarios, with latency milliseconds per command. Waits run on VirtualClock,
+so simulated milliseconds are reported beside the CPU ones actually spent.
+
+    $ python bench/bench_waits.py [latency_ms]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.wrapper import SeleniumWrapper
+from seleniumwrapper_testing.fake import FakePage, FakeWebDriver
+
+URL = "http://bench/"
+HTML = "<html><body><div id='main'><button id='go'>Go</button></div></body></html>"
+SCENARIOS = (("appears late", {"appears": 0.2}),
+             ("moving", {"moves": 0.2}),
+             ("covered", {"blocked": 0.2}),
+             ("hidden", {"shown": 0.2}))
+
+
+def run(behaviour, latency, observe, scripted):
+    clock = VirtualClock()
+    page = FakePage(HTML).on("id", "go", **behaviour)
+    driver = FakeWebDriver({URL: page}, clock=clock, latency=latency)
+    wrapper = SeleniumWrapper(driver, timeout=5, observe=observe, clock=clock)
+    wrapper.get(URL)
+    before = driver.browser.total
+    simulated, started = clock.time(), time.time()
+    wrapper.by_id("go").click(scripted=scripted)
+    return driver.browser.total - before, (clock.time() - simulated) * 1000, (time.time() - started) * 1000
+
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.002
+    for name, behaviour in SCENARIOS:
+        for label, observe, scripted in (("polling", False, False), ("observe+scripted", True, True)):
+            commands, simulated, cpu = run(behaviour, latency, observe, scripted)
+            print("{0:>14} {1:>17}: {2:4d} commands {3:8.1f} ms simulated {4:8.1f} ms cpu".format(
+                name, label, commands, simulated, cpu))
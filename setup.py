@@ -47,6 +47,7 @@ setup(
     description='selenium webdriver wrapper to make manipulation easier.',
     long_description=long_description,
     install_requires=requires,
+    extras_require={'lxml': ['lxml', 'cssselect']},
     tests_require=tests_requires,
     test_suite='test'
 )
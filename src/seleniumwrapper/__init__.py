@@ -1,3 +1,5 @@
 from .wrapper import SeleniumWrapper, create, connect
+from .pool import SessionPool
+from .runner import run_parallel
 
-__all__ = ['SeleniumWrapper', 'create', 'connect']
+__all__ = ['SeleniumWrapper', 'SessionPool', 'create', 'connect', 'run_parallel']
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""asyncio front-end of SeleniumWrapper (Python 3.7+).
+
+WebDriver commands are blocking, so they run in a bounded thread pool while
+waits sleep with asyncio.sleep. One event loop can drive many sessions.
+"""
+
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from selenium.common.exceptions import (NoSuchElementException, TimeoutException,
+                                        NoAlertPresentException, StaleElementReferenceException)
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from . import locator
+from .wrapper import SeleniumWrapper, SeleniumContainerWrapper, _finder, _MISSING, _Refinding
+
+_default_executor = None
+
+
+def _get_default_executor():
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(max_workers=16)
+    return _default_executor
+
+
+async def _sleep(clock, seconds):
+    # a virtual clock advances at once, but the loop still gets the turn.
+    if clock.realtime:
+        await asyncio.sleep(seconds)
+    else:
+        clock.sleep(seconds)
+        await asyncio.sleep(0)
+
+
+async def _poll(poller, clock, site, timeout, condition, interval, ignored=(NoSuchElementException,), message=""):
+    # Poller.poll with asyncio.sleep. condition is a coroutine function.
+    schedule = poller.schedule(site, timeout, interval, clock)
+    try:
+        for delay in schedule:
+            if delay:
+                await _sleep(clock, delay)
+            try:
+                value = await condition()
+                if value:
+                    return value
+            except ignored:
+                pass
+    finally:
+        schedule.close()
+    raise TimeoutException(message)
+
+
+class AsyncSeleniumWrapper(object):
+    """Awaitable counterpart of SeleniumWrapper.
+
+    Finder methods, click, alert and performance are coroutines. Other
+    attributes are delegated to the wrapped object: methods become
+    coroutine functions and properties become awaitables::
+
+        >>> br = AsyncSeleniumWrapper(seleniumwrapper.connect("chrome", executor))
+        >>> await br.get("http://www.example.com")
+        >>> await (await br.by_id("main")).text
+    """
+    __slots__ = ("_wrapper", "_executor")
+
+    def __init__(self, driver, timeout=5, silent=False, executor=None, clock=None):
+        if not isinstance(driver, SeleniumWrapper):
+            driver = SeleniumWrapper(driver, timeout, silent, clock=clock)
+        self._wrapper = driver
+        self._executor = executor or _get_default_executor()
+
+    @property
+    def wrapper(self):
+        return self._wrapper
+
+    @property
+    def unwrap(self):
+        return self._wrapper.unwrap
+
+    @property
+    def timeout(self):
+        return self._wrapper.timeout
+
+    @timeout.setter
+    def timeout(self, timeout):
+        self._wrapper.timeout = timeout
+
+    @property
+    def silent(self):
+        return self._wrapper.silent
+
+    @silent.setter
+    def silent(self, true_or_false):
+        self._wrapper.silent = true_or_false
+
+    def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def _refinding(self, command):
+        # A stale element given by ElementCache is found again and the
+        # command retried once, as _Refinding does for SeleniumWrapper.
+        try:
+            return await command()
+        except StaleElementReferenceException as e:
+            if not isinstance(self._wrapper, _Refinding):
+                raise
+            await self._run(self._wrapper._refind, e)
+            return await command()
+
+    def _async(self, obj):
+        if isinstance(obj, SeleniumWrapper):
+            return AsyncSeleniumWrapper(obj, executor=self._executor)
+        if isinstance(obj, SeleniumContainerWrapper):
+            return AsyncSeleniumContainerWrapper(obj, executor=self._executor)
+        if isinstance(obj, (WebDriver, WebElement)):
+            return AsyncSeleniumWrapper(self._wrapper._spawn(obj), executor=self._executor)
+        return obj
+
+    def __getattr__(self, name):
+        # methods and properties of SeleniumWrapper come first (get, back,
+        # forward and refresh clear ElementCache), then the wrapped object's.
+        # The owner is looked up again on each call, as _refind replaces it.
+        owner = lambda: self._wrapper
+        classattr = None if name.startswith("_") else getattr(type(self._wrapper), name, None)
+        if not (isinstance(classattr, property) or inspect.isroutine(classattr)):
+            owner = lambda: self._wrapper.unwrap
+            classattr = getattr(type(owner()), name, None)
+        if isinstance(classattr, property):
+            return self._fetch(owner, name)
+        attr = getattr(owner(), name)
+        if inspect.isroutine(attr):
+            async def reaction(*args, **kwargs):
+                command = lambda: self._run(getattr(owner(), name), *args, **kwargs)
+                return self._async(await self._refinding(command))
+            return reaction
+        return attr
+
+    async def _fetch(self, owner, name):
+        return self._async(await self._refinding(lambda: self._run(getattr, owner(), name)))
+
+    async def waitfor(self, type, target, eager=False, timeout=None):
+        # SeleniumWrapper.waitfor, with ElementCache and observe mode, whose
+        # commands run in the executor while polling sleeps on the loop.
+        wrapper = self._wrapper
+        timeout = timeout or wrapper.timeout
+        cache = wrapper.cache
+        try:
+            if cache is None:
+                return self._async(wrapper._found(await self._search(type, target, eager, timeout), eager))
+            key = wrapper._cache_key(type, target, eager)
+            result = await self._run(cache.lookup, key, wrapper._driver)
+            if result is None:
+                result = await self._search(type, target, eager, timeout)
+                await self._run(cache.store, key, result, wrapper._driver)
+        except TimeoutException:
+            return wrapper._missing(type, target, timeout)
+        if eager:
+            return self._async(wrapper._found(result, eager))
+        return self._async(_Refinding(result, wrapper, type, target))
+
+    async def _search(self, type, target, eager, timeout):
+        wrapper = self._wrapper
+        result = _MISSING
+        if wrapper.observe:
+            result = await self._run(wrapper._observe_for, type, target, eager, timeout)
+        if result is _MISSING:
+            finder = _finder(type, target, eager)
+
+            async def found():
+                return await self._run(finder, wrapper.unwrap)
+
+            result = await _poll(wrapper.poller, wrapper.clock, "waitfor", timeout, found, 0.5)
+        elif not result:
+            raise TimeoutException()
+        return result
+
+    async def xpath(self, target, eager=False, timeout=None):
+        return await self.waitfor("xpath", target, eager, timeout)
+
+    async def css(self, target, eager=False, timeout=None):
+        return await self.waitfor("css", target, eager, timeout)
+
+    async def locate(self, locator, eager=False, timeout=None):
+        return await self.waitfor(*locator.compile(), eager=eager, timeout=timeout)
+
+    async def by_tag(self, tag, eager=False, timeout=None, **attributes):
+        return await self.waitfor(*locator.by_tag(tag, attributes), eager=eager, timeout=timeout)
+
+    async def by_text(self, text, tag="*", partial=False, eager=False, timeout=None):
+        return await self.waitfor(*locator.by_text(text, tag, partial), eager=eager, timeout=timeout)
+
+    async def by_class(self, target, eager=False, timeout=None):
+        return await self.waitfor("class", target, eager, timeout)
+
+    async def by_id(self, target, eager=False, timeout=None):
+        return await self.waitfor("id", target, eager, timeout)
+
+    async def by_name(self, target, eager=False, timeout=None):
+        return await self.waitfor("name", target, eager, timeout)
+
+    async def by_linktxt(self, target, eager=False, timeout=None, partial=False):
+        return await self.waitfor("partial_link_text" if partial else "link_text", target, eager, timeout)
+
+    async def href(self, partialurl=None, eager=False, timeout=None):
+        return await self.waitfor(*locator.href(partialurl), eager=eager, timeout=timeout)
+
+    async def img(self, alt=None, ext=None, eager=False, timeout=None):
+        return await self.waitfor(*locator.img(alt, ext), eager=eager, timeout=timeout)
+
+    async def button(self, value, eager=False, timeout=None):
+        return await self.waitfor(*locator.button(value), eager=eager, timeout=timeout)
+
+    async def checkbox(self, eager=False, timeout=None, **attributes):
+        attributes["type"] = "checkbox"
+        return await self.by_tag("input", eager, timeout, **attributes)
+
+    async def radio(self, eager=False, timeout=None, **attributes):
+        attributes["type"] = "radio"
+        return await self.by_tag("input", eager, timeout, **attributes)
+
+    async def attr(self, name):
+        return await self._run(self._wrapper.attr, name)
+
+    async def click(self, timeout=None, presleep=0, postsleep=0):
+        # always checks readiness with one script per polling (click(scripted=True)).
+        wrapper = self._wrapper
+        timeout = timeout or wrapper.timeout
+        if not isinstance(wrapper.unwrap, WebElement):
+            return
+        if presleep:
+            await _sleep(wrapper.clock, presleep)
+        progress = {"last": None, "errors": []}
+
+        async def ready():
+            return await self._run(wrapper._ready_step, progress)
+
+        try:
+            await _poll(wrapper.poller, wrapper.clock, "click.ready", timeout, ready, 0.01, ())
+        except TimeoutException:
+            raise wrapper._not_ready(progress, timeout)
+        if postsleep:
+            await _sleep(wrapper.clock, postsleep)
+
+    async def alert(self):
+        wrapper = self._wrapper
+
+        def displayed():
+            alert = wrapper.unwrap.switch_to_alert()
+            alert.text
+            return alert
+
+        async def condition():
+            return await self._run(displayed)
+
+        try:
+            return await _poll(wrapper.poller, wrapper.clock, "alert", wrapper.timeout, condition, 0.2,
+                               (NoAlertPresentException,))
+        except TimeoutException:
+            msg = "Wait for alert to be displayed for {sec} seconds, but it was not displayed.".format(sec=wrapper.timeout)
+            raise NoAlertPresentException(msg)
+
+    async def performance(self, timeout=None, wait=True):
+        # one execute_async_script (see SeleniumWrapper.get_performance)
+        return await self._run(self._wrapper.get_performance, timeout, wait)
+
+
+class AsyncSeleniumContainerWrapper(object):
+    """Awaitable counterpart of SeleniumContainerWrapper. Contained
+    elements are AsyncSeleniumWrapper and bulk reads are coroutines."""
+    __slots__ = ("_container", "_executor")
+
+    def __init__(self, container, executor=None):
+        if not isinstance(container, SeleniumContainerWrapper):
+            container = SeleniumContainerWrapper(container)
+        self._container = container
+        self._executor = executor or _get_default_executor()
+
+    @property
+    def container(self):
+        return self._container
+
+    def __len__(self):
+        return len(self._container)
+
+    def __getitem__(self, key):
+        obj = self._container[key]
+        if isinstance(obj, SeleniumWrapper):
+            return AsyncSeleniumWrapper(obj, executor=self._executor)
+        return obj
+
+    def __iter__(self):
+        for i in range(len(self._container)):
+            yield self[i]
+
+    def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, partial(fn, *args))
+
+    async def texts(self):
+        return await self._run(self._container.texts)
+
+    async def attrs(self, names):
+        return await self._run(self._container.attrs, names)
+
+    async def props(self, names):
+        return await self._run(self._container.props, names)
+
+    async def css_values(self, names):
+        return await self._run(self._container.css_values, names)
+
+    async def locations(self):
+        return await self._run(self._container.locations)
+
+    async def sizes(self):
+        return await self._run(self._container.sizes)
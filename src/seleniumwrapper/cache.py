@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+from . import scripts
+from .clock import Clock
+
+
+class ElementCache(object):
+    """LRU cache of found elements for one session.
+
+    Entries are dropped when the page changes: the token read by
+    scripts.GENERATION (url, document and structural mutation count) is
+    checked before a hit, at most once per recheck seconds of clock.
+    SeleniumWrapper also clears it on get, back, forward and refresh.
+    """
+
+    def __init__(self, size=256, recheck=0.5, clock=None):
+        if size < 1:
+            raise ValueError("size should be 1 or more. given {0}".format(size))
+        self.size = size
+        self.recheck = recheck
+        self.clock = clock or Clock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "refinds": 0}
+        self._entries = OrderedDict()
+        self._token = None
+        self._checked = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key, driver):
+        if key in self._entries:
+            self._validate(driver)
+        value = self._entries.pop(key, None)
+        if value is None:
+            self.stats["misses"] += 1
+            return None
+        self._entries[key] = value
+        self.stats["hits"] += 1
+        return value
+
+    def store(self, key, value, driver):
+        self._validate(driver, force=self._token is None)
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        if self._entries:
+            self.stats["invalidations"] += 1
+        self._entries.clear()
+        self._token = None
+        self._checked = None
+
+    def _validate(self, driver, force=False):
+        now = self.clock.time()
+        if not force and self._checked is not None and now - self._checked < self.recheck:
+            return
+        token = driver.execute_script(scripts.GENERATION)
+        self._checked = now
+        if token != self._token:
+            if self._entries:
+                self.stats["invalidations"] += 1
+                self._entries.clear()
+            self._token = token
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+
+class Clock(object):
+    """Real time: time() and sleep() of the time module.
+
+    Every wait of SeleniumWrapper reads and sleeps through the clock given
+    to it, so waits may run on VirtualClock instead.
+    """
+    realtime = True
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Simulated time which only advances by sleep() (or advance()), at once."""
+    realtime = False
+
+    def __init__(self, start=0.0):
+        self.now = float(start)
+        self.slept = 0.0
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            with self._lock:
+                self.now += seconds
+                self.slept += seconds
+
+    def advance(self, seconds):
+        with self._lock:
+            self.now += seconds
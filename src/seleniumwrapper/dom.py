@@ -0,0 +1,742 @@
+# -*- coding: utf-8 -*-
+"""Minimal in-process HTML DOM with the locator types of SeleniumWrapper.
+
+parse() builds a tree of Element and Text nodes and select() resolves
+id, name, tag, class, link_text, partial_link_text, css and xpath on it.
+CSS covers selector lists of compound selectors (tag, #id, .class and
+attribute selectors) joined by descendant and child combinators. XPath
+covers location paths with the common axes, predicates, unions and the
+string functions used by seleniumwrapper.locator.
+"""
+
+import re
+
+try:
+    from html.parser import HTMLParser
+except ImportError:
+    from HTMLParser import HTMLParser
+
+try:
+    _chr = unichr
+except NameError:
+    _chr = chr
+
+VOID_ELEMENTS = frozenset(["area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+                           "param", "source", "track", "wbr"])
+
+
+class Node(object):
+    __slots__ = ("parent", "__weakref__")
+
+    def __init__(self):
+        self.parent = None
+
+
+class Text(Node):
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        Node.__init__(self)
+        self.data = data
+
+    @property
+    def text(self):
+        return self.data
+
+
+class Element(Node):
+    """An element; the document itself is an Element whose tag is None."""
+    __slots__ = ("tag", "attrs", "children")
+
+    def __init__(self, tag, attrs=None, children=()):
+        Node.__init__(self)
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.children = []
+        for child in children:
+            self.append(child)
+
+    def append(self, child):
+        if not isinstance(child, Node):
+            child = Text(child)
+        child.parent = self
+        self.children.append(child)
+        return child
+
+    def remove(self, child):
+        self.children.remove(child)
+        child.parent = None
+
+    def get(self, name, default=None):
+        return self.attrs.get(name, default)
+
+    @property
+    def elements(self):
+        return [child for child in self.children if isinstance(child, Element)]
+
+    @property
+    def text(self):
+        """Concatenated text of all descendant text nodes."""
+        return "".join([node.data for node in self.iter() if isinstance(node, Text)])
+
+    @property
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+    def iter(self):
+        """Yields descendant nodes in document order, self excluded."""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            if isinstance(node, Element):
+                stack.extend(reversed(node.children))
+
+    def descendants(self):
+        return [node for node in self.iter() if isinstance(node, Element)]
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def contains(self, node):
+        return any([ancestor is self for ancestor in node.ancestors()])
+
+    def __repr__(self):
+        return "<Element {0} {1!r}>".format(self.tag, self.attrs)
+
+
+def _escape(value, quote=False):
+    value = value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return value.replace('"', "&quot;") if quote else value
+
+
+def start_tag(element):
+    attrs = "".join([' {0}="{1}"'.format(k, _escape("{0}".format(v), True)) for k, v in element.attrs.items()])
+    return "<{0}{1}>".format(element.tag, attrs)
+
+
+def serialize(node, accept=None):
+    """Returns outer HTML of node (inner HTML of a document), leaving out
+    elements for which accept(element) is false."""
+    if isinstance(node, Text):
+        return _escape(node.data)
+    inner = "".join([serialize(child, accept) for child in _children(node, accept)])
+    if node.tag is None:
+        return inner
+    if node.tag in VOID_ELEMENTS:
+        return start_tag(node)
+    return "{0}{1}</{2}>".format(start_tag(node), inner, node.tag)
+
+
+class _Builder(HTMLParser):
+    def __init__(self):
+        HTMLParser.__init__(self)
+        self.document = self.current = Element(None)
+
+    def handle_starttag(self, tag, attrs):
+        element = self.current.append(Element(tag, [(k, v if v is not None else "") for k, v in attrs]))
+        if tag not in VOID_ELEMENTS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.append(Element(tag, [(k, v if v is not None else "") for k, v in attrs]))
+
+    def handle_endtag(self, tag):
+        # closes tag and anything left open in it; stray end tags are ignored.
+        for node in [self.current] + list(self.current.ancestors()):
+            if node.tag == tag:
+                self.current = node.parent
+                return
+
+    def handle_data(self, data):
+        self.current.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(self.unescape("&{0};".format(name)))
+
+    def handle_charref(self, name):
+        self.handle_data(self.unescape("&#{0};".format(name)))
+
+
+def parse(html):
+    """Returns the document Element of html."""
+    builder = _Builder()
+    builder.feed(html)
+    builder.close()
+    return builder.document
+
+
+class SelectorError(ValueError):
+    pass
+
+
+# CSS
+
+_CSS_TOKEN = re.compile(r"""
+    \s*(?P<combinator>[>+~,])\s*
+  | (?P<space>\s+)
+  | (?P<tag>\*|[A-Za-z][\w-]*)
+  | \#(?P<id>(?:[\w-]|\\[0-9a-fA-F]{1,6}\s?|\\.)+)
+  | \.(?P<cls>(?:[\w-]|\\[0-9a-fA-F]{1,6}\s?|\\.)+)
+  | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$~|]?=)\s*(?:"(?P<dq>(?:[^"\\]|\\.)*)"|'(?P<sq>(?:[^'\\]|\\.)*)'|(?P<bare>[\w-]+))\s*)?\]
+""", re.VERBOSE)
+
+
+def _css_unescape(value):
+    value = re.sub(r"\\([0-9a-fA-F]{1,6})\s?", lambda m: _chr(int(m.group(1), 16)), value)
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+def _attribute_test(name, op, value):
+    if op is None:
+        return lambda e: name in e.attrs
+    if op == "=":
+        return lambda e: e.attrs.get(name) == value
+    if op == "*=":
+        return lambda e: value != "" and value in e.attrs.get(name, "")
+    if op == "^=":
+        return lambda e: value != "" and e.attrs.get(name, "").startswith(value)
+    if op == "$=":
+        return lambda e: value != "" and e.attrs.get(name, "").endswith(value)
+    if op == "~=":
+        return lambda e: value in e.attrs.get(name, "").split()
+    return lambda e: e.attrs.get(name) == value or e.attrs.get(name, "").startswith(value + "-")
+
+
+def _compile_css(selector):
+    # returns [[(combinator, [tests]), ...], ...] with compounds right to left.
+    groups, compounds, tests, combinator = [], [], [], " "
+    position = 0
+    selector = selector.strip()
+    while position < len(selector):
+        match = _CSS_TOKEN.match(selector, position)
+        if match is None or match.end() == position:
+            raise SelectorError("unsupported css selector: {0!r}".format(selector))
+        position = match.end()
+        kind = match.lastgroup if match.lastgroup not in ("dq", "sq", "bare", "op") else "attr"
+        if kind in ("combinator", "space"):
+            mark = match.group("combinator") or " "
+            if not tests:
+                raise SelectorError("unsupported css selector: {0!r}".format(selector))
+            compounds.append((combinator, tests))
+            tests = []
+            if mark == ",":
+                groups.append(compounds[::-1])
+                compounds, combinator = [], " "
+            elif mark in ("+", "~"):
+                raise SelectorError("unsupported css combinator: {0!r}".format(mark))
+            else:
+                combinator = mark
+        elif kind == "tag":
+            tag = match.group("tag").lower()
+            if tag != "*":
+                tests.append(lambda e, tag=tag: e.tag == tag)
+        elif kind == "id":
+            value = _css_unescape(match.group("id"))
+            tests.append(lambda e, value=value: e.attrs.get("id") == value)
+        elif kind == "cls":
+            value = _css_unescape(match.group("cls"))
+            tests.append(lambda e, value=value: value in e.classes)
+        else:
+            value = [match.group(g) for g in ("dq", "sq", "bare") if match.group(g) is not None]
+            value = _css_unescape(value[0]) if value else None
+            tests.append(_attribute_test(match.group("attr").lower(), match.group("op"), value))
+    if not tests:
+        raise SelectorError("unsupported css selector: {0!r}".format(selector))
+    compounds.append((combinator, tests))
+    groups.append(compounds[::-1])
+    return groups
+
+
+def _css_match(element, compounds):
+    combinator, tests = compounds[0]
+    if not all([test(element) for test in tests]):
+        return False
+    if len(compounds) == 1:
+        return True
+    if combinator == ">":
+        parent = element.parent
+        return parent is not None and parent.tag is not None and _css_match(parent, compounds[1:])
+    return any([_css_match(ancestor, compounds[1:]) for ancestor in element.ancestors() if ancestor.tag is not None])
+
+
+def css(scope, selector):
+    groups = _compile_css(selector)
+    return [e for e in scope.descendants() if any([_css_match(e, compounds) for compounds in groups])]
+
+
+# XPath
+
+_XPATH_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<string>"[^"]*"|'[^']*')
+    | (?P<number>\d+(?:\.\d*)?|\.\d+)
+    | (?P<op>//|::|\.\.|!=|<=|>=|[/()\[\]@,|=<>+.*-])
+    | (?P<name>[A-Za-z_][\w.-]*)
+    )\s*""", re.VERBOSE)
+
+_AXES = ("ancestor", "ancestor-or-self", "attribute", "child", "descendant", "descendant-or-self",
+         "following-sibling", "parent", "preceding-sibling", "self")
+_REVERSE_AXES = ("ancestor", "ancestor-or-self", "preceding-sibling")
+
+
+class Attribute(object):
+    __slots__ = ("name", "value", "parent")
+
+    def __init__(self, name, value, parent):
+        self.name = name
+        self.value = value
+        self.parent = parent
+
+    @property
+    def text(self):
+        return self.value
+
+
+def _tokenize(expression):
+    tokens, position = [], 0
+    while position < len(expression):
+        match = _XPATH_TOKEN.match(expression, position)
+        if match is None or match.end() == position:
+            raise SelectorError("unsupported xpath: {0!r}".format(expression))
+        position = match.end()
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+    return tokens
+
+
+def _string(value):
+    if isinstance(value, list):
+        return value[0].text if value else ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return "{0:d}".format(int(value)) if value == int(value) else "{0!r}".format(value)
+    return value
+
+
+def _number(value):
+    if isinstance(value, float):
+        return value
+    try:
+        return float(_string(value).strip())
+    except ValueError:
+        return float("nan")
+
+
+def _boolean(value):
+    if isinstance(value, float):
+        return value != 0 and value == value
+    return bool(value)
+
+
+def _compare(op, left, right):
+    if isinstance(left, list) or isinstance(right, list):
+        lefts = [node.text for node in left] if isinstance(left, list) else [left]
+        rights = [node.text for node in right] if isinstance(right, list) else [right]
+        return any([_compare(op, l, r) for l in lefts for r in rights])
+    if op in ("=", "!="):
+        if isinstance(left, bool) or isinstance(right, bool):
+            equal = _boolean(left) == _boolean(right)
+        elif isinstance(left, float) or isinstance(right, float):
+            equal = _number(left) == _number(right)
+        else:
+            equal = left == right
+        return equal if op == "=" else not equal
+    left, right = _number(left), _number(right)
+    return {"<": left < right, ">": left > right, "<=": left <= right, ">=": left >= right}[op]
+
+
+def _substring(c, value, start, length=None):
+    value, begin = _string(value), int(round(_number(start))) - 1
+    if length is None:
+        return value[max(begin, 0):]
+    end = begin + int(round(_number(length)))
+    return value[max(begin, 0):max(end, 0)]
+
+
+def _translate(c, value, source, replacement):
+    value, source, replacement = _string(value), _string(source), _string(replacement)
+    mapped = []
+    for ch in value:
+        index = source.find(ch)
+        if index == -1:
+            mapped.append(ch)
+        elif index < len(replacement):
+            mapped.append(replacement[index])
+    return "".join(mapped)
+
+
+def _name(c, nodes=None):
+    nodes = [c[0]] if nodes is None else nodes
+    return getattr(nodes[0], "tag", getattr(nodes[0], "name", "")) or "" if nodes else ""
+
+
+def _context_string(c, value):
+    return _string([c[0]] if value is None else value)
+
+
+# functions get the context (node, position, size, accept) and their arguments.
+_FUNCTIONS = {
+    "contains": lambda c, a, b: _string(b) in _string(a),
+    "starts-with": lambda c, a, b: _string(a).startswith(_string(b)),
+    "ends-with": lambda c, a, b: _string(a).endswith(_string(b)),
+    "concat": lambda c, *args: "".join([_string(a) for a in args]),
+    "normalize-space": lambda c, a=None: " ".join(_context_string(c, a).split()),
+    "string-length": lambda c, a=None: float(len(_context_string(c, a))),
+    "string": lambda c, a=None: _context_string(c, a),
+    "number": lambda c, a=None: _number(_context_string(c, a)),
+    "substring": _substring,
+    "translate": _translate,
+    "not": lambda c, a: not _boolean(a),
+    "true": lambda c: True,
+    "false": lambda c: False,
+    "count": lambda c, a: float(len(a)),
+    "position": lambda c: float(c[1]),
+    "last": lambda c: float(c[2]),
+    "name": _name,
+    "local-name": _name,
+}
+
+
+class _Step(object):
+    """One location step. apply(nodes, accept) returns the node-set it selects."""
+    __slots__ = ("axis", "test", "predicates")
+
+    def __init__(self, axis, test, predicates=()):
+        self.axis = axis
+        self.test = test
+        self.predicates = predicates
+
+    def candidates(self, node, accept):
+        axis = self.axis
+        if axis == "attribute":
+            if not isinstance(node, Element):
+                return []
+            return [Attribute(k, v, node) for k, v in node.attrs.items()]
+        if axis == "self":
+            return [node]
+        if axis in ("parent", "ancestor", "ancestor-or-self"):
+            ancestors = list(_ancestors(node))
+            if axis == "parent":
+                return ancestors[:1]
+            return ([node] if axis == "ancestor-or-self" else []) + ancestors
+        if axis in ("following-sibling", "preceding-sibling"):
+            if node.parent is None or isinstance(node, Attribute):
+                return []
+            siblings = _children(node.parent, accept)
+            index = siblings.index(node) if node in siblings else 0
+            if axis == "following-sibling":
+                return siblings[index + 1:]
+            return siblings[:index][::-1]
+        found = [node] if axis == "descendant-or-self" else []
+        if not isinstance(node, Element):
+            return found
+        if axis == "child":
+            return _children(node, accept)
+        stack = _children(node, accept)[::-1]
+        while stack:
+            current = stack.pop()
+            found.append(current)
+            if isinstance(current, Element):
+                stack.extend(_children(current, accept)[::-1])
+        return found
+
+    def matches(self, node):
+        test = self.test
+        if test == "node()":
+            return True
+        if test == "text()":
+            return isinstance(node, Text)
+        if self.axis == "attribute":
+            return test == "*" or node.name == test
+        if not isinstance(node, Element) or node.tag is None:
+            return False
+        return test == "*" or node.tag == test.lower()
+
+    def apply(self, nodes, accept):
+        found = []
+        for node in nodes:
+            candidates = [n for n in self.candidates(node, accept) if self.matches(n)]
+            found.extend(_filter(candidates, self.predicates, accept))
+        if len(nodes) == 1:
+            # a single context node yields no duplicates and a known order.
+            return found[::-1] if self.axis in _REVERSE_AXES else found
+        return _ordered(found)
+
+
+_DESCENDANT_OR_SELF = _Step("descendant-or-self", "node()")
+
+
+def _children(node, accept):
+    if accept is None:
+        return list(node.children)
+    return [child for child in node.children if not isinstance(child, Element) or accept(child)]
+
+
+def _ancestors(node):
+    node = node.parent
+    while node is not None:
+        yield node
+        node = node.parent
+
+
+def _root(node):
+    while node.parent is not None:
+        node = node.parent
+    return node
+
+
+def _filter(nodes, predicates, accept):
+    for predicate in predicates:
+        size = len(nodes)
+        kept = []
+        for position, node in enumerate(nodes, 1):
+            value = predicate((node, position, size, accept))
+            if isinstance(value, float):
+                value = value == position
+            if _boolean(value):
+                kept.append(node)
+        nodes = kept
+    return nodes
+
+
+def _ordered(nodes):
+    # removes duplicates and sorts nodes (of one tree) in document order.
+    seen = set()
+    unique = []
+    for node in nodes:
+        key = (id(node.parent), node.name) if isinstance(node, Attribute) else id(node)
+        if key not in seen:
+            seen.add(key)
+            unique.append(node)
+    if len(unique) < 2:
+        return unique
+    root = _root(unique[0])
+    order = {id(root): 0}
+    for index, node in enumerate(root.iter(), 1):
+        order[id(node)] = index
+
+    def key(node):
+        if isinstance(node, Attribute):
+            return (order.get(id(node.parent), 0), 1, node.name)
+        return (order.get(id(node), 0), 0, "")
+    return sorted(unique, key=key)
+
+
+def _then(nodes, step):
+    return lambda c: step.apply(nodes(c), c[3])
+
+
+class _Parser(object):
+    """Recursive descent parser compiling an expression into a function of
+    the context (node, position, size, accept)."""
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def compile(self):
+        compiled = self.or_expr()
+        if self.position != len(self.tokens):
+            self.error()
+        return compiled
+
+    def error(self):
+        raise SelectorError("unsupported xpath: {0!r}".format(self.expression))
+
+    def peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        kind, token = self.peek()
+        if kind is None or (value is not None and token != value):
+            self.error()
+        self.position += 1
+        return token
+
+    def at(self, *values):
+        kind, value = self.peek()
+        return kind in ("op", "name") and value in values
+
+    def binary(self, operand, operators):
+        left = operand()
+        while self.at(*operators):
+            op = self.take()
+            left = self.combine(op, left, operand())
+        return left
+
+    def combine(self, op, left, right):
+        if op == "or":
+            return lambda c: _boolean(left(c)) or _boolean(right(c))
+        if op == "and":
+            return lambda c: _boolean(left(c)) and _boolean(right(c))
+        if op == "+":
+            return lambda c: _number(left(c)) + _number(right(c))
+        if op == "-":
+            return lambda c: _number(left(c)) - _number(right(c))
+        if op == "|":
+            return lambda c: _ordered(left(c) + right(c))
+        return lambda c: _compare(op, left(c), right(c))
+
+    def or_expr(self):
+        return self.binary(self.and_expr, ("or",))
+
+    def and_expr(self):
+        return self.binary(self.equality, ("and",))
+
+    def equality(self):
+        return self.binary(self.relational, ("=", "!="))
+
+    def relational(self):
+        return self.binary(self.additive, ("<", ">", "<=", ">="))
+
+    def additive(self):
+        return self.binary(self.unary, ("+", "-"))
+
+    def unary(self):
+        if self.at("-"):
+            self.take()
+            operand = self.unary()
+            return lambda c: -_number(operand(c))
+        return self.binary(self.path, ("|",))
+
+    def path(self):
+        kind, value = self.peek()
+        if kind in ("string", "number") or (kind, value) == ("op", "(") or \
+                (kind == "name" and self.peek(1) == ("op", "(") and value not in ("node", "text")):
+            primary = self.primary()
+            predicates = self.predicates()
+            if predicates:
+                unfiltered = primary
+                primary = lambda c: _filter(unfiltered(c), predicates, c[3])
+            return self.steps(primary)
+        if self.at("/", "//"):
+            root = lambda c: [_root(c[0])]
+            kind, value = self.peek(1)
+            if self.at("/") and not (kind == "name" or value in (".", "..", "@", "*")):
+                self.take()
+                return root
+            return self.steps(root)
+        first = self.step()
+        return self.steps(lambda c: first.apply([c[0]], c[3]))
+
+    def steps(self, nodes):
+        while self.at("/", "//"):
+            if self.take() == "//":
+                nodes = _then(nodes, _DESCENDANT_OR_SELF)
+            nodes = _then(nodes, self.step())
+        return nodes
+
+    def primary(self):
+        kind, value = self.peek()
+        if kind == "string":
+            self.take()
+            return lambda c, value=value[1:-1]: value
+        if kind == "number":
+            self.take()
+            return lambda c, value=float(value): value
+        if value == "(":
+            self.take("(")
+            inner = self.or_expr()
+            self.take(")")
+            return inner
+        function = _FUNCTIONS.get(self.take())
+        if function is None:
+            self.error()
+        self.take("(")
+        args = []
+        while not self.at(")"):
+            args.append(self.or_expr())
+            if not self.at(")"):
+                self.take(",")
+        self.take(")")
+        return lambda c: function(c, *[arg(c) for arg in args])
+
+    def predicates(self):
+        predicates = []
+        while self.at("["):
+            self.take("[")
+            predicates.append(self.or_expr())
+            self.take("]")
+        return predicates
+
+    def step(self):
+        if self.at("."):
+            self.take()
+            return _Step("self", "node()")
+        if self.at(".."):
+            self.take()
+            return _Step("parent", "node()")
+        axis = "child"
+        if self.at("@"):
+            self.take()
+            axis = "attribute"
+        elif self.peek()[0] == "name" and self.peek(1) == ("op", "::"):
+            axis = self.take()
+            if axis not in _AXES:
+                self.error()
+            self.take("::")
+        kind, value = self.peek()
+        if value == "*":
+            test = self.take()
+        elif kind == "name" and self.peek(1) == ("op", "(") and value in ("node", "text"):
+            test = self.take() + "()"
+            self.take("(")
+            self.take(")")
+        elif kind == "name":
+            test = self.take()
+        else:
+            self.error()
+        return _Step(axis, test, self.predicates())
+
+
+_compiled = {}
+
+
+def xpath(scope, expression, accept=None):
+    """Returns the elements matched by expression evaluated at scope."""
+    compiled = _compiled.get(expression)
+    if compiled is None:
+        if len(_compiled) >= 256:
+            _compiled.clear()
+        compiled = _compiled[expression] = _Parser(expression).compile()
+    result = compiled((scope, 1, 1, accept))
+    if not isinstance(result, list):
+        raise SelectorError("xpath should select elements: {0!r}".format(expression))
+    return [node for node in result if isinstance(node, Element) and node.tag is not None]
+
+
+def link_text(element):
+    return " ".join(element.text.split())
+
+
+def select(scope, type, target, accept=None):
+    """Returns elements in scope matched by a (type, target) locator in
+    document order. Elements for which accept(element) is false are
+    treated as detached, together with their subtrees."""
+    if type == "xpath":
+        return xpath(scope, target, accept)
+    if type == "css":
+        found = css(scope, target)
+    elif type == "id":
+        found = [e for e in scope.descendants() if e.attrs.get("id") == target]
+    elif type == "name":
+        found = [e for e in scope.descendants() if e.attrs.get("name") == target]
+    elif type == "tag":
+        found = [e for e in scope.descendants() if e.tag == target.lower()]
+    elif type == "class":
+        found = [e for e in scope.descendants() if target in e.classes]
+    elif type == "link_text":
+        found = [e for e in scope.descendants() if e.tag == "a" and link_text(e) == target]
+    elif type == "partial_link_text":
+        found = [e for e in scope.descendants() if e.tag == "a" and target in link_text(e)]
+    else:
+        raise SelectorError("unsupported locator type: {0!r}".format(type))
+    if accept is None:
+        return found
+    return [e for e in found if accept(e) and all([accept(a) for a in e.ancestors() if a.tag is not None])]
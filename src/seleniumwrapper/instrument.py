@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""Per call instrumentation of SeleniumWrapper and SeleniumContainerWrapper.
+
+Nothing is patched until enable() is called, so instrumentation costs
+nothing while disabled::
+
+    >>> collector = instrument.Collector()
+    >>> instrument.enable(collector)
+    >>> br.by_id("main").click()
+    >>> instrument.disable()
+    >>> collector.dump()
+
+While enabled, public methods of the wrappers (and methods and properties
+delegated to the wrapped objects) report a Call to every hook, that is
+any object with record(call). Only the outermost call of each thread is
+reported; nested calls are accounted to it.
+"""
+
+import cProfile
+import pstats
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from functools import partial, wraps
+from types import FunctionType, MethodType
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from . import polling, wrapper
+
+_timer = getattr(time, "perf_counter", time.time)
+_state = threading.local()
+_hooks = ()
+_originals = {}
+_shimmed = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_MISSING = object()
+_TIMED_PROPERTIES = ("performance", "alert", "parent")
+_MISSED = (NoSuchElementException, TimeoutException)
+
+
+class Call(object):
+    """What one call did. locator is (type, target) of the elements looked
+    for, or None. outcome is one of 'ok', 'found', 'timeout', 'silent-None'
+    and 'error'."""
+    __slots__ = ("name", "locator", "elapsed", "commands", "polls", "outcome")
+
+    def __init__(self, name, locator=None, elapsed=0.0, commands=0, polls=0, outcome=None):
+        self.name = name
+        self.locator = locator
+        self.elapsed = elapsed
+        self.commands = commands
+        self.polls = polls
+        self.outcome = outcome
+
+    def __repr__(self):
+        template = "<Call {0} locator={1!r} {2:.3f}s commands={3} polls={4} {5}>"
+        return template.format(self.name, self.locator, self.elapsed, self.commands, self.polls, self.outcome)
+
+
+def _count_poll():
+    # polls are counted in the thread polling, not read from shared stats.
+    call = getattr(_state, "call", None)
+    if call is not None:
+        call.polls += 1
+
+
+def _driver_of(obj):
+    if isinstance(obj, wrapper.SeleniumWrapper):
+        return obj._driver
+    if isinstance(obj, wrapper.SeleniumContainerWrapper):
+        obj = obj._iterable[0] if len(obj._iterable) else None
+        obj = obj.unwrap if isinstance(obj, wrapper.SeleniumWrapper) else obj
+    if isinstance(obj, WebDriver):
+        return obj
+    if isinstance(obj, WebElement):
+        return obj.parent
+    return None
+
+
+def _shim(driver):
+    # counts commands by replacing execute of the driver instance.
+    if driver is None or driver in _shimmed:
+        return
+    with _lock:
+        if driver in _shimmed:
+            return
+        _shimmed[driver] = driver.__dict__.get("execute", _MISSING)
+        execute = driver.execute
+
+        def counted(*args, **kwargs):
+            call = getattr(_state, "call", None)
+            if call is not None:
+                call.commands += 1
+            for span in getattr(_state, "spans", ()):
+                span.commands += 1
+            return execute(*args, **kwargs)
+
+        driver.execute = counted
+
+
+def _begin(name, target, locator=None):
+    _shim(_driver_of(target))
+    call = _state.call = Call(name, locator)
+    _state.started = _timer()
+    return call
+
+
+def _end(call, result, error):
+    _state.call = None
+    call.elapsed = _timer() - _state.started
+    if error is not None:
+        call.outcome = "timeout" if isinstance(error, _MISSED) else "error"
+    elif call.locator is not None:
+        call.outcome = "silent-None" if result is None else "found"
+    else:
+        call.outcome = "ok"
+    for span in getattr(_state, "spans", ()):
+        span.polls += call.polls
+    for hook in _hooks:
+        hook.record(call)
+
+
+def _measure(name, target, function, args, kwargs, locator=None):
+    call = _begin(name, target, locator)
+    try:
+        result = function(*args, **kwargs)
+    except Exception as e:
+        _end(call, None, e)
+        raise
+    _end(call, result, None)
+    return result
+
+
+def _locator(name, args, kwargs):
+    if name == "waitfor":
+        return (args[0] if args else kwargs.get("type"),
+                args[1] if len(args) > 1 else kwargs.get("target"))
+    if name == "find_many":
+        locators = args[0] if args else kwargs.get("locators")
+        return ("find_many", ", ".join(sorted([str(key) for key in locators])))
+    return None
+
+
+def _timed(name, function):
+    @wraps(function)
+    def timed(self, *args, **kwargs):
+        call = getattr(_state, "call", None)
+        if call is not None:
+            if call.locator is None:
+                call.locator = _locator(name, args, kwargs)
+            return function(self, *args, **kwargs)
+        locator = _locator(name, args, kwargs)
+        return _measure(name, self, function, (self,) + args, kwargs, locator)
+    return timed
+
+
+def _timed_delegated(name, target, function):
+    def timed(*args, **kwargs):
+        if getattr(_state, "call", None) is not None:
+            return function(*args, **kwargs)
+        return _measure(name, target, function, args, kwargs)
+    # a partial as _chainreact returns, which _Refinding retries when stale.
+    return partial(timed)
+
+
+_chainreact = wrapper._chainreact
+
+
+def _timed_chainreact(obj, name, owner=None):
+    if getattr(_state, "call", None) is not None:
+        return _chainreact(obj, name, owner)
+    call = _begin(name, obj)
+    try:
+        result = _chainreact(obj, name, owner)
+    except Exception as e:
+        _end(call, None, e)
+        raise
+    if isinstance(result, (MethodType, partial)):
+        # only looked up; the call itself is measured.
+        _state.call = None
+        return _timed_delegated(name, obj, result)
+    _end(call, result, None)
+    return result
+
+
+def enable(*hooks):
+    """Starts reporting calls to hooks, replacing hooks given before."""
+    global _hooks
+    with _lock:
+        _hooks = tuple(hooks)
+        if _originals:
+            return
+        for cls in (wrapper.SeleniumWrapper, wrapper.SeleniumContainerWrapper):
+            for name, attr in list(cls.__dict__.items()):
+                if name.startswith("_"):
+                    continue
+                if isinstance(attr, FunctionType):
+                    timed = _timed(name, attr)
+                elif isinstance(attr, property) and name in _TIMED_PROPERTIES:
+                    timed = property(_timed(name, attr.fget), attr.fset)
+                else:
+                    continue
+                _originals[(cls, name)] = attr
+                setattr(cls, name, timed)
+        wrapper._chainreact = _timed_chainreact
+        polling._on_poll = _count_poll
+
+
+def disable():
+    """Stops reporting and restores everything enable() replaced."""
+    global _hooks
+    with _lock:
+        _hooks = ()
+        for (cls, name), attr in _originals.items():
+            setattr(cls, name, attr)
+        _originals.clear()
+        wrapper._chainreact = _chainreact
+        polling._on_poll = None
+        for driver, original in list(_shimmed.items()):
+            if original is _MISSING:
+                del driver.__dict__["execute"]
+            else:
+                driver.execute = original
+        _shimmed.clear()
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+@contextmanager
+def enabled(*hooks):
+    enable(*hooks)
+    try:
+        yield
+    finally:
+        disable()
+
+
+class Collector(object):
+    """Aggregates calls per name (counts, time, commands, polls, outcomes
+    and a histogram of elapsed seconds) and per locator.
+
+    With profile=True, span() also runs cProfile over its block; profiles
+    are kept as pstats.Stats per span name in profiles.
+    """
+
+    def __init__(self, bounds=(0.01, 0.05, 0.1, 0.5, 1, 5, 30), profile=False):
+        self.bounds = tuple(bounds)
+        self.profile = profile
+        self.stats = {}
+        self.locators = {}
+        self.profiles = {}
+        self._lock = threading.Lock()
+
+    def record(self, call):
+        with self._lock:
+            stat = self.stats.get(call.name)
+            if stat is None:
+                stat = self.stats[call.name] = {"calls": 0, "elapsed": 0.0, "max": 0.0, "commands": 0,
+                                                "polls": 0, "outcomes": {},
+                                                "histogram": [0] * (len(self.bounds) + 1)}
+            stat["calls"] += 1
+            stat["elapsed"] += call.elapsed
+            stat["max"] = max(stat["max"], call.elapsed)
+            stat["commands"] += call.commands
+            stat["polls"] += call.polls
+            stat["outcomes"][call.outcome] = stat["outcomes"].get(call.outcome, 0) + 1
+            stat["histogram"][self._bucket(call.elapsed)] += 1
+            if call.locator is not None:
+                stat = self.locators.get(call.locator)
+                if stat is None:
+                    stat = self.locators[call.locator] = {"calls": 0, "elapsed": 0.0, "max": 0.0, "outcomes": {}}
+                stat["calls"] += 1
+                stat["elapsed"] += call.elapsed
+                stat["max"] = max(stat["max"], call.elapsed)
+                stat["outcomes"][call.outcome] = stat["outcomes"].get(call.outcome, 0) + 1
+
+    def _bucket(self, elapsed):
+        for i, bound in enumerate(self.bounds):
+            if elapsed <= bound:
+                return i
+        return len(self.bounds)
+
+    def histogram(self, name):
+        """Returns [(upper bound in seconds, count), ...]. The last bound is None."""
+        counts = self.stats[name]["histogram"]
+        return list(zip(self.bounds + (None,), counts))
+
+    def slowest(self, n=10):
+        """Returns [((type, target), stat), ...] of n locators which took longest in total."""
+        with self._lock:
+            items = list(self.locators.items())
+        return sorted(items, key=lambda item: item[1]["elapsed"], reverse=True)[:n]
+
+    @contextmanager
+    def span(self, name):
+        """Records the block as a call named name. Commands (while enabled)
+        and polls of calls in the block are counted."""
+        call = Call(name)
+        spans = _state.spans = getattr(_state, "spans", ())
+        _state.spans = spans + (call,)
+        profiler = cProfile.Profile() if self.profile else None
+        if profiler is not None:
+            try:
+                profiler.enable()
+            except ValueError:
+                # another profiler (sys.setprofile) is active.
+                profiler = None
+        started = _timer()
+        try:
+            yield call
+            call.outcome = "ok"
+        except Exception:
+            call.outcome = "error"
+            raise
+        finally:
+            call.elapsed = _timer() - started
+            if profiler is not None:
+                profiler.disable()
+                with self._lock:
+                    if name in self.profiles:
+                        self.profiles[name].add(profiler)
+                    else:
+                        self.profiles[name] = pstats.Stats(profiler)
+            _state.spans = spans
+            self.record(call)
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+            self.locators = {}
+            self.profiles = {}
+
+    def dump(self, stream=None, top=10):
+        stream = stream or sys.stdout
+        with self._lock:
+            names = sorted(self.stats, key=lambda name: self.stats[name]["elapsed"], reverse=True)
+            stream.write("{0:<24}{1:>7}{2:>10}{3:>10}{4:>10}{5:>10}{6:>8}  outcomes\n".format(
+                "name", "calls", "total", "mean", "max", "commands", "polls"))
+            for name in names:
+                stat = self.stats[name]
+                outcomes = " ".join(["{0}={1}".format(k, v) for k, v in sorted(stat["outcomes"].items())])
+                stream.write("{0:<24}{1:>7}{2:>9.3f}s{3:>9.3f}s{4:>9.3f}s{5:>10}{6:>8}  {7}\n".format(
+                    name, stat["calls"], stat["elapsed"], stat["elapsed"] / stat["calls"], stat["max"],
+                    stat["commands"], stat["polls"], outcomes))
+            stream.write("\nhistogram (seconds)\n")
+            for name in names:
+                buckets = zip(self.bounds + (None,), self.stats[name]["histogram"])
+                cells = ["{0}{1}:{2}".format("<=" if bound is not None else ">", bound or self.bounds[-1], count)
+                         for bound, count in buckets if count]
+                stream.write("{0:<24}{1}\n".format(name, " ".join(cells)))
+        stream.write("\nslowest locators\n")
+        for (type, target), stat in self.slowest(top):
+            stream.write("{0:>9.3f}s{1:>7}  {2}:{3}\n".format(stat["elapsed"], stat["calls"], type, target))
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""Composable locators compiled once into CSS (when possible) or XPath.
+
+    >>> LOGIN = tag("input").attr("type", ("submit", "button")).attr("value", "Login")
+    >>> LOGIN.compile()
+    ('css', 'input[type="submit"][value="Login"], input[type="button"][value="Login"]')
+    >>> tag("td").text("O'Neil").compile()
+    ('xpath', './/td[text()="O\'Neil"]')
+    >>> br.locate(LOGIN).click()
+
+Locators are immutable, so page objects can declare them as constants;
+each compiles its selector only once.
+"""
+
+import itertools
+import re
+
+_NAME = re.compile(r"^(\*|[A-Za-z_][\w-]*)$")
+_compiled = {}
+_MAX_MEMO = 1024
+
+
+def xpath_literal(value):
+    """Quotes value as an XPath 1.0 string literal."""
+    if "'" not in value:
+        return "'{0}'".format(value)
+    if '"' not in value:
+        return '"{0}"'.format(value)
+    parts = value.split("'")
+    return "concat({0})".format(", \"'\", ".join(["'{0}'".format(part) for part in parts]))
+
+
+def css_string(value):
+    """Quotes value as a CSS string."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\a ")
+    return '"{0}"'.format(escaped)
+
+
+def css_identifier(value):
+    """Escapes value as a CSS identifier (class name)."""
+    escaped = re.sub(r"([^\w-])", r"\\\1", value)
+    if escaped[:1].isdigit():
+        escaped = "\\3{0} {1}".format(escaped[0], escaped[1:])
+    return escaped
+
+
+def _check_name(name):
+    if not _NAME.match(name):
+        raise ValueError("invalid tag or attribute name. given {0!r}".format(name))
+    return name
+
+
+class _Predicate(object):
+    """One condition on an element. css is None if CSS can't express it."""
+    __slots__ = ("css", "xpath")
+
+    def __init__(self, css, xpath):
+        self.css = css
+        self.xpath = xpath
+
+
+def _attr(name, op, value):
+    _check_name(name)
+    if value is None:
+        return _Predicate("[{0}]".format(name), "@{0}".format(name))
+    value = "{0}".format(value)
+    css = "[{0}{1}={2}]".format(name, op, css_string(value))
+    literal = xpath_literal(value)
+    if op == "":
+        xpath = "@{0}={1}".format(name, literal)
+    elif op == "*":
+        xpath = "contains(@{0}, {1})".format(name, literal)
+    elif op == "^":
+        xpath = "starts-with(@{0}, {1})".format(name, literal)
+    else:
+        xpath = "substring(@{0}, string-length(@{0}) - string-length({1}) + 1)={1}".format(name, literal)
+    return _Predicate(css, xpath)
+
+
+class Locator(object):
+    """Elements of tag matching all predicates. Every builder method returns
+    a new Locator. A tuple of values matches any of them."""
+    __slots__ = ("_tag", "_predicates", "_compiled")
+
+    def __init__(self, tag="*", predicates=()):
+        self._tag = _check_name(tag)
+        self._predicates = tuple(predicates)
+        self._compiled = None
+
+    def _with(self, *alternatives):
+        return type(self)(self._tag, self._predicates + (alternatives,))
+
+    def _attribute(self, name, op, value):
+        values = value if isinstance(value, tuple) else (value,)
+        return self._with(*[_attr(name, op, v) for v in values])
+
+    def attr(self, name, value=None):
+        """Attribute name equals value (or exists if value is None)."""
+        return self._attribute(name, "", value)
+
+    def contains(self, name, value):
+        return self._attribute(name, "*", value)
+
+    def startswith(self, name, value):
+        return self._attribute(name, "^", value)
+
+    def endswith(self, name, value):
+        return self._attribute(name, "$", value)
+
+    def has_class(self, name):
+        xpath = "contains(concat(' ', normalize-space(@class), ' '), {0})".format(xpath_literal(" " + name + " "))
+        return self._with(_Predicate("." + css_identifier(name), xpath))
+
+    def text(self, value, partial=False):
+        """Own text node equals (or contains) value. Only XPath can express it."""
+        values = value if isinstance(value, tuple) else (value,)
+        template = "contains(text(), {0})" if partial else "text()={0}"
+        return self._with(*[_Predicate(None, template.format(xpath_literal(v))) for v in values])
+
+    def __or__(self, other):
+        return Union(self, other)
+
+    def compile(self):
+        """Returns (type, target) for waitfor; 'css' when every predicate allows it."""
+        if self._compiled is None:
+            self._compiled = self._compile()
+        return self._compiled
+
+    def _compile(self):
+        if all([p.css is not None for alternatives in self._predicates for p in alternatives]):
+            return ("css", ", ".join(self._css_selectors()))
+        return ("xpath", self._xpath())
+
+    def _css_selectors(self):
+        return [self._tag + "".join([p.css for p in combination])
+                for combination in itertools.product(*self._predicates)]
+
+    def _xpath(self):
+        conditions = []
+        for alternatives in self._predicates:
+            if len(alternatives) == 1:
+                conditions.append(alternatives[0].xpath)
+            else:
+                conditions.append("(" + " or ".join([p.xpath for p in alternatives]) + ")")
+        if conditions:
+            return ".//{0}[{1}]".format(self._tag, " and ".join(conditions))
+        return ".//{0}".format(self._tag)
+
+    def __repr__(self):
+        return "<Locator {0}:{1}>".format(*self.compile())
+
+
+class Union(Locator):
+    """Elements matched by any of locators."""
+    __slots__ = ("_locators",)
+
+    def __init__(self, *locators):
+        Locator.__init__(self)
+        self._locators = tuple(itertools.chain(*[l._locators if isinstance(l, Union) else (l,) for l in locators]))
+
+    def _with(self, *alternatives):
+        return Union(*[locator._with(*alternatives) for locator in self._locators])
+
+    def _compile(self):
+        compiled = [locator.compile() for locator in self._locators]
+        if all([type == "css" for type, target in compiled]):
+            return ("css", ", ".join([target for type, target in compiled]))
+        return ("xpath", self._xpath())
+
+    def _xpath(self):
+        return " | ".join([locator._xpath() for locator in self._locators])
+
+
+class _Step(Locator):
+    """Locator whose tag is an XPath step used as given (svg:rect, td[2],
+    ...), as by_tag and by_text took before locators. Compiles to XPath."""
+    __slots__ = ()
+
+    def __init__(self, tag="*", predicates=()):
+        self._tag = tag
+        self._predicates = tuple(predicates)
+        self._compiled = None
+
+    def _compile(self):
+        return ("xpath", self._xpath())
+
+
+def tag(name="*"):
+    return Locator(name)
+
+
+def _tag_or_step(name):
+    return tag(name) if _NAME.match(name) else _Step(name)
+
+
+def compiled(key, build):
+    """Memoises build() (returning a Locator) by key and returns its (type, target)."""
+    found = _compiled.get(key)
+    if found is None:
+        if len(_compiled) >= _MAX_MEMO:
+            _compiled.clear()
+        found = _compiled[key] = build().compile()
+    return found
+
+
+def by_tag(name, attributes):
+    items = tuple(sorted([(k, "{0}".format(v)) for k, v in attributes.items()]))
+
+    def build():
+        locator = _tag_or_step(name)
+        for k, v in items:
+            locator = locator.attr(k, v)
+        return locator
+    return compiled(("tag", name, items), build)
+
+
+def by_text(text, name="*", partial=False):
+    return compiled(("text", text, name, partial), lambda: _tag_or_step(name).text(text, partial))
+
+
+def href(partialurl=None):
+    return compiled(("href", partialurl), lambda: tag("a").contains("href", partialurl) if partialurl else tag("a"))
+
+
+def img(alt=None, ext=None):
+    def build():
+        locator = tag("img")
+        if alt:
+            locator = locator.attr("alt", alt)
+        if ext:
+            locator = locator.contains("src", ext)
+        return locator
+    return compiled(("img", alt, ext), build)
+
+
+def button(value):
+    return compiled(("button", value), lambda: (tag("input").attr("type", ("submit", "button")).attr("value", value) |
+                                                 tag("button").text(value)))
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import random
+import threading
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from .clock import Clock
+
+_realtime = Clock()
+# called on each poll while seleniumwrapper.instrument is enabled.
+_on_poll = None
+
+
+class Poller(object):
+    """Polls a condition at the interval given by each call site.
+
+    Every wait of SeleniumWrapper goes through poll(). Counters of calls,
+    polls issued and seconds waited are kept per call site in stats,
+    shared by the threads polling with it. Time is read and slept with
+    clock (real time by default).
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def intervals(self, default):
+        interval = self.interval or default
+        while True:
+            yield interval
+
+    def poll(self, site, timeout, condition, interval, ignored=(NoSuchElementException,), message="", clock=None):
+        clock = clock or _realtime
+        schedule = self.schedule(site, timeout, interval, clock)
+        try:
+            for delay in schedule:
+                if delay:
+                    clock.sleep(delay)
+                try:
+                    value = condition()
+                    if value:
+                        return value
+                except ignored:
+                    pass
+        finally:
+            schedule.close()
+        raise TimeoutException(message)
+
+    def schedule(self, site, timeout, interval, clock=None):
+        """The poll loop without the polling, for callers which can't block
+        on clock.sleep (seleniumwrapper.aio): yields the seconds to sleep
+        before each poll, 0 before the first, until timeout seconds passed.
+        Counts the polls and, once closed or exhausted, the seconds waited."""
+        clock = clock or _realtime
+        lock = self._lock
+        with lock:
+            stat = self.stats.get(site)
+            if stat is None:
+                stat = self.stats[site] = {"calls": 0, "polls": 0, "waited": 0.0}
+            stat["calls"] += 1
+        started = clock.time()
+        endtime = started + timeout
+        intervals = self.intervals(interval)
+        delay = 0
+        try:
+            while True:
+                with lock:
+                    stat["polls"] += 1
+                if _on_poll is not None:
+                    _on_poll()
+                yield delay
+                remaining = endtime - clock.time()
+                if remaining <= 0:
+                    break
+                delay = min(next(intervals), remaining)
+        finally:
+            waited = clock.time() - started
+            with lock:
+                stat["waited"] += waited
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+
+class Fixed(Poller):
+    """Polls at the given interval, or at the call site's one if omitted."""
+
+
+class Backoff(Poller):
+    """Starts at the given interval (or the call site's one) and multiplies
+    it by factor after each poll, up to cap seconds."""
+
+    def __init__(self, interval=None, factor=2, cap=1.0):
+        super(Backoff, self).__init__(interval)
+        self.factor = factor
+        self.cap = cap
+
+    def intervals(self, default):
+        interval = self.interval or default
+        while True:
+            yield min(interval, self.cap)
+            interval *= self.factor
+
+
+class Jittered(Poller):
+    """Wraps another poller (or polls at the given interval) and randomizes
+    each interval by +-jitter ratio, so that many sessions don't hit the
+    grid in lockstep."""
+
+    def __init__(self, interval=None, jitter=0.5, poller=None):
+        super(Jittered, self).__init__(interval)
+        self.jitter = jitter
+        self.poller = poller or Poller(interval)
+
+    def intervals(self, default):
+        for interval in self.poller.intervals(default):
+            yield interval * random.uniform(1 - self.jitter, 1 + self.jitter)
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import threading
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from .clock import Clock
+from .wrapper import SeleniumWrapper, create
+
+
+class _Session(object):
+    __slots__ = ("driver", "created", "uses")
+
+    def __init__(self, driver, created):
+        self.driver = driver
+        self.created = created
+        self.uses = 0
+
+
+class SessionPool(object):
+    """Keeps started browsers around so that scenarios don't pay their startup.
+
+    factory is a drivername for create() or a callable returning a WebDriver
+    (or a SeleniumWrapper). min_size sessions are started in background
+    threads ahead of time and at most max_size sessions exist at once.
+    A session is quit instead of being reused after max_uses checkouts or
+    max_age seconds, measured on clock. timeout, silent and clock are given
+    to checked out wrappers, while checkout waits at most checkout_timeout
+    seconds for a session.
+    """
+
+    def __init__(self, factory, min_size=0, max_size=4, max_uses=None, max_age=None,
+                 timeout=5, silent=False, reset=True, checkout_timeout=30, clock=None):
+        if isinstance(factory, str):
+            drivername = factory
+            factory = lambda: create(drivername)
+        if not callable(factory):
+            msg = "factory should be a drivername or callable. given {0}".format(type(factory))
+            raise TypeError(msg)
+        if not 0 <= min_size <= max_size or max_size < 1:
+            msg = "0 <= min_size <= max_size and 1 <= max_size are required. given {0}, {1}".format(min_size, max_size)
+            raise ValueError(msg)
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.timeout = timeout
+        self.checkout_timeout = checkout_timeout
+        self.silent = silent
+        self.reset = reset
+        self.clock = clock or Clock()
+        self.stats = {"created": 0, "checkouts": 0, "recycled": 0, "discarded": 0}
+        self._idle = collections.deque()
+        self._busy = {}
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._prespawn()
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    def checkout(self, timeout=None):
+        timeout = self.checkout_timeout if timeout is None else timeout
+        endtime = time.time() + timeout
+        while True:
+            session = self._acquire(endtime, timeout)
+            if session is None:
+                session = self._spawn()
+            elif self._is_expired(session):
+                self._dispose(session, "recycled")
+                continue
+            elif not self._is_healthy(session):
+                self._dispose(session, "discarded")
+                continue
+            break
+        session.uses += 1
+        with self._condition:
+            self._busy[session.driver] = session
+            self.stats["checkouts"] += 1
+        return SeleniumWrapper(session.driver, self.timeout, self.silent, clock=self.clock)
+
+    def checkin(self, wrapper, discard=False):
+        driver = wrapper.unwrap if isinstance(wrapper, SeleniumWrapper) else wrapper
+        with self._condition:
+            session = self._busy.pop(driver, None)
+        if session is None:
+            raise ValueError("Given session was not checked out from this pool.")
+        if discard or self._closed:
+            self._dispose(session, "discarded")
+        elif self._is_expired(session):
+            self._dispose(session, "recycled")
+        elif self.reset and not self._reset(session):
+            self._dispose(session, "discarded")
+        else:
+            with self._condition:
+                self._idle.append(session)
+                self._condition.notify()
+
+    @contextmanager
+    def session(self, timeout=None):
+        wrapper = self.checkout(timeout)
+        try:
+            yield wrapper
+        except WebDriverException:
+            self.checkin(wrapper, discard=True)
+            raise
+        except BaseException:
+            self.checkin(wrapper)
+            raise
+        else:
+            self.checkin(wrapper)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for session in idle:
+            self._dispose(session, "discarded")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _acquire(self, endtime, timeout):
+        # Returns an idle session, or None after reserving a slot for a new one.
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise WebDriverException("SessionPool is already closed.")
+                if self._idle:
+                    return self._idle.popleft()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+                remaining = endtime - time.time()
+                if remaining <= 0:
+                    template = ("Waited for a session for {sec} seconds, ",
+                                "but all {size} sessions were in use.")
+                    raise TimeoutException("".join(template).format(sec=timeout, size=self.max_size))
+                self._condition.wait(remaining)
+
+    def _spawn(self):
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        if isinstance(driver, SeleniumWrapper):
+            driver = driver.unwrap
+        with self._condition:
+            self.stats["created"] += 1
+        return _Session(driver, self.clock.time())
+
+    def _prespawn(self):
+        with self._condition:
+            count = max(0, self.min_size - self._size)
+            self._size += count
+        for i in range(count):
+            thread = threading.Thread(target=self._warm)
+            thread.daemon = True
+            thread.start()
+
+    def _warm(self):
+        try:
+            session = self._spawn()
+        except Exception:
+            return
+        with self._condition:
+            if not self._closed:
+                self._idle.append(session)
+                self._condition.notify()
+                return
+        self._dispose(session, "discarded")
+
+    def _dispose(self, session, reason):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+        with self._condition:
+            self._size -= 1
+            self.stats[reason] += 1
+            self._condition.notify()
+        if not self._closed:
+            self._prespawn()
+
+    def _is_expired(self, session):
+        if self.max_uses is not None and session.uses >= self.max_uses:
+            return True
+        return self.max_age is not None and self.clock.time() - session.created >= self.max_age
+
+    def _is_healthy(self, session):
+        try:
+            session.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, session):
+        driver = session.driver
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to_window(handle)
+                driver.close()
+            if len(handles) > 1:
+                driver.switch_to_window(handles[0])
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Drivers known to create() and connect(), by case-insensitive name.
+
+A driver class (or any callable returning WebDriver) and its desired
+capabilities may be given as objects or as "module:attribute.path"
+strings, which are imported on first use only. So importing
+seleniumwrapper doesn't import drivers which are not used, and drivers
+missing from the installed selenium fail only when they are asked for::
+
+    >>> from seleniumwrapper import registry
+    >>> registry.register("edge", "selenium.webdriver:Edge",
+    ...                   "selenium.webdriver.common.desired_capabilities:DesiredCapabilities.EDGE")
+    >>> br = seleniumwrapper.create("edge")
+"""
+
+import importlib
+
+_CAPABILITIES = "selenium.webdriver.common.desired_capabilities:DesiredCapabilities."
+
+
+def resolve(path):
+    """Returns the object named by "module:attribute.path"."""
+    module, _, attributes = path.partition(":")
+    obj = importlib.import_module(module)
+    for name in attributes.split(".") if attributes else ():
+        obj = getattr(obj, name)
+    return obj
+
+
+class DriverRegistry(object):
+    """Driver classes and capabilities by name, resolved lazily.
+
+    A name registered with capabilities only (android, ...) can be
+    connected to but not created.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def register(self, name, driver=None, capabilities=None):
+        if not isinstance(name, str):
+            raise TypeError("name should be an instance of string. given {0}".format(type(name)))
+        if driver is None and capabilities is None:
+            raise ValueError("driver or capabilities should be given for {0}".format(name))
+        self._entries[name.lower()] = [driver, capabilities]
+
+    def unregister(self, name):
+        self._entries.pop(name.lower(), None)
+
+    def names(self, local=False):
+        """Registered names, of the ones with a driver class if local."""
+        return sorted([name for name, entry in self._entries.items() if not local or entry[0] is not None])
+
+    def __contains__(self, name):
+        return name.lower() in self._entries
+
+    def _resolved(self, name, index, purpose):
+        entry = self._entries.get(name.lower())
+        if entry is None or entry[index] is None:
+            template = ("drivername should be one of {0}",
+                        "(case-insentive). given {1}")
+            raise ValueError("".join(template).format(self.names(local=purpose == "driver"), name))
+        if isinstance(entry[index], str):
+            try:
+                entry[index] = resolve(entry[index])
+            except (ImportError, AttributeError) as e:
+                msg = "{0} of {1} is not available in installed selenium: {2}".format(purpose, name, e)
+                raise ValueError(msg)
+        return entry[index]
+
+    def driver(self, name):
+        """Returns driver class (or factory) registered as name."""
+        return self._resolved(name, 0, "driver")
+
+    def capabilities(self, name):
+        """Returns a copy of desired capabilities registered as name."""
+        return dict(self._resolved(name, 1, "capabilities"))
+
+
+default_registry = DriverRegistry()
+default_registry.register("ie", "selenium.webdriver:Ie", _CAPABILITIES + "INTERNETEXPLORER")
+default_registry.register("opera", "selenium.webdriver:Opera", _CAPABILITIES + "OPERA")
+default_registry.register("chrome", "selenium.webdriver:Chrome", _CAPABILITIES + "CHROME")
+default_registry.register("firefox", "selenium.webdriver:Firefox", _CAPABILITIES + "FIREFOX")
+default_registry.register("phantomjs", "selenium.webdriver:PhantomJS", _CAPABILITIES + "PHANTOMJS")
+default_registry.register("android", capabilities=_CAPABILITIES + "ANDROID")
+
+register = default_registry.register
+unregister = default_registry.unregister
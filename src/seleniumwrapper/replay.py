@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Record WebDriver command streams and replay them without a browser.
+
+Recorder is a command executor which appends every command to a file of
+one JSON object per line: command ("c"), parameters ("p"), response
+("r", or the error "e" raised by the executor) and seconds taken ("t").
+Script sources are written once and referred to by number ("s").
+
+ReplayWebDriver answers the same commands with the recorded responses,
+in order, at zero latency or at speed times the recorded one on a clock,
+so that wrapper overhead, waits and command counts of a real session can
+be measured offline::
+
+    >>> recorder = record(br, "session.ndjson")
+    >>> br.get("http://www.example.com")
+    >>> br.by_id("main").click()
+    >>> recorder.close()
+    >>> br = SeleniumWrapper(ReplayWebDriver("session.ndjson"))
+    >>> br.get("http://www.example.com")
+    >>> br.by_id("main").click()
+"""
+
+import io
+import json
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+from .clock import Clock
+
+
+class ReplayError(WebDriverException):
+    """A command differs from the recorded one, or the recording ended."""
+
+
+def _dumps(record):
+    return json.dumps(record, separators=(",", ":"))
+
+
+class Recorder(object):
+    """Executes commands with executor (RemoteConnection, FakeBrowser, ...)
+    and appends them to target, a path or a file object. Lines are written
+    every buffer_size commands and on flush() or close()."""
+
+    def __init__(self, executor, target, clock=None, buffer_size=100):
+        self.executor = executor
+        self.clock = clock or Clock()
+        self.buffer_size = buffer_size
+        self.recorded = 0
+        self._scripts = {}
+        self._lines = []
+        self._driver = None
+        if hasattr(target, "write"):
+            self._file = target
+            self._owned = False
+        else:
+            self._file = io.open(target, "a", encoding="utf-8")
+            self._owned = True
+
+    def __getattr__(self, name):
+        return getattr(self.executor, name)
+
+    def execute(self, command, params):
+        # the line is serialized at once: WebDriver unwraps the response in place.
+        clock = self.clock
+        started = clock.time()
+        try:
+            response = self.executor.execute(command, params)
+        except Exception as e:
+            self._append(command, params, "e", "{0}: {1}".format(type(e).__name__, e), clock.time() - started)
+            raise
+        self._append(command, params, "r", response, clock.time() - started)
+        return response
+
+    def _append(self, command, params, kind, result, seconds):
+        record = {"c": command, "p": params, kind: result, "t": round(seconds, 6)}
+        script = params.get("script") if isinstance(params, dict) else None
+        if script is not None:
+            number = self._scripts.get(script)
+            if number is None:
+                number = self._scripts[script] = len(self._scripts)
+                self._lines.append(_dumps({"d": number, "v": script}))
+            record["p"] = dict((k, v) for k, v in params.items() if k != "script")
+            record["s"] = number
+        self._lines.append(_dumps(record))
+        self.recorded += 1
+        if len(self._lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self._file.write(u"".join([line + u"\n" for line in self._lines]))
+            self._lines = []
+        self._file.flush()
+
+    def close(self):
+        """Writes buffered lines, and gives the driver (if record() installed
+        it) its executor back."""
+        self.flush()
+        if self._owned:
+            self._file.close()
+        if self._driver is not None:
+            self._driver.command_executor = self.executor
+            self._driver = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def record(driver, target, clock=None, buffer_size=100):
+    """Records commands of driver (WebDriver or SeleniumWrapper) from now on
+    until close() of the returned Recorder. Commands are timed on clock,
+    by default the one of the wrapper."""
+    clock = clock or getattr(driver, "clock", None)
+    driver = getattr(driver, "unwrap", driver)
+    if not isinstance(driver, WebDriver):
+        raise TypeError("driver should be an instance of WebDriver. given {0}".format(type(driver)))
+    recorder = Recorder(driver.command_executor, target, clock, buffer_size)
+    recorder._driver = driver
+    driver.command_executor = recorder
+    return recorder
+
+
+def load(source):
+    """Returns the commands recorded in source (a path or a file object) as
+    dicts, script sources put back in parameters."""
+    if not hasattr(source, "read"):
+        with io.open(source, encoding="utf-8") as f:
+            return load(f)
+    scripts, records = {}, []
+    for line in source:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "d" in record:
+            scripts[record["d"]] = record["v"]
+            continue
+        if "s" in record:
+            record["p"]["script"] = scripts[record.pop("s")]
+        records.append(record)
+    return records
+
+
+def _comparable(params):
+    params = json.loads(json.dumps(params or {}))
+    params.pop("sessionId", None)
+    return params
+
+
+class Replayer(object):
+    """Command executor answering with the responses of records (see load()).
+
+    Each command should be the next recorded one: a different command (or,
+    if strict, different parameters but of a new session) raises
+    ReplayError. Responses take speed times the recorded seconds on clock
+    (0 for no latency). A new session not in the records is started without
+    consuming any.
+    """
+
+    def __init__(self, records, speed=0.0, clock=None, strict=True):
+        self.records = records if isinstance(records, list) else load(records)
+        self.speed = speed
+        self.clock = clock or Clock()
+        self.strict = strict
+        self.position = 0
+        self.commands = {}
+
+    @property
+    def remaining(self):
+        return len(self.records) - self.position
+
+    def rewind(self):
+        self.position = 0
+        self.commands = {}
+
+    def execute(self, command, params):
+        record = self.records[self.position] if self.position < len(self.records) else None
+        if command == Command.NEW_SESSION and (record is None or record["c"] != command):
+            return self._new_session()
+        if record is None:
+            raise ReplayError("Recording ended, but {0} was executed.".format(command))
+        if record["c"] != command or (self.strict and command != Command.NEW_SESSION and
+                                      _comparable(params) != _comparable(record["p"])):
+            template = ("Command #{0} was {1} {2} in the recording, ",
+                        "but {3} {4} was executed.")
+            msg = "".join(template).format(self.position, record["c"], _comparable(record["p"]),
+                                           command, _comparable(params))
+            raise ReplayError(msg)
+        self.position += 1
+        self.commands[command] = self.commands.get(command, 0) + 1
+        if self.speed:
+            self.clock.sleep(record["t"] * self.speed)
+        if "e" in record:
+            raise WebDriverException(record["e"])
+        return dict(record["r"])
+
+    def _new_session(self):
+        session_id = "replay"
+        for record in self.records:
+            if record["p"].get("sessionId"):
+                session_id = record["p"]["sessionId"]
+                break
+        return {"status": 0, "sessionId": session_id, "value": {"browserName": "replay"}}
+
+
+class ReplayWebDriver(WebDriver):
+    """WebDriver whose commands are answered by a Replayer of source (a path,
+    a file object or records)."""
+
+    def __init__(self, source, speed=0.0, clock=None, strict=True):
+        WebDriver.__init__(self, Replayer(source, speed, clock, strict), {})
+
+    @property
+    def replayer(self):
+        return self.command_executor
+
+    @property
+    def commands(self):
+        return self.command_executor.commands
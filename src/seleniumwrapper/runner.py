@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+import threading
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from .pool import SessionPool
+from .wrapper import create
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class Result(object):
+    __slots__ = ("input", "value", "error", "attempts", "elapsed")
+
+    def __init__(self, input, value=None, error=None, attempts=1, elapsed=0.0):
+        self.input = input
+        self.value = value
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        state = "value={0!r}".format(self.value) if self.ok else "error={0!r}".format(self.error)
+        return "<Result input={0!r} {1} attempts={2}>".format(self.input, state, self.attempts)
+
+
+class RunStats(object):
+    __slots__ = ("submitted", "completed", "failed", "timeouts", "retries", "started", "finished")
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.started = time.time()
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def throughput(self):
+        elapsed = self.elapsed
+        return (self.completed + self.failed) / elapsed if elapsed else 0.0
+
+    def __repr__(self):
+        template = "<RunStats completed={0} failed={1} timeouts={2} retries={3} {4:.2f} tasks/sec>"
+        return template.format(self.completed, self.failed, self.timeouts, self.retries, self.throughput)
+
+
+class _Factory(object):
+    # picklable, so that it can be sent to worker processes.
+    def __init__(self, driver, args, kwargs):
+        self.driver = driver
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self):
+        if isinstance(self.driver, str):
+            return create(self.driver, *self.args, **self.kwargs)
+        return self.driver(*self.args, **self.kwargs)
+
+
+def _portable(obj):
+    try:
+        pickle.dumps(obj)
+        return obj
+    except Exception:
+        return RuntimeError(repr(obj))
+
+
+def _work(fn, pool, tasks, results, retries, name=None, current=None, portable=False):
+    # current[name] is the index of the task being run, -1 after the last
+    # one; it's written at once unlike results, for telling what a worker
+    # was doing when it died.
+    wrapper = None
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                if current is not None:
+                    current[name] = -1
+                break
+            index, item = task
+            if current is not None:
+                current[name] = index
+            results.put(("start", index, name))
+            attempts = 0
+            while True:
+                attempts += 1
+                try:
+                    if wrapper is None:
+                        wrapper = pool.checkout()
+                    outcome = (fn(wrapper, item), None, attempts)
+                except WebDriverException as e:
+                    if wrapper is not None:
+                        pool.checkin(wrapper, discard=True)
+                        wrapper = None
+                    if attempts <= retries:
+                        continue
+                    outcome = (None, e, attempts)
+                except Exception as e:
+                    outcome = (None, e, attempts)
+                break
+            if portable:
+                outcome = (_portable(outcome[0]), outcome[1] and _portable(outcome[1]), outcome[2])
+            results.put(("done", index, outcome))
+    finally:
+        if wrapper is not None:
+            pool.checkin(wrapper)
+
+
+def _process_main(fn, factory, tasks, results, retries, name, current):
+    pool = SessionPool(factory, max_size=1, reset=False)
+    try:
+        _work(fn, pool, tasks, results, retries, name, current, portable=True)
+    finally:
+        pool.close()
+
+
+# seconds between checks that workers are still alive while waiting for results
+_CHECK_INTERVAL = 0.5
+
+
+class ParallelRun(object):
+    """Iterator of Result in completion order. See run_parallel."""
+
+    def __init__(self, fn, inputs, driver, workers, mode, task_timeout, retries, driver_args, driver_kwargs):
+        if mode not in ("thread", "process"):
+            raise ValueError("mode should be 'thread' or 'process'. given {0}".format(mode))
+        self.stats = RunStats()
+        self._task_timeout = task_timeout
+        self._inputs = list(inputs)
+        self._pool = None
+        factory = _Factory(driver, tuple(driver_args), dict(driver_kwargs or {}))
+        workers = max(1, min(workers, len(self._inputs)))
+        if mode == "thread":
+            self._tasks, self._results = queue.Queue(), queue.Queue()
+            self._pool = SessionPool(factory, max_size=workers, reset=False)
+            self._worker_type, self._target = threading.Thread, _work
+            self._args = (fn, self._pool, self._tasks, self._results, retries)
+            self._current = [-1] * workers
+        else:
+            import multiprocessing
+            self._tasks, self._results = multiprocessing.Queue(), multiprocessing.Queue()
+            self._worker_type, self._target = multiprocessing.Process, _process_main
+            self._args = (fn, factory, self._tasks, self._results, retries)
+            self._current = multiprocessing.Array("l", [-1] * workers, lock=False)
+        for index, item in enumerate(self._inputs):
+            self._tasks.put((index, item))
+        self.stats.submitted = len(self._inputs)
+        self._workers = []
+        for i in range(workers):
+            self._tasks.put(None)
+            self._workers.append(self._start(i))
+        self._iterator = self._collect()
+
+    def _start(self, name):
+        self._current[name] = -1
+        worker = self._worker_type(target=self._target, args=self._args + (name, self._current))
+        worker.daemon = True
+        worker.start()
+        return worker
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    next = __next__
+
+    def _collect(self):
+        started = {}
+        finished = set()
+        try:
+            while len(finished) < len(self._inputs):
+                wait = _CHECK_INTERVAL
+                if self._task_timeout is not None and started:
+                    wait = min(wait, max(0, min(started.values()) + self._task_timeout - time.time()))
+                try:
+                    kind, index, outcome = self._results.get(timeout=wait)
+                except queue.Empty:
+                    now = time.time()
+                    expired = []
+                    if self._task_timeout is not None:
+                        expired = [i for i in started if started[i] + self._task_timeout <= now]
+                    for index in expired:
+                        del started[index]
+                        finished.add(index)
+                        self._replace(index)
+                        self.stats.timeouts += 1
+                        self.stats.failed += 1
+                        msg = "Task didn't finish in {sec} seconds.".format(sec=self._task_timeout)
+                        yield Result(self._inputs[index], error=TimeoutException(msg),
+                                     elapsed=self._task_timeout)
+                    for name, index in self._dead():
+                        self._workers[name] = self._start(name)
+                        if index < 0 or index in finished:
+                            continue
+                        finished.add(index)
+                        self.stats.failed += 1
+                        msg = "Worker died while running the task."
+                        yield Result(self._inputs[index], error=RuntimeError(msg),
+                                     elapsed=now - started.pop(index, now))
+                    continue
+                if index in finished:
+                    # late result of a timed out task
+                    continue
+                if kind == "start":
+                    started[index] = time.time()
+                    continue
+                elapsed = time.time() - started.pop(index, time.time())
+                finished.add(index)
+                value, error, attempts = outcome
+                self.stats.retries += attempts - 1
+                if error is None:
+                    self.stats.completed += 1
+                else:
+                    self.stats.failed += 1
+                yield Result(self._inputs[index], value, error, attempts, elapsed)
+        finally:
+            self.close()
+
+    def _replace(self, index):
+        # A worker can't be interrupted: a worker process stuck on a timed
+        # out task is terminated and started again, and a thread gets a new
+        # one beside it (with a session of its own) to go on with the tasks.
+        names = [name for name in range(len(self._workers)) if self._current[name] == index]
+        if not names:
+            return
+        if self._pool is None:
+            self._workers[names[0]].terminate()
+            self._workers[names[0]].join()
+            self._workers[names[0]] = self._start(names[0])
+        else:
+            self._pool.max_size += 1
+            self._tasks.put(None)
+            self._current.append(-1)
+            self._workers.append(self._start(len(self._workers)))
+
+    def _dead(self):
+        # (name, index of the task it was running or -1) of workers which
+        # exited without taking their None, unless their last results are
+        # still to be read.
+        dead = []
+        for name, worker in enumerate(self._workers):
+            if worker.is_alive():
+                continue
+            if self._pool is None:
+                died = worker.exitcode != 0
+            else:
+                died = self._current[name] >= 0
+            if died:
+                dead.append(name)
+        if not dead or not self._results.empty():
+            return []
+        return [(name, self._current[name]) for name in dead]
+
+    def close(self):
+        if self.stats.finished is not None:
+            return
+        self.stats.finished = time.time()
+        try:
+            while True:
+                self._tasks.get_nowait()
+        except queue.Empty:
+            pass
+        for worker in self._workers:
+            self._tasks.put(None)
+        if self._pool is not None:
+            for worker in self._workers:
+                worker.join(self._task_timeout)
+            self._pool.close()
+        else:
+            for worker in self._workers:
+                worker.join(self._task_timeout)
+                if worker.is_alive():
+                    worker.terminate()
+
+
+def run_parallel(fn, inputs, driver="chrome", workers=8, mode="thread", task_timeout=None, retries=1,
+                 driver_args=(), driver_kwargs=None):
+    """Calls fn(wrapper, input) for each input across workers.
+
+    Each worker (thread or process) keeps its own SeleniumWrapper for all of
+    its tasks. driver is a drivername for create() or a callable returning a
+    WebDriver; it must be picklable in process mode, as must fn, inputs and
+    return values. A task raising WebDriverException is retried up to
+    retries times with a fresh driver. A task running longer than
+    task_timeout seconds is reported as TimeoutException; its worker process
+    is terminated and started again, while a worker thread, which can't be
+    interrupted, gets a new thread beside it and its late result is dropped.
+    A task whose worker died is reported as RuntimeError and the worker is
+    started again.
+
+    Returns an iterator of Result in completion order, whose stats holds
+    counters and throughput.
+    """
+    return ParallelRun(fn, inputs, driver, workers, mode, task_timeout, retries, driver_args, driver_kwargs)
@@ -0,0 +1,514 @@
+# -*- coding: utf-8 -*-
+"""Javascript snippets injected by SeleniumWrapper through execute_script."""
+
+import re
+
+# The first line of each script names it, so that drivers answering scripts
+# without running them (the fake browser of the tests) can tell them apart
+# by name_of() instead of by their source.
+_NAME = re.compile(r"// seleniumwrapper:(\w+)\n")
+
+
+def _named(name, source):
+    return "// seleniumwrapper:{0}\n{1}".format(name, source)
+
+
+def name_of(source):
+    """Returns the name of a script of this module given its source, or None."""
+    match = _NAME.match(source)
+    return match.group(1) if match else None
+
+# Returns everything click() needs to know about arguments[0] in one round trip:
+# page position (to check that it stopped moving), visibility, the elements
+# which would receive a click at its centre instead of it, and the css values
+# used for the error message of an invisible element.
+CLICK_READINESS = _named("click_readiness", """
+var element = arguments[0];
+var rect = element.getBoundingClientRect();
+var style = window.getComputedStyle(element);
+var displayed = rect.width > 0 && rect.height > 0 &&
+                style.visibility !== 'hidden' && style.display !== 'none';
+var blockers = [];
+if (displayed) {
+    var hit = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+    if (hit && hit !== element && !element.contains(hit)) {
+        var html = hit.outerHTML;
+        blockers.push(html.slice(0, html.indexOf('>') + 1));
+    }
+}
+return {"x": Math.round(rect.left + window.pageXOffset),
+        "y": Math.round(rect.top + window.pageYOffset),
+        "displayed": displayed,
+        "blockers": blockers,
+        "visibility": style.visibility,
+        "display": style.display,
+        "height": style.height,
+        "width": style.width};
+""")
+
+# Defines locate(scope, type, target, eager) which resolves the same locator
+# types as SeleniumWrapper.waitfor. It returns an element (or null), or an
+# array of elements if eager is true.
+LOCATE = """
+function locate(scope, type, target, eager) {
+    var root = scope || document;
+    var quote = function (value) { return '"' + value.replace(/(["\\\\])/g, '\\\\$1') + '"'; };
+    var found = [];
+    var i;
+    if (type === 'xpath') {
+        var snapshot = document.evaluate(target, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (i = 0; i < snapshot.snapshotLength; i++) {
+            if (snapshot.snapshotItem(i).nodeType === 1) {
+                found.push(snapshot.snapshotItem(i));
+            }
+        }
+    } else if (type === 'link_text' || type === 'partial_link_text') {
+        var links = root.querySelectorAll('a');
+        for (i = 0; i < links.length; i++) {
+            var text = (links[i].innerText || links[i].textContent || '').trim();
+            if (type === 'link_text' ? text === target : text.indexOf(target) !== -1) {
+                found.push(links[i]);
+            }
+        }
+    } else {
+        var selectors = {'css': target,
+                         'tag': target,
+                         'id': '[id=' + quote(target) + ']',
+                         'name': '[name=' + quote(target) + ']',
+                         'class': '[class~=' + quote(target) + ']'};
+        found = Array.prototype.slice.call(root.querySelectorAll(selectors[type]));
+    }
+    if (eager) {
+        return found.length ? found : null;
+    }
+    return found.length ? found[0] : null;
+}
+"""
+
+# Returns elements [arguments[3], arguments[3] + arguments[4]) matched by
+# locate(arguments[0], arguments[1], arguments[2]), or the count of matched
+# elements if arguments[4] is null. If arguments[5] is true, the page (and
+# the last matched element) is scrolled to the end first.
+SLICE = _named("slice", LOCATE + """
+var found = locate(arguments[0], arguments[1], arguments[2], true) || [];
+if (arguments[5]) {
+    if (found.length) {
+        found[found.length - 1].scrollIntoView(false);
+    }
+    window.scrollTo(window.pageXOffset, document.documentElement.scrollHeight);
+}
+if (arguments[4] === null) {
+    return found.length;
+}
+return found.slice(arguments[3], arguments[3] + arguments[4]);
+""")
+
+# arguments[0] is the scope element (or null for the whole document) and
+# arguments[1] is an array of [type, target, eager]. Returns an array of
+# locate() results in the same order.
+FIND_MANY = _named("find_many", LOCATE + """
+var queries = arguments[1];
+var results = [];
+for (var i = 0; i < queries.length; i++) {
+    try {
+        results.push(locate(arguments[0], queries[i][0], queries[i][1], queries[i][2]));
+    } catch (e) {
+        results.push(null);
+    }
+}
+return results;
+""")
+
+# arguments[0] is an array of elements, arguments[1] is what to read from each
+# of them and arguments[2] is an array of names (or null for text, location
+# and size). Returns one value, or one array of values per name, per element.
+BULK_READ = _named("bulk_read", """
+var readers = {
+    'text': function (element) {
+        return (element.innerText === undefined ? element.textContent : element.innerText).trim();
+    },
+    'attr': function (element, name) { return element.getAttribute(name); },
+    'prop': function (element, name) {
+        var value = element[name];
+        if (value === undefined) {
+            return null;
+        }
+        return value !== null && typeof value === 'object' ? String(value) : value;
+    },
+    'css': function (element, name) { return window.getComputedStyle(element).getPropertyValue(name); },
+    'location': function (element) {
+        var rect = element.getBoundingClientRect();
+        return {"x": Math.round(rect.left + window.pageXOffset), "y": Math.round(rect.top + window.pageYOffset)};
+    },
+    'size': function (element) {
+        var rect = element.getBoundingClientRect();
+        return {"width": rect.width, "height": rect.height};
+    }
+};
+var read = readers[arguments[1]];
+var names = arguments[2];
+var values = [];
+for (var i = 0; i < arguments[0].length; i++) {
+    var element = arguments[0][i];
+    if (names === null) {
+        values.push(read(element));
+    } else {
+        var row = [];
+        for (var j = 0; j < names.length; j++) {
+            row.push(read(element, names[j]));
+        }
+        values.push(row);
+    }
+}
+return values;
+""")
+
+# Asynchronous. arguments are scope, type, target, eager and timeout (in
+# seconds). Calls back with the result of locate() as soon as it is found,
+# watching the document with a MutationObserver, or with null on timeout.
+OBSERVE = _named("observe", LOCATE + """
+var scope = arguments[0], type = arguments[1], target = arguments[2], eager = arguments[3];
+var callback = arguments[arguments.length - 1];
+var found = locate(scope, type, target, eager);
+if (found) {
+    callback(found);
+} else {
+    var done = false;
+    var finish = function (result) {
+        if (!done) {
+            done = true;
+            observer.disconnect();
+            clearTimeout(timer);
+            callback(result);
+        }
+    };
+    var observer = new MutationObserver(function () {
+        var found = null;
+        try {
+            found = locate(scope, type, target, eager);
+        } catch (e) {}
+        if (found) {
+            finish(found);
+        }
+    });
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    var timer = setTimeout(function () { finish(null); }, arguments[4] * 1000);
+}
+""")
+
+# Returns [url, page id, generation] identifying the current state of the DOM
+# for ElementCache. page id is random per loaded document and generation is
+# counted up by a MutationObserver on every structural change.
+GENERATION = _named("generation", """
+var w = window;
+if (!w.__seleniumwrapperPage) {
+    w.__seleniumwrapperPage = Math.random().toString(36).slice(2);
+    w.__seleniumwrapperGeneration = 0;
+    new MutationObserver(function () {
+        w.__seleniumwrapperGeneration += 1;
+    }).observe(document, {childList: true, subtree: true});
+}
+return [w.location.href, w.__seleniumwrapperPage, w.__seleniumwrapperGeneration];
+""")
+
+# Returns timings of the current page: navigation timing (relative to the
+# start of navigation, from Navigation Timing 2 or performance.timing),
+# resource entries as rows of RESOURCE_FIELDS, paint entries by name and
+# long tasks as [startTime, duration] rows (null if not supported). Long
+# tasks are only given to a PerformanceObserver: the first call on a page
+# installs one with buffered entries, which takeRecords() hands over at
+# once, and later calls see the ones it observed since.
+PAGE_TIMING = _named("page_timing", """
+var perf = window.performance;
+if (!perf) {
+    return null;
+}
+var names = ['fetchStart', 'domainLookupStart', 'domainLookupEnd', 'connectStart', 'connectEnd',
+             'requestStart', 'responseStart', 'responseEnd', 'domInteractive',
+             'domContentLoadedEventEnd', 'domComplete', 'loadEventStart', 'loadEventEnd'];
+var navigation = {};
+var entry = perf.getEntriesByType ? perf.getEntriesByType('navigation')[0] : null;
+var source = entry || perf.timing;
+var start = entry ? entry.startTime : perf.timing.navigationStart;
+for (var i = 0; i < names.length; i++) {
+    var value = source[names[i]];
+    navigation[names[i]] = value ? value - start : 0;
+}
+navigation.transferSize = entry ? entry.transferSize || 0 : 0;
+navigation.encodedBodySize = entry ? entry.encodedBodySize || 0 : 0;
+navigation.decodedBodySize = entry ? entry.decodedBodySize || 0 : 0;
+var byType = function (type) {
+    try {
+        return perf.getEntriesByType ? perf.getEntriesByType(type) : [];
+    } catch (e) {
+        return [];
+    }
+};
+var resources = byType('resource').map(function (r) {
+    return [r.name, r.initiatorType, r.startTime, r.duration,
+            r.transferSize || 0, r.encodedBodySize || 0, r.decodedBodySize || 0];
+});
+var paint = {};
+byType('paint').forEach(function (p) { paint[p.name] = p.startTime; });
+var longtasks = null;
+var Observer = window.PerformanceObserver;
+if (Observer && (Observer.supportedEntryTypes || []).indexOf('longtask') !== -1) {
+    var observed = window.__seleniumwrapperLongTasks;
+    if (!observed) {
+        observed = window.__seleniumwrapperLongTasks = [];
+        var keep = function (entries) {
+            entries.forEach(function (t) { observed.push([t.startTime, t.duration]); });
+        };
+        var observer = new Observer(function (list) { keep(list.getEntries()); });
+        observer.observe({type: 'longtask', buffered: true});
+        keep(observer.takeRecords());
+    }
+    longtasks = observed.slice();
+}
+return {url: window.location.href, navigation: navigation, resources: resources,
+        paint: paint, longtasks: longtasks};
+""")
+
+# Calls back with timing, navigation and memory of window.performance once
+# the load event has finished (at once if it already has, or if
+# arguments[0] is false), or with null if Timing APIs are not supported.
+PERFORMANCE = _named("performance", """
+var wait = arguments[0];
+var callback = arguments[arguments.length - 1];
+var perf = window.performance;
+if (!perf || !perf.timing) {
+    callback(null);
+    return;
+}
+var copy = function (source) {
+    var copied = {};
+    for (var key in source) {
+        if (typeof source[key] !== 'function') {
+            copied[key] = source[key];
+        }
+    }
+    return copied;
+};
+var done = function () {
+    var payload = {timing: copy(perf.timing)};
+    if (perf.navigation) {
+        payload.navigation = copy(perf.navigation);
+    }
+    if (perf.memory) {
+        payload.memory = copy(perf.memory);
+    }
+    callback(payload);
+};
+if (!wait || perf.timing.loadEventEnd > 0) {
+    done();
+} else {
+    // loadEventEnd is set after the listeners of load return.
+    window.addEventListener('load', function () { setTimeout(done, 0); });
+}
+""")
+
+# Returns the state of each element of arguments[0] for container actions:
+# page position, visibility, the opening tag of the element which would
+# receive a click at its centre instead of it, whether it is disabled or
+# read only, and whether clicking or filling it with a script is equivalent
+# to the native action (form controls without keyboard or pointer semantics;
+# not options, which element.click() doesn't select).
+ACTION_READINESS = _named("action_readiness", """
+var clickableTags = {button: true, label: true};
+var clickableTypes = {checkbox: true, radio: true, button: true, submit: true, reset: true};
+var fillableTypes = {'': true, text: true, email: true, number: true, password: true, search: true,
+                     tel: true, url: true, date: true, time: true, 'datetime-local': true, month: true,
+                     week: true, color: true, range: true};
+return arguments[0].map(function (element) {
+    var rect = element.getBoundingClientRect();
+    var style = window.getComputedStyle(element);
+    var displayed = rect.width > 0 && rect.height > 0 &&
+                    style.visibility !== 'hidden' && style.display !== 'none';
+    var blocker = null;
+    if (displayed) {
+        var hit = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+        if (hit && hit !== element && !element.contains(hit)) {
+            var html = hit.outerHTML;
+            blocker = html.slice(0, html.indexOf('>') + 1);
+        }
+    }
+    var tag = element.tagName.toLowerCase();
+    var type = tag === 'input' ? (element.getAttribute('type') || '').toLowerCase() : null;
+    return {x: Math.round(rect.left + window.pageXOffset),
+            y: Math.round(rect.top + window.pageYOffset),
+            displayed: displayed,
+            blocker: blocker,
+            disabled: !!element.disabled,
+            readonly: !!element.readOnly,
+            click: !!clickableTags[tag] || !!clickableTypes[type],
+            fill: tag === 'textarea' || (type !== null && !!fillableTypes[type])};
+});
+""")
+
+# Clicks or fills (arguments[1]: 'click', 'fill' or 'append') each element of
+# arguments[0] with a script. Values are set with the native setter of the
+# prototype, so that frameworks tracking it see the change, and followed by
+# input and change events. Returns an error message or null per element.
+BULK_ACTION = _named("bulk_action", """
+var kind = arguments[1], values = arguments[2];
+return arguments[0].map(function (element, i) {
+    try {
+        if (kind === 'click') {
+            element.click();
+        } else {
+            var value = kind === 'append' ? element.value + values[i] : values[i];
+            var descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(element), 'value');
+            if (descriptor && descriptor.set) {
+                descriptor.set.call(element, value);
+            } else {
+                element.value = value;
+            }
+            element.dispatchEvent(new Event('input', {bubbles: true}));
+            element.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+        return null;
+    } catch (e) {
+        return String(e);
+    }
+});
+""")
+
+# Fills a form in one round trip. arguments[0] is the scope element (or null
+# for the whole document), arguments[1] the locator type of field keys and
+# arguments[2] an array of [key, value, native]. Text fields and selects
+# (options matched by value or text, an array of them for multiple ones)
+# are set like BULK_ACTION, checkboxes checked if value is true and the
+# radio of the group whose value is the given one checked, each followed by
+# input and change events. Buttons and hidden inputs are not filled. Per
+# field, returns null if it is not found, or an array (WebDriver doesn't
+# unwrap elements in objects) of the element, its kind ('text', 'checkbox',
+# 'radio', 'select' or 'other'), an error message (or null; 'disabled' for
+# fields which may be enabled later) and whether it is left to be filled
+# natively, which fields given as native and other ones (file inputs, ...)
+# are.
+FILL_FORM = _named("fill_form", LOCATE + """
+var fillableTypes = {'': true, text: true, email: true, number: true, password: true, search: true,
+                     tel: true, url: true, date: true, time: true, 'datetime-local': true, month: true,
+                     week: true, color: true, range: true};
+var unfillableTypes = {button: true, submit: true, reset: true, image: true, hidden: true};
+var fire = function (element) {
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+};
+var setValue = function (element, value) {
+    var descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(element), 'value');
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(element, value);
+    } else {
+        element.value = value;
+    }
+};
+var scope = arguments[0], by = arguments[1];
+return arguments[2].map(function (field) {
+    var found;
+    try {
+        found = locate(scope, by, field[0], true);
+    } catch (e) {
+        found = null;
+    }
+    if (!found) {
+        return null;
+    }
+    var value = field[1], element = found[0], i;
+    var tag = element.tagName.toLowerCase();
+    var type = tag === 'input' ? (element.getAttribute('type') || '').toLowerCase() : null;
+    var kind = type === 'checkbox' || type === 'radio' ? type : tag === 'select' ? 'select' :
+               tag === 'textarea' || (type !== null && fillableTypes[type]) ? 'text' : 'other';
+    if (kind === 'radio') {
+        element = null;
+        for (i = 0; i < found.length; i++) {
+            if (found[i].value === String(value)) {
+                element = found[i];
+            }
+        }
+        if (element === null) {
+            return [found[0], kind, 'no radio of value ' + value, false];
+        }
+    }
+    var report = [element, kind, null, false];
+    if (type !== null && unfillableTypes[type]) {
+        report[2] = 'not fillable';
+    } else if (element.disabled) {
+        report[2] = 'disabled';
+    } else if (kind === 'text' && element.readOnly) {
+        report[2] = 'read only';
+    } else if (field[2] || kind === 'other') {
+        report[3] = true;
+    } else {
+        try {
+            if (kind === 'checkbox' || kind === 'radio') {
+                if (element.checked !== (kind === 'radio' || !!value)) {
+                    element.checked = kind === 'radio' || !!value;
+                    fire(element);
+                }
+            } else if (kind === 'select') {
+                var wanted = value instanceof Array ? value.map(String) : [String(value)];
+                var options = Array.prototype.slice.call(element.options);
+                var chosen = options.filter(function (option) {
+                    return wanted.indexOf(option.value) !== -1 || wanted.indexOf(option.text.trim()) !== -1;
+                }).slice(0, element.multiple ? undefined : 1);
+                if (chosen.length) {
+                    options.forEach(function (option) {
+                        option.selected = chosen.indexOf(option) !== -1;
+                    });
+                    fire(element);
+                } else {
+                    report[2] = 'no option ' + wanted.join(', ');
+                }
+            } else {
+                setValue(element, String(value));
+                fire(element);
+            }
+        } catch (e) {
+            report[2] = String(e);
+        }
+    }
+    return report;
+});
+""")
+
+# Returns outer HTML of arguments[0], or of the document element if null,
+# for SeleniumWrapper.snapshot.
+SNAPSHOT = _named("snapshot", """
+return (arguments[0] || document.documentElement).outerHTML;
+""")
+
+# Resolves each path of arguments[1] (indices of element children from
+# arguments[0], or from the document if null) to the element it leads to.
+# An element whose tag is not the expected one of arguments[2] is null.
+RESOLVE = _named("resolve", """
+var root = arguments[0] || document, tags = arguments[2];
+return arguments[1].map(function (path, i) {
+    var node = root;
+    for (var j = 0; j < path.length && node; j++) {
+        node = node.children[path[j]];
+    }
+    return node && node.tagName.toLowerCase() === tags[i] ? node : null;
+});
+""")
+
+# Returns rows [arguments[1], arguments[1] + arguments[2]) of the table
+# arguments[0] (its own rows, in thead, tbody and tfoot order) as arrays of
+# whether it is a header row (in thead, or of th cells only) and its cells,
+# each an array of whitespace-normalised text, colspan, rowspan and href of
+# its first link (if arguments[3] is true, else null). Spans are expanded
+# by the caller, so that rowspans go on across chunks.
+TABLE_ROWS = _named("table_rows", """
+var links = arguments[3];
+var rows = Array.prototype.slice.call(arguments[0].rows, arguments[1], arguments[1] + arguments[2]);
+return rows.map(function (row) {
+    var cells = Array.prototype.slice.call(row.cells);
+    var head = row.parentNode.tagName.toLowerCase() === 'thead' || (cells.length > 0 && cells.every(
+        function (cell) { return cell.tagName.toLowerCase() === 'th'; }));
+    return [head, cells.map(function (cell) {
+        var link = links ? cell.querySelector('a[href]') : null;
+        var text = (cell.innerText || cell.textContent || '').replace(/\\s+/g, ' ').trim();
+        return [text, cell.colSpan || 1, cell.rowSpan || 1, link ? link.href : null];
+    })];
+});
+""")
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Buffered, appendable record sinks writing NDJSON or CSV."""
+
+import csv
+import json
+import os
+import sys
+
+
+class _Sink(object):
+    def __init__(self, target, buffer_size=100, append=True):
+        self.buffer_size = buffer_size
+        self.written = 0
+        self._buffer = []
+        if hasattr(target, "write"):
+            self._file = target
+            self._owned = False
+            try:
+                self._fresh = target.tell() == 0
+            except (IOError, OSError, ValueError):
+                # not seekable (pipes, terminals)
+                self._fresh = True
+        else:
+            self._fresh = not (append and os.path.exists(target) and os.path.getsize(target))
+            mode = "a" if append else "w"
+            self._file = open(target, mode) if sys.version_info < (3,) else open(target, mode, newline="")
+            self._owned = True
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._write(self._buffer)
+            self.written += len(self._buffer)
+            self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        if self._owned:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NDJSONSink(_Sink):
+    """Writes each record (dict) as one line of JSON.
+
+    target is a path, opened for appending unless append=False, or a file
+    object. Records are written every buffer_size records and on flush().
+    """
+
+    def _write(self, records):
+        self._file.write("".join([json.dumps(record, sort_keys=True) + "\n" for record in records]))
+
+
+class CSVSink(_Sink):
+    """Writes records (dicts, or sequences in the order of fields) as CSV rows.
+
+    The header row is written only at the start of the target, so not when
+    appending to a non-empty file (or given a file object past its start).
+    """
+
+    def __init__(self, target, fields, buffer_size=100, append=True):
+        super(CSVSink, self).__init__(target, buffer_size, append)
+        self.fields = tuple(fields)
+        self._writer = csv.writer(self._file)
+        if self._fresh:
+            self._writer.writerow(self.fields)
+
+    def _write(self, records):
+        fields = self.fields
+        self._writer.writerows([[record.get(field) for field in fields] if isinstance(record, dict) else record
+                                for record in records])
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+"""Read-only queries on a local copy of the page.
+
+SeleniumWrapper.snapshot() reads outer HTML of the document (or of the
+wrapped element) with one command. Finders of Snapshot are evaluated
+in-process, with lxml (and cssselect) if installed, else with
+seleniumwrapper.dom, so reading text and attributes of found elements
+takes no command. live resolves found elements to SeleniumWrapper, with
+one command for any number of them, when they are to be acted on.
+
+seleniumwrapper.dom only covers what the finders and seleniumwrapper.locator
+emit: CSS compound selectors (tag, #id, .class, attributes) with descendant
+and child combinators, and XPath location paths with predicates and string
+and number functions. Other selectors (pseudo-classes such as :first-child,
+sibling combinators, ...) raise InvalidSelectorException without lxml,
+installed by the seleniumwrapper[lxml] extra.
+
+Snapshots see attributes as serialized by the browser: values typed
+into inputs since load, and styles, are not in them, and text is the
+whitespace-normalised text content including hidden elements.
+"""
+
+from selenium.common.exceptions import (NoSuchElementException, InvalidSelectorException,
+                                        StaleElementReferenceException)
+from . import dom, locator, scripts
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector, SelectorError as _CSSError
+except ImportError:
+    lxml = None
+
+
+class _DomTree(object):
+    """Tree parsed by seleniumwrapper.dom."""
+    parser = "dom"
+
+    def __init__(self, html, document):
+        parsed = dom.parse(html)
+        self.root = parsed if document or not parsed.elements else parsed.elements[0]
+
+    def select(self, node, type, target):
+        try:
+            return dom.select(node, type, target)
+        except dom.SelectorError as e:
+            template = ("{0}; seleniumwrapper.dom covers the selectors of seleniumwrapper.locator, ",
+                        "install lxml and cssselect (seleniumwrapper[lxml]) for others.")
+            raise InvalidSelectorException("".join(template).format(e))
+
+    def children(self, node):
+        return node.elements
+
+    def parent(self, node):
+        return node.parent
+
+    def tag(self, node):
+        return node.tag
+
+    def text(self, node):
+        return " ".join(node.text.split())
+
+    def get(self, node, name):
+        return node.attrs.get(name)
+
+    def html(self, node):
+        return dom.serialize(node)
+
+
+_selectors = {}
+
+
+def _css_selector(selector):
+    compiled = _selectors.get(selector)
+    if compiled is None:
+        if len(_selectors) >= 256:
+            _selectors.clear()
+        compiled = _selectors[selector] = CSSSelector(selector, translator="html")
+    return compiled
+
+
+class _LxmlTree(object):
+    """Tree parsed by lxml.html. The document is its ElementTree."""
+    parser = "lxml"
+    _XPATHS = {"id": ".//*[@id={0}]",
+               "name": ".//*[@name={0}]",
+               "tag": ".//*[local-name()={0}]",
+               "class": ".//*[contains(concat(' ', normalize-space(@class), ' '), {0})]",
+               "link_text": ".//a[normalize-space()={0}]",
+               "partial_link_text": ".//a[contains(normalize-space(), {0})]"}
+
+    def __init__(self, html, document):
+        self.document = document
+        if document:
+            self.root = lxml.html.document_fromstring(html).getroottree()
+        else:
+            self.root = lxml.html.fragment_fromstring(html)
+
+    def select(self, node, type, target):
+        try:
+            if type == "css":
+                found = _css_selector(target)(node)
+            elif type == "xpath":
+                found = node.xpath(target)
+            elif type in self._XPATHS:
+                value = " {0} ".format(target) if type == "class" else target.lower() if type == "tag" else target
+                found = node.xpath(self._XPATHS[type].format(locator.xpath_literal(value)))
+            else:
+                raise InvalidSelectorException("unsupported locator type: {0!r}".format(type))
+        except (lxml.etree.XPathError, _CSSError) as e:
+            raise InvalidSelectorException("{0}".format(e))
+        if not isinstance(found, list):
+            raise InvalidSelectorException("xpath should select elements: {0!r}".format(target))
+        return [node for node in found if isinstance(node, lxml.html.HtmlElement)]
+
+    def children(self, node):
+        if isinstance(node, lxml.etree._ElementTree):
+            return [node.getroot()]
+        return list(node.iterchildren("*"))
+
+    def parent(self, node):
+        parent = node.getparent()
+        if parent is None and self.document:
+            return self.root
+        return parent
+
+    def tag(self, node):
+        return node.tag
+
+    def text(self, node):
+        return " ".join(node.text_content().split())
+
+    def get(self, node, name):
+        return node.get(name)
+
+    def html(self, node):
+        return lxml.html.tostring(node, encoding="unicode", with_tail=False)
+
+
+_TREES = {"dom": _DomTree}
+if lxml is not None:
+    _TREES["lxml"] = _LxmlTree
+
+
+class _Finders(object):
+    """Finder methods of SeleniumWrapper on a snapshot. They never wait."""
+    __slots__ = ()
+
+    def waitfor(self, type, target, eager=False):
+        snapshot = self._snapshot
+        found = snapshot._tree.select(self._node, type, target)
+        if not found:
+            return snapshot._missing(type, target)
+        if eager:
+            return SnapshotContainer(snapshot, found)
+        return SnapshotElement(snapshot, found[0])
+
+    def xpath(self, target, eager=False):
+        return self.waitfor("xpath", target, eager)
+
+    def css(self, target, eager=False):
+        return self.waitfor("css", target, eager)
+
+    def locate(self, locator, eager=False):
+        return self.waitfor(*locator.compile(), eager=eager)
+
+    def by_tag(self, tag, eager=False, **attributes):
+        return self.waitfor(*locator.by_tag(tag, attributes), eager=eager)
+
+    def by_text(self, text, tag="*", partial=False, eager=False):
+        return self.waitfor(*locator.by_text(text, tag, partial), eager=eager)
+
+    def by_class(self, target, eager=False):
+        return self.waitfor("class", target, eager)
+
+    def by_id(self, target, eager=False):
+        return self.waitfor("id", target, eager)
+
+    def by_name(self, target, eager=False):
+        return self.waitfor("name", target, eager)
+
+    def by_linktxt(self, target, eager=False, partial=False):
+        return self.waitfor("partial_link_text" if partial else "link_text", target, eager)
+
+    def href(self, partialurl=None, eager=False):
+        return self.waitfor(*locator.href(partialurl), eager=eager)
+
+    def img(self, alt=None, ext=None, eager=False):
+        return self.waitfor(*locator.img(alt, ext), eager=eager)
+
+    def button(self, value, eager=False):
+        return self.waitfor(*locator.button(value), eager=eager)
+
+    def checkbox(self, eager=False, **attributes):
+        attributes["type"] = "checkbox"
+        return self.by_tag("input", eager, **attributes)
+
+    def radio(self, eager=False, **attributes):
+        attributes["type"] = "radio"
+        return self.by_tag("input", eager, **attributes)
+
+
+class Snapshot(_Finders):
+    """Outer HTML of scope (a SeleniumWrapper) parsed with parser ('lxml' or
+    'dom', lxml if installed by default). Missing elements raise
+    NoSuchElementException, or are None if scope is silent."""
+    __slots__ = ("_scope", "_html", "_document", "_tree", "_node", "_snapshot")
+
+    def __init__(self, html, scope, parser=None):
+        parser = parser or ("lxml" if "lxml" in _TREES else "dom")
+        if parser not in _TREES:
+            raise ValueError("parser should be one of {0}. given {1}".format(sorted(_TREES), parser))
+        self._scope = scope
+        self._html = html
+        self._document = scope.unwrap is scope._driver
+        self._tree = _TREES[parser](html, self._document)
+        self._node = self._tree.root
+        self._snapshot = self
+
+    @property
+    def scope(self):
+        return self._scope
+
+    @property
+    def html(self):
+        return self._html
+
+    @property
+    def parser(self):
+        return self._tree.parser
+
+    def _missing(self, type, target):
+        if self._scope.silent:
+            return None
+        raise NoSuchElementException("{0}:{1} is not in the snapshot.".format(type, target))
+
+    def _path(self, node):
+        tree, path = self._tree, []
+        while node is not self._node:
+            parent = tree.parent(node)
+            path.append(tree.children(parent).index(node))
+            node = parent
+        path.reverse()
+        return path
+
+    def _live(self, nodes):
+        # one command for all nodes, relative to the scope of the snapshot.
+        scope = self._scope
+        driver = scope._driver
+        root = None if self._document else scope.unwrap
+        tags = [self._tree.tag(node) for node in nodes]
+        found = driver.execute_script(scripts.RESOLVE, root, [self._path(node) for node in nodes], tags)
+        for element, tag in zip(found, tags):
+            if element is None:
+                msg = "<{0} ...> of the snapshot is no longer in the page.".format(tag)
+                raise StaleElementReferenceException(msg)
+        return found
+
+
+class SnapshotElement(_Finders):
+    """Element of a Snapshot. Finders search its descendants."""
+    __slots__ = ("_snapshot", "_node")
+
+    def __init__(self, snapshot, node):
+        self._snapshot = snapshot
+        self._node = node
+
+    @property
+    def tag_name(self):
+        return self._snapshot._tree.tag(self._node)
+
+    @property
+    def text(self):
+        return self._snapshot._tree.text(self._node)
+
+    @property
+    def html(self):
+        return self._snapshot._tree.html(self._node)
+
+    @property
+    def parent(self):
+        snapshot = self._snapshot
+        if self._node is snapshot._node:
+            return None
+        parent = snapshot._tree.parent(self._node)
+        if parent is snapshot._node and snapshot._document:
+            return None
+        return SnapshotElement(snapshot, parent)
+
+    def get_attribute(self, name):
+        return self._snapshot._tree.get(self._node, name)
+
+    def attr(self, name):
+        return self.get_attribute(name)
+
+    @property
+    def live(self):
+        """SeleniumWrapper of the element in the page."""
+        snapshot = self._snapshot
+        return snapshot.scope._spawn(snapshot._live([self._node])[0])
+
+    def __repr__(self):
+        return "<SnapshotElement {0}>".format(self.tag_name)
+
+
+class SnapshotContainer(object):
+    """Elements of a Snapshot, read like SeleniumContainerWrapper."""
+    __slots__ = ("_snapshot", "_nodes")
+
+    def __init__(self, snapshot, nodes):
+        self._snapshot = snapshot
+        self._nodes = nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return SnapshotContainer(self._snapshot, self._nodes[key])
+        return SnapshotElement(self._snapshot, self._nodes[key])
+
+    def __iter__(self):
+        for node in self._nodes:
+            yield SnapshotElement(self._snapshot, node)
+
+    @property
+    def size(self):
+        return len(self._nodes)
+
+    def texts(self):
+        tree = self._snapshot._tree
+        return [tree.text(node) for node in self._nodes]
+
+    def attrs(self, names):
+        tree = self._snapshot._tree
+        if isinstance(names, (list, tuple)):
+            return dict((name, [tree.get(node, name) for node in self._nodes]) for name in names)
+        return [tree.get(node, names) for node in self._nodes]
+
+    @property
+    def live(self):
+        """SeleniumContainerWrapper of the elements in the page."""
+        snapshot = self._snapshot
+        return snapshot.scope._spawn_all(snapshot._live(self._nodes))
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""Streaming extraction of HTML tables.
+
+SeleniumWrapper.table() returns Table, whose rows are read chunk_size
+rows per script while iterating, so that extracting a table takes a few
+commands instead of one per cell, and only one chunk is held at once.
+Spanned cells are repeated in every row and column they span, and
+header rows are combined into one name per column::
+
+    >>> table = br.table("#prices")
+    >>> table.headers
+    ['Item', 'Q1 / Sales', 'Q1 / Returns']
+    >>> for row in table:
+    ...     print(row)
+    >>> table.to_csv("prices.csv")
+"""
+
+from . import scripts
+from .sinks import CSVSink, NDJSONSink
+
+
+def _expand(cells, spanning):
+    """Lays cells ([text, colspan, rowspan, href]) of a row out on columns,
+    after cells spanning from rows above (spanning maps their column to
+    [rows left, text, href], and is updated for the next row). Returns
+    texts and hrefs by column."""
+    laid = dict((column, (text, href)) for column, (left, text, href) in spanning.items())
+    for column in list(spanning):
+        spanning[column][0] -= 1
+        if not spanning[column][0]:
+            del spanning[column]
+    column = 0
+    for text, colspan, rowspan, href in cells:
+        while column in laid:
+            column += 1
+        for spanned in range(column, column + max(colspan, 1)):
+            laid[spanned] = (text, href)
+            if rowspan > 1:
+                spanning[spanned] = [rowspan - 1, text, href]
+        column += max(colspan, 1)
+    width = max(laid) + 1 if laid else 0
+    cells = [laid.get(column, ("", None)) for column in range(width)]
+    return [text for text, href in cells], [href for text, href in cells]
+
+
+def _combine(rows):
+    """One name per column from stacked header rows, skipping repeated (spanned)
+    and empty labels."""
+    names = []
+    for column in range(max([len(row) for row in rows])):
+        labels = []
+        for row in rows:
+            label = row[column] if column < len(row) else ""
+            if label and (not labels or labels[-1] != label):
+                labels.append(label)
+        names.append(" / ".join(labels) or "column{0}".format(column + 1))
+    return names
+
+
+class Table(object):
+    """Rows of a table element, read chunk_size rows per script.
+
+    Iterating yields a list of cell texts per body row, fitted to the
+    headers, followed by hrefs of the first link of each cell if links.
+    Header rows (in thead, or of th only) are not yielded, wherever they
+    are repeated. The leading ones name the columns unless headers are
+    given, or else columns are named column1, column2, ...
+    """
+    __slots__ = ("_element", "_chunk_size", "_links", "_headers", "_first")
+
+    def __init__(self, element, chunk_size=100, links=False, headers=None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be 1 or more. given {0}".format(chunk_size))
+        self._element = element
+        self._chunk_size = chunk_size
+        self._links = links
+        self._headers = list(headers) if headers is not None else None
+        self._first = None
+
+    def _chunk(self, start):
+        return self._element.parent.execute_script(scripts.TABLE_ROWS, self._element, start, self._chunk_size,
+                                                   self._links)
+
+    def _rows(self):
+        # the first chunk is kept, for headers and for iterating again.
+        if self._first is None:
+            self._first = self._chunk(0)
+        chunk, start = self._first, 0
+        spanning = {}
+        while True:
+            for head, cells in chunk:
+                yield head, _expand(cells, spanning)
+            start += len(chunk)
+            if len(chunk) < self._chunk_size:
+                return
+            chunk = self._chunk(start)
+
+    @property
+    def headers(self):
+        if self._headers is None:
+            heads, width = [], 0
+            for head, (texts, hrefs) in self._rows():
+                if not head:
+                    width = len(texts)
+                    break
+                heads.append(texts)
+            self._headers = _combine(heads) if heads else ["column{0}".format(i + 1) for i in range(width)]
+        return self._headers
+
+    @property
+    def fields(self):
+        """Names of values of rows: headers, then headers + " href" if links."""
+        if self._links:
+            return self.headers + [name + " href" for name in self.headers]
+        return list(self.headers)
+
+    def __iter__(self):
+        width = len(self.headers)
+        for head, (texts, hrefs) in self._rows():
+            if head:
+                continue
+            row = texts[:width] + [""] * (width - len(texts))
+            if self._links:
+                row += hrefs[:width] + [None] * (width - len(hrefs))
+            yield row
+
+    def records(self):
+        """Yields rows as dicts keyed by fields."""
+        fields = self.fields
+        for row in self:
+            yield dict(zip(fields, row))
+
+    def to_csv(self, target, buffer_size=100, append=True):
+        """Streams rows to sinks.CSVSink of target with fields as the header
+        row. Returns the count of rows written."""
+        with CSVSink(target, self.fields, buffer_size, append) as sink:
+            for row in self:
+                sink.write(row)
+        return sink.written
+
+    def to_ndjson(self, target, buffer_size=100, append=True):
+        """Streams records() to sinks.NDJSONSink of target. Returns the count
+        of rows written."""
+        with NDJSONSink(target, buffer_size, append) as sink:
+            for record in self.records():
+                sink.write(record)
+        return sink.written
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import time
+from selenium.webdriver.remote.webdriver import WebDriver
+from . import scripts
+from .wrapper import SeleniumWrapper
+
+# one record per page load. times are milliseconds from the start of navigation.
+PAGE_FIELDS = ("timestamp", "label", "url", "ttfb", "dom_interactive", "dom_content_loaded", "load",
+               "first_paint", "first_contentful_paint", "resources", "transfer_size", "encoded_size",
+               "decoded_size", "long_tasks", "long_task_time")
+RESOURCE_FIELDS = ("timestamp", "label", "page", "name", "initiator", "start", "duration", "transfer_size",
+                   "encoded_size", "decoded_size")
+
+
+def page_record(payload, label=None, timestamp=None):
+    """Derives PAGE_FIELDS from the payload of scripts.PAGE_TIMING. Long task
+    fields are None if the browser doesn't observe long tasks."""
+    navigation = payload["navigation"]
+    resources = payload["resources"]
+    longtasks = payload["longtasks"]
+    paint = payload["paint"]
+    return {"timestamp": timestamp or time.time(),
+            "label": label,
+            "url": payload["url"],
+            "ttfb": navigation["responseStart"],
+            "dom_interactive": navigation["domInteractive"],
+            "dom_content_loaded": navigation["domContentLoadedEventEnd"],
+            "load": navigation["loadEventEnd"],
+            "first_paint": paint.get("first-paint"),
+            "first_contentful_paint": paint.get("first-contentful-paint"),
+            "resources": len(resources),
+            "transfer_size": navigation["transferSize"] + sum([r[4] for r in resources]),
+            "encoded_size": navigation["encodedBodySize"] + sum([r[5] for r in resources]),
+            "decoded_size": navigation["decodedBodySize"] + sum([r[6] for r in resources]),
+            "long_tasks": len(longtasks) if longtasks is not None else None,
+            "long_task_time": sum([t[1] for t in longtasks]) if longtasks is not None else None}
+
+
+class TimingCollector(object):
+    """Captures navigation, resource, paint and long task timings of the
+    current page with one script call and streams them to sinks.
+
+    sink receives one record of PAGE_FIELDS per page; resource_sink, if
+    given, one record of RESOURCE_FIELDS per resource entry. Nothing is
+    retained but counters::
+
+        >>> with NDJSONSink("pages.ndjson") as sink:
+        ...     collector = TimingCollector(sink)
+        ...     for url in urls:
+        ...         collector.get(br, url)
+    """
+
+    def __init__(self, sink, resource_sink=None):
+        self.sink = sink
+        self.resource_sink = resource_sink
+        self.pages = 0
+        self.failures = 0
+
+    def collect(self, driver, label=None):
+        """Records timings of the page loaded in driver (WebDriver or
+        SeleniumWrapper) and returns the page record, or None if the
+        browser doesn't support Timing APIs."""
+        driver = driver.unwrap if isinstance(driver, SeleniumWrapper) else driver
+        if not isinstance(driver, WebDriver):
+            raise TypeError("driver should be an instance of WebDriver. given {0}".format(type(driver)))
+        payload = driver.execute_script(scripts.PAGE_TIMING)
+        if not payload:
+            self.failures += 1
+            return None
+        record = page_record(payload, label)
+        self.sink.write(record)
+        if self.resource_sink is not None:
+            for row in payload["resources"]:
+                self.resource_sink.write(dict(zip(RESOURCE_FIELDS,
+                                                  (record["timestamp"], label, record["url"]) + tuple(row))))
+        self.pages += 1
+        return record
+
+    def get(self, driver, url, label=None):
+        """Loads url and records its timings."""
+        driver.get(url)
+        return self.collect(driver, label if label is not None else url)
+
+    def flush(self):
+        self.sink.flush()
+        if self.resource_sink is not None:
+            self.resource_sink.flush()
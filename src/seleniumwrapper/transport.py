@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+import socket
+import threading
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+try:
+    import http.client as httplib
+    from urllib import parse
+except ImportError:
+    import httplib
+    import urlparse as parse
+
+# errors of a keep-alive connection closed by the server while idle.
+_STALE_ERRORS = (httplib.BadStatusLine, socket.error)
+# methods which are safe to send again after the request may have reached
+# the server.
+_IDEMPOTENT_METHODS = ("GET", "DELETE")
+
+
+class _NoDelayHTTPConnection(httplib.HTTPConnection):
+    def connect(self):
+        httplib.HTTPConnection.connect(self)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class _NoDelayHTTPSConnection(httplib.HTTPSConnection):
+    def connect(self):
+        httplib.HTTPSConnection.connect(self)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+# connection classes and default ports by scheme, then by nodelay.
+_CONNECTION_CLASSES = {
+    "http": {True: _NoDelayHTTPConnection, False: httplib.HTTPConnection},
+    "https": {True: _NoDelayHTTPSConnection, False: httplib.HTTPSConnection},
+}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class ConnectionPool(object):
+    """Keep-alive HTTP connections to one executor, shared by every session.
+
+    At most size connections are open at once; requests beyond that wait
+    for a connection to be released. Pools given by shared() are kept until
+    close() or close_shared().
+    """
+
+    _shared = {}
+    _lock = threading.Lock()
+
+    def __init__(self, host, port, size=8, nodelay=True, timeout=None, scheme="http"):
+        if scheme not in _CONNECTION_CLASSES:
+            raise WebDriverException("Unsupported scheme: {0}".format(scheme))
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.size = size
+        self.nodelay = nodelay
+        self.timeout = timeout
+        self.stats = {"connections": 0, "requests": 0, "reused": 0}
+        self._idle = []
+        self._open = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @classmethod
+    def shared(cls, host, port, size=8, nodelay=True, timeout=None, scheme="http"):
+        key = (scheme, host, port, nodelay)
+        with cls._lock:
+            pool = cls._shared.get(key)
+            if pool is None:
+                pool = cls._shared[key] = cls(host, port, size, nodelay, timeout, scheme)
+            elif pool.size < size:
+                pool.size = size
+            return pool
+
+    @classmethod
+    def close_shared(cls):
+        with cls._lock:
+            pools = list(cls._shared.values())
+        for pool in pools:
+            pool.close()
+
+    def acquire(self):
+        with self._condition:
+            while not self._idle and self._open >= self.size:
+                if self._closed:
+                    break
+                self._condition.wait()
+            if self._closed:
+                raise WebDriverException("ConnectionPool is already closed.")
+            if self._idle:
+                self.stats["reused"] += 1
+                return self._idle.pop(), True
+            self._open += 1
+            self.stats["connections"] += 1
+        connection_class = _CONNECTION_CLASSES[self.scheme][bool(self.nodelay)]
+        kwargs = {} if self.timeout is None else {"timeout": self.timeout}
+        return connection_class(self.host, self.port, **kwargs), False
+
+    def release(self, connection, reusable=True):
+        with self._condition:
+            if reusable and not self._closed:
+                self._idle.append(connection)
+            else:
+                connection.close()
+                self._open -= 1
+            self._condition.notify()
+
+    def clear(self):
+        with self._condition:
+            for connection in self._idle:
+                connection.close()
+            self._open -= len(self._idle)
+            self._idle = []
+            self._condition.notify_all()
+
+    def close(self):
+        """Closes idle connections, and busy ones once released. Requests
+        after closing raise WebDriverException."""
+        cls = type(self)
+        key = (self.scheme, self.host, self.port, self.nodelay)
+        with cls._lock:
+            if cls._shared.get(key) is self:
+                del cls._shared[key]
+        with self._condition:
+            self._closed = True
+        self.clear()
+
+    def request(self, method, path, body, headers):
+        # Returns (status, headers, data). A request which fails on a reused
+        # connection (closed by the server while idle) is sent again, if it
+        # failed while being written or if it's idempotent: otherwise the
+        # server may have run it already.
+        while True:
+            connection, reused = self.acquire()
+            written = False
+            try:
+                connection.request(method, path, body, headers)
+                written = True
+                response = connection.getresponse()
+                data = response.read()
+            except _STALE_ERRORS:
+                self.release(connection, reusable=False)
+                if reused and (not written or method in _IDEMPOTENT_METHODS):
+                    continue
+                raise
+            except Exception:
+                self.release(connection, reusable=False)
+                raise
+            with self._condition:
+                self.stats["requests"] += 1
+            self.release(connection, reusable=not response.will_close)
+            return response.status, response, data
+
+
+class _Response(object):
+    # response of ConnectionPool.request, as read by RemoteConnection.
+    __slots__ = ("status", "_response", "_data")
+
+    def __init__(self, status, response, data):
+        self.status = status
+        self._response = response
+        self._data = data
+
+    def getheader(self, name, default=None):
+        return self._response.getheader(name, default)
+
+    def read(self):
+        return self._data
+
+    def close(self):
+        pass
+
+
+class _PooledHTTPConnection(object):
+    """Stands in for the HTTPConnection of a keep-alive RemoteConnection,
+    sending each request over a connection of pool."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, headers=None):
+        self._local.response = _Response(*self.pool.request(method, path, body, headers or {}))
+
+    def getresponse(self):
+        return self._local.response
+
+    def close(self):
+        pass
+
+
+class PooledRemoteConnection(RemoteConnection):
+    """RemoteConnection sending commands over a ConnectionPool shared by
+    every session to the same executor, with TCP_NODELAY.
+
+    Relies on the keep-alive RemoteConnection of selenium 2.x (its _url,
+    _timeout and _conn), and raises WebDriverException on others."""
+
+    def __init__(self, remote_server_addr, pool_size=8, nodelay=True, resolve_ip=True):
+        RemoteConnection.__init__(self, remote_server_addr, keep_alive=True, resolve_ip=resolve_ip)
+        if not all(hasattr(self, name) for name in ("_url", "_timeout", "_conn")):
+            raise WebDriverException("PooledRemoteConnection needs the keep-alive RemoteConnection of selenium 2.x.")
+        parsed_url = parse.urlparse(self._url)
+        scheme = parsed_url.scheme or "http"
+        if scheme not in _DEFAULT_PORTS:
+            raise WebDriverException("Unsupported scheme: {0}".format(scheme))
+        timeout = self._timeout if isinstance(self._timeout, (int, float)) else None
+        self.pool = ConnectionPool.shared(parsed_url.hostname, parsed_url.port or _DEFAULT_PORTS[scheme],
+                                          pool_size, nodelay, timeout, scheme)
+        # requests and response parsing are RemoteConnection's keep-alive
+        # ones, only the connection is taken from the pool.
+        self._conn = _PooledHTTPConnection(self.pool)
@@ -1,102 +1,210 @@
 # -*- coding: utf-8 -*-
 
-import collections
 import inspect
-import time
 import random
+import weakref
+from array import array
+from functools import partial
+from operator import attrgetter
+from types import FunctionType, MethodType
 import selenium
-from selenium.webdriver import Ie, Opera, Chrome, Firefox, PhantomJS
+from selenium.webdriver.remote.remote_connection import RemoteConnection
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import (NoSuchElementException, TimeoutException,
                                         WebDriverException, ElementNotVisibleException,
-                                        NoAlertPresentException)
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+                                        NoAlertPresentException, StaleElementReferenceException)
+from . import locator, scripts
+from .cache import ElementCache
+from .clock import Clock
+from .polling import Poller
+from .registry import default_registry
+
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+# numpy, Select, Snapshot, Table and PooledRemoteConnection are imported on first
+# use, so that importing seleniumwrapper stays cheap (see test_import).
+_numpy = None
+
+
+def _Select(element):
+    from selenium.webdriver.support.select import Select
+    return Select(element)
 
 
 def create(drivername, *args, **kwargs):
     if not isinstance(drivername, str):
         msg = "drivername should be an instance of string. given {0}".format(type(drivername))
         raise TypeError(msg)
-    drivers = {'ie': Ie,
-               'opera': Opera,
-               'chrome': Chrome,
-               'firefox': Firefox,
-               'phantomjs': PhantomJS}
-    dname = drivername.lower()
-    if dname in drivers:
-        try:
-            return SeleniumWrapper(drivers[dname](*args, **kwargs))
-        except Exception as e:
-            raise e
-    else:
-        msg = "".join(("drivername should be one of [IE, Opera, Chrome, Firefox, PhantomJS]",
-                       "(case-insentive). given {0}".format(drivername)))
-        raise ValueError(msg)
+    driver = default_registry.driver(drivername)
+    return SeleniumWrapper(driver(*args, **kwargs))
 
 
-def connect(drivername, executor, custom_capabilities=None, **kwargs):
+def connect(drivername, executor, custom_capabilities=None, pool_size=None, nodelay=True, **kwargs):
     if not isinstance(drivername, str):
         msg = "drivername should be an instance of string. given {0}".format(type(drivername))
         raise TypeError(msg)
-    if not isinstance(executor, str):
-        msg = "executor should be an instance of string. given {0}".format(type(executor))
+    if not isinstance(executor, (str, RemoteConnection)):
+        msg = "executor should be an instance of string or RemoteConnection. given {0}".format(type(executor))
         raise TypeError(msg)
     if custom_capabilities and not isinstance(custom_capabilities, dict):
         msg = "custom_capabilities should be an instance of dict. given {0}".format(type(custom_capabilities))
         raise TypeError(msg)
-    capabilities = {'ie': DesiredCapabilities.INTERNETEXPLORER,
-                    'opera': DesiredCapabilities.OPERA,
-                    'chrome': DesiredCapabilities.CHROME,
-                    'firefox': DesiredCapabilities.FIREFOX,
-                    'android': DesiredCapabilities.ANDROID,
-                    'phatomjs': DesiredCapabilities.PHANTOMJS}
-    dname = drivername.lower()
-    if dname in capabilities:
-        capability = capabilities[dname]
-        custom_capabilities = custom_capabilities or {}
-        for key in custom_capabilities:
-            capability[key] = custom_capabilities[key]
-        driver = selenium.webdriver.Remote(executor, capability, **kwargs)
-        try:
-            return SeleniumWrapper(driver)
-        except Exception as e:
-            raise e
-    else:
-        msg = "".join(("drivername should be one of [IE, Opera, Chrome, Firefox, PhantomJS]",
-                       "(case-insentive). given {0}".format(drivername)))
-        raise ValueError(msg)
+    capability = default_registry.capabilities(drivername)
+    capability.update(custom_capabilities or {})
+    if pool_size is not None and isinstance(executor, str):
+        from .transport import PooledRemoteConnection
+        executor = PooledRemoteConnection(executor, pool_size=pool_size, nodelay=nodelay)
+    driver = selenium.webdriver.Remote(executor, capability, **kwargs)
+    return SeleniumWrapper(driver)
+
+
+_default_poller = Poller()
+_default_clock = Clock()
+_WRAPPABLE = (WebDriver, WebElement)
+_MISSING = object()
+_PLAIN = object()
+MethodDescriptorType = type(list.append)
+_LOCATOR_TYPES = ("id", "name", "xpath", "link_text", "partial_link_text", "tag", "class", "css")
+# script timeout of each session as set by SeleniumWrapper.set_script_timeout
+# (the wire protocol can't read it), restored after waits which change it,
+# and the one last sent to each session, which isn't sent again.
+_script_timeouts = weakref.WeakKeyDictionary()
+_sent_script_timeouts = weakref.WeakKeyDictionary()
+
+
+def _send_script_timeout(driver, seconds):
+    if _sent_script_timeouts.get(driver) != seconds:
+        driver.set_script_timeout(seconds)
+        _sent_script_timeouts[driver] = seconds
+
+
+def _with_script_timeout(driver, seconds, function, *args):
+    # sessions whose timeout was never set through the wrapper keep seconds.
+    _send_script_timeout(driver, seconds)
+    try:
+        return function(*args)
+    finally:
+        if driver in _script_timeouts:
+            try:
+                _send_script_timeout(driver, _script_timeouts[driver])
+            except WebDriverException:
+                pass
 
 
 def _is_wrappable(obj):
-    if isinstance(obj, WebDriver) or isinstance(obj, WebElement):
-        return True
-    else:
-        return False
+    return isinstance(obj, _WRAPPABLE)
 
 
-def _chainreact(__getattr__):
-    def containment(*methodname):
-        def wrap_or_else(obj):
-            if _is_wrappable(obj):
-                return SeleniumWrapper(obj)
-            else:
-                return obj
+def _wrap_or_else(obj, owner=None):
+    # wrapped with the options of owner, the wrapper obj was reached through.
+    if isinstance(obj, _WRAPPABLE):
+        if owner is None:
+            return SeleniumWrapper(obj)
+        return SeleniumWrapper(obj, owner._timeout, owner._silent, owner._observe, owner._poller, owner._cache,
+                               owner._clock)
+    return obj
 
-        self, methodobj = __getattr__(*methodname)
-        if inspect.isroutine(methodobj):
-            def reaction(*realargs):
-                result = methodobj(*realargs)
-                # for side-effective method(append, ...)
-                return wrap_or_else(result)
 
-            return reaction
-        else:
-            return wrap_or_else(methodobj)
+def _react(owner, methodobj, *args, **kwargs):
+    # for side-effective method(append, ...)
+    return _wrap_or_else(methodobj(*args, **kwargs), owner)
+
+
+def _reaction(function):
+    def reaction(obj, owner, *args, **kwargs):
+        return _wrap_or_else(function(obj, *args, **kwargs), owner)
+    return reaction
+
 
-    return containment
+# (type, name) => (reaction, has_dict) for functions defined on the type,
+# (_PLAIN, has_dict) for other plain attributes and (None, has_dict) for
+# descriptors (staticmethod, classmethod, property, ...), which are looked
+# up on the object each time. Attributes which are not defined on the type
+# itself are not cached because they may differ between instances.
+_reactions = {}
+_UNKNOWN = (None, False)
+
+
+def _getattr_static(cls, name):
+    # as inspect.getattr_static (Python3.2+), without looking at the metaclass.
+    for klass in inspect.getmro(cls):
+        if name in klass.__dict__:
+            return klass.__dict__[name]
+    return _MISSING
+
+
+def _cache_reaction(key):
+    # the raw attribute, not the one bound (or unwrapped) by getattr.
+    classattr = _getattr_static(key[0], key[1])
+    if classattr is _MISSING:
+        return _UNKNOWN
+    if isinstance(classattr, (FunctionType, MethodDescriptorType)):
+        reaction = _reaction(classattr)
+    elif hasattr(type(classattr), "__get__") or inspect.isroutine(classattr):
+        reaction = None
+    else:
+        reaction = _PLAIN
+    cached = _reactions[key] = (reaction, key[0].__dictoffset__ != 0)
+    return cached
+
+
+def _chainreact(obj, name, owner=None):
+    key = (type(obj), name)
+    reaction, has_dict = _reactions.get(key) or _cache_reaction(key)
+    if reaction is not None and not (has_dict and name in obj.__dict__):
+        if reaction is _PLAIN:
+            return _wrap_or_else(getattr(obj, name), owner)
+        return partial(reaction, obj, owner)
+    attr = getattr(obj, name)
+    if inspect.isroutine(attr):
+        return partial(_react, owner, attr)
+    return _wrap_or_else(attr, owner)
+
+
+class _Delegated(object):
+    """Installed on a wrapper class after the first miss of a public name,
+    so that later lookups of the name skip the failing normal lookup."""
+    __slots__ = ("name", "target")
+
+    def __init__(self, name, target):
+        self.name = name
+        self.target = attrgetter(target)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return _chainreact(self.target(instance), self.name, instance)
+
+
+def _delegate(wrapper, target, name):
+    # raises AttributeError first if the wrapped object has no such name, so
+    # that misses (hasattr, ...) don't install descriptors.
+    delegated = _chainreact(getattr(wrapper, target), name, wrapper)
+    cls = type(wrapper)
+    if not name.startswith("_") and name not in cls.__dict__:
+        setattr(cls, name, _Delegated(name, target))
+    return delegated
+
+
+_FINDERS = {"id": "find_element_by_id",
+            "name": "find_element_by_name",
+            "xpath": "find_element_by_xpath",
+            "link_text": "find_element_by_link_text",
+            "partial_link_text": "find_element_by_partial_link_text",
+            "tag": "find_element_by_tag_name",
+            "class": "find_element_by_class_name",
+            "css": "find_element_by_css_selector"}
+
+
+def _finder(type, target, eager):
+    methodname = _FINDERS[type]
+    if eager:
+        methodname = methodname.replace("find_element_", "find_elements_")
+    return lambda d: getattr(d, methodname)(target)
 
 
 class Performance(object):
@@ -124,57 +232,188 @@ class Performance(object):
         raise AttributeError('window.performance.timing is not supported in this browser.')
 
 
-class Memory(object):
-    def __init__(self, memory):
-        self._memory = memory
-
-    def __getattr__(self, name):
-        return self._memory[name]
-
-    @property
-    def __dict__(self):
-        return self._memory
-
-    def __iter__(self):
-        return iter(self._memory)
-
-
-class Navigation(object):
-    def __init__(self, navigation):
-        self._navigation = navigation
-
-    def __getattr__(self, name):
-        return self._navigation[name]
-
-    @property
-    def __dict__(self):
-        return self._navigation
-
-    def __iter__(self):
-        return iter(self._navigation)
-
-
-class Timing(object):
-    def __init__(self, timing):
-        self._timing = timing
+def _number(value):
+    # numeric strings as numbers, anything else as given.
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return value
+
+
+def _value(sample, name):
+    # field of sample for columns and summaries, None if missing or not a number.
+    try:
+        value = getattr(sample, name)
+    except (AttributeError, KeyError):
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _nan_if_none(value):
+    return float("nan") if value is None else value
+
+
+def _percentile(ordered, percent):
+    # linear interpolation between closest ranks, as numpy.percentile
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * percent / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _summarize(columns, percentiles):
+    summary = {}
+    for name in columns:
+        ordered = sorted(columns[name])
+        stat = {"count": len(ordered),
+                "min": ordered[0] if ordered else None,
+                "max": ordered[-1] if ordered else None,
+                "mean": float(sum(ordered)) / len(ordered) if ordered else None}
+        for percent in percentiles:
+            stat["p{0}".format(percent)] = _percentile(ordered, percent)
+        summary[name] = stat
+    return summary
+
+
+class _Record(object):
+    """Known fields read from a dict of window.performance, as numbers where
+    they are numeric. Fields missing from the dict raise KeyError as the
+    dict did, and unknown ones are dropped."""
+    __slots__ = ()
+    _fields = ()
+
+    def __init__(self, values):
+        for name in self._fields:
+            if name in values:
+                setattr(self, name, _number(values[name]))
 
     def __getattr__(self, name):
-        return self._timing[name]
+        # only called for fields which were not given
+        if name in self._fields:
+            raise KeyError(name)
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+
+    def _given(self):
+        given = []
+        for name in self._fields:
+            try:
+                given.append((name, object.__getattribute__(self, name)))
+            except AttributeError:
+                pass
+        return given
 
     @property
     def __dict__(self):
-        return self._timing
+        return dict(self._given())
 
     def __iter__(self):
-        return iter(self._timing)
+        return iter([name for name, value in self._given()])
+
+    def __repr__(self):
+        return "<{0} {1}>".format(type(self).__name__, " ".join(
+            ["{0}={1}".format(name, value) for name, value in self._given()]))
+
+    @classmethod
+    def columns(cls, samples, fields=None):
+        """Returns {field: array of values of samples}, numpy.ndarray if
+        numpy is installed, else array.array('d'). Missing values are nan."""
+        fields = fields or cls._fields
+        return dict((name, _column([_nan_if_none(_value(sample, name)) for sample in samples]))
+                    for name in fields)
+
+    @classmethod
+    def summary(cls, samples, percentiles=(50, 90, 99)):
+        """Returns {field: {count, min, max, mean, p50, ...}} of the samples
+        which have the field."""
+        fields = cls._fields
+        return _summarize(dict((name, [value for value in [_value(sample, name) for sample in samples]
+                                       if value is not None]) for name in fields), percentiles)
+
+
+def _column(values):
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = False
+    if _numpy:
+        return _numpy.array(values, dtype=float)
+    return array("d", values)
+
+
+class Memory(_Record):
+    __slots__ = ("jsHeapSizeLimit", "totalJSHeapSize", "usedJSHeapSize")
+    _fields = __slots__
+
+
+class Navigation(_Record):
+    __slots__ = ("type", "redirectCount")
+    _fields = __slots__
+
+
+class Timing(_Record):
+    __slots__ = ("navigationStart", "unloadEventStart", "unloadEventEnd", "redirectStart", "redirectEnd",
+                 "fetchStart", "domainLookupStart", "domainLookupEnd", "connectStart", "connectEnd",
+                 "secureConnectionStart", "requestStart", "responseStart", "responseEnd", "domLoading",
+                 "domInteractive", "domContentLoadedEventStart", "domContentLoadedEventEnd", "domComplete",
+                 "loadEventStart", "loadEventEnd")
+    _fields = __slots__
+    # phase => (start field, end field)
+    PHASES = {"redirect": ("redirectStart", "redirectEnd"),
+              "dns": ("domainLookupStart", "domainLookupEnd"),
+              "connect": ("connectStart", "connectEnd"),
+              "request": ("requestStart", "responseStart"),
+              "response": ("responseStart", "responseEnd"),
+              "dom": ("domLoading", "domComplete"),
+              "load": ("loadEventStart", "loadEventEnd"),
+              "total": ("navigationStart", "loadEventEnd")}
+
+    @classmethod
+    def phases(cls, samples):
+        """Returns {phase: array of milliseconds spent in the phase by samples},
+        nan for samples missing its fields."""
+        return dict((phase, _column([_nan_if_none(cls._elapsed(sample, start, end)) for sample in samples]))
+                    for phase, (start, end) in cls.PHASES.items())
+
+    @staticmethod
+    def _elapsed(sample, start, end):
+        # None if a field is missing, 0 if the phase didn't happen (0 fields).
+        started, ended = _value(sample, start), _value(sample, end)
+        if started is None or ended is None:
+            return None
+        return ended - started if started and ended else 0
+
+    @classmethod
+    def summary(cls, samples, percentiles=(50, 90, 99)):
+        """Returns {phase: {count, min, max, mean, p50, ...}} of PHASES, of
+        the samples which have its fields."""
+        return _summarize(dict((phase, [elapsed for elapsed in [cls._elapsed(sample, start, end) for sample in samples]
+                                        if elapsed is not None]) for phase, (start, end) in cls.PHASES.items()),
+                          percentiles)
 
 
 class SeleniumWrapper(object):
-    def __init__(self, driver, timeout=5, silent=False):
+    __slots__ = ("_wrapped", "_timeout", "_silent", "_observe", "_poller", "_cache", "_clock")
+
+    def __init__(self, driver, timeout=5, silent=False, observe=False, poller=None, cache=None, clock=None):
         if _is_wrappable(driver):
             self._wrapped = driver
             self._timeout = timeout
             self._silent = silent
+            self._observe = observe
+            self._poller = poller or _default_poller
+            self._clock = clock or _default_clock
+            self._cache = ElementCache(clock=self._clock) if cache is True else (None if cache is False else cache)
         else:
             msg = "2nd argument should be an instance of WebDriver or WebElement. given {0}.".format(type(driver))
             raise TypeError(msg)
@@ -183,23 +422,53 @@ class SeleniumWrapper(object):
     def unwrap(self):
         return self._wrapped
 
+    def set_script_timeout(self, time_to_wait):
+        """Sets the script timeout of the session, which waits restore after
+        changing it. Set it through the wrapper rather than the driver, which
+        waits don't see."""
+        driver = self._driver
+        driver.set_script_timeout(time_to_wait)
+        _script_timeouts[driver] = _sent_script_timeouts[driver] = time_to_wait
+
     @property
     def performance(self):
-        if isinstance(self._wrapped, WebDriver):
-            if self._wrapped.execute_script("return 'performance' in window;"):
-                timeout = time.time() + 120
-                script = "return window.performance.timing.loadEventEnd;"
-                executor = self._wrapped.execute_script
-                while time.time() < timeout and not executor(script):
-                    time.sleep(0.2)
-                if not executor(script):
-                    raise Exception('Timeout!')
-                performance = self._wrapped.execute_script('return window.performance;')
-                return Performance(performance)
-            else:
-                raise AttributeError("This browser is not supporting Timing APIs.")
-        else:
+        return self.get_performance()
+
+    def get_performance(self, timeout=None, wait=True):
+        """Returns Performance once the load event has finished, waiting up to
+        timeout seconds (the wrapper's timeout by default). With wait=False,
+        returns the timings of the moment, loadEventEnd may be 0."""
+        if not isinstance(self._wrapped, WebDriver):
             raise AttributeError("'WebElement' object has not attribute 'performance'")
+        timeout = timeout or self._timeout
+        msg = "Waited for page to be loaded for {sec} seconds, but it was not loaded.".format(sec=timeout)
+        try:
+            performance = _with_script_timeout(self._wrapped, timeout, self._wrapped.execute_async_script,
+                                               scripts.PERFORMANCE, wait)
+        except TimeoutException:
+            raise TimeoutException(msg)
+        except WebDriverException:
+            # execute_async_script is not supported.
+            performance = self._polled_performance(timeout, wait, msg)
+        if performance is None:
+            raise AttributeError("This browser is not supporting Timing APIs.")
+        return Performance(performance)
+
+    def _polled_performance(self, timeout, wait, msg):
+        executor = self._wrapped.execute_script
+        if not executor("return 'performance' in window;"):
+            return None
+        if wait:
+            script = "return window.performance.timing.loadEventEnd;"
+            self._poller.poll("performance", timeout, lambda: executor(script), 0.2, message=msg,
+                              clock=self._clock)
+        return executor('return window.performance;')
+
+    @property
+    def _driver(self):
+        if isinstance(self._wrapped, WebDriver):
+            return self._wrapped
+        return self._wrapped.parent
 
     @property
     def parent(self):
@@ -211,21 +480,22 @@ class SeleniumWrapper(object):
     @property
     def to_select(self):
         if self._is_selectable():
-            return Select(self.unwrap)
+            return _Select(self.unwrap)
         raise TypeError("Must be 'select' element.")
 
     @property
     def alert(self):
-        timeout = time.time() + self._timeout
-        while time.time() < timeout:
-            try:
-                alert = self._wrapped.switch_to_alert()
-                alert.text
-                return alert
-            except NoAlertPresentException:
-                time.sleep(0.2)
-        msg = "Wait for alert to be displayed for 2 seconds, but it was not displayed."
-        raise NoAlertPresentException(msg)
+        def displayed():
+            alert = self._wrapped.switch_to_alert()
+            alert.text
+            return alert
+
+        try:
+            return self._poller.poll("alert", self._timeout, displayed, 0.2, (NoAlertPresentException,),
+                                     clock=self._clock)
+        except TimeoutException:
+            msg = "Wait for alert to be displayed for {sec} seconds, but it was not displayed.".format(sec=self._timeout)
+            raise NoAlertPresentException(msg)
 
     def _settimeout(self, timeout):
         if isinstance(timeout, (int, float)):
@@ -248,52 +518,109 @@ class SeleniumWrapper(object):
             raise AttributeError
         self._silent = true_of_false
 
-    def __getattribute__(self, name):
-        return object.__getattribute__(self, name)
+    @property
+    def observe(self):
+        return self._observe
+
+    @observe.setter
+    def observe(self, true_of_false):
+        if not isinstance(true_of_false, bool):
+            raise AttributeError
+        self._observe = true_of_false
+
+    @property
+    def poller(self):
+        return self._poller
+
+    @poller.setter
+    def poller(self, poller):
+        if not isinstance(poller, Poller):
+            raise AttributeError
+        self._poller = poller
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @property
+    def clock(self):
+        return self._clock
+
+    @clock.setter
+    def clock(self, clock):
+        if not isinstance(clock, Clock):
+            raise AttributeError
+        self._clock = clock
 
-    @_chainreact
     def __getattr__(self, name):
-        return self._wrapped, getattr(self._wrapped, name)
+        return _delegate(self, "_wrapped", name)
+
+    def _navigate(self, name, *args):
+        if self._cache is not None:
+            self._cache.clear()
+        return _chainreact(self._wrapped, name, self)(*args)
+
+    def get(self, url):
+        return self._navigate("get", url)
+
+    def back(self):
+        return self._navigate("back")
+
+    def forward(self):
+        return self._navigate("forward")
+
+    def refresh(self):
+        return self._navigate("refresh")
+
+    def _spawn(self, element):
+        return SeleniumWrapper(element, self._timeout, self._silent, self._observe, self._poller, self._cache,
+                               self._clock)
+
+    def _spawn_all(self, elements):
+        return SeleniumContainerWrapper(elements, self._timeout, self._silent, self._observe, self._poller,
+                                        self._cache, self._clock)
 
     def _is_selectable(self):
         return self.unwrap.tag_name == 'select'
 
-    def _is_stopping(self, interval):
-        before = (self._wrapped.location['x'], self._wrapped.location['y'])
-        time.sleep(interval)
-        after = (self._wrapped.location['x'], self._wrapped.location['y'])
-        return before[0] == after[0] and before[1] == after[1]
-
     def _wait_until_stopping(self, timeout, interval):
-        timeout = time.time() + timeout
-        while time.time() < timeout:
-            if self._is_stopping(interval):
-                return True
-            else:
-                time.sleep(interval)
-        if not self._is_stopping(interval):
+        # compares the location with the one read by the previous polling
+        last = [None]
+
+        def stopping():
+            location = self._wrapped.location
+            position = (location['x'], location['y'])
+            stopped = position == last[0]
+            last[0] = position
+            return stopped
+
+        try:
+            return self._poller.poll("click.stopping", timeout, stopping, interval, (), clock=self._clock)
+        except TimeoutException:
             raise WebDriverException("Element was not stably displayed for {sec} seconds.".format(sec=timeout))
 
     def _wait_until_clickable(self, timeout, interval):
         err_messages = []
-        endtime = time.time() + timeout
-        while True:
+
+        def clicked():
             try:
                 self._wrapped.click()
-                break
+                return True
             except WebDriverException as e:
                 err_messages.append(e.msg.split(":")[-1].strip())
-            time.sleep(interval)
-            if (time.time() > endtime):
-                if err_messages:
-                    template = ("Waited for element to be clickable for {sec} seconds, ",
-                                "but clicked other elements. {err}")
-                    msg = "".join(template).format(sec=timeout, err=err_messages)
-                    raise WebDriverException(msg)
+
+        try:
+            self._poller.poll("click.clickable", timeout, clicked, interval, (), clock=self._clock)
+        except TimeoutException:
+            template = ("Waited for element to be clickable for {sec} seconds, ",
+                        "but clicked other elements. {err}")
+            msg = "".join(template).format(sec=timeout, err=err_messages)
+            raise WebDriverException(msg)
 
     def _wait_until_displayed(self, timeout, interval):
         try:
-            WebDriverWait(self._wrapped, timeout, interval).until(lambda d: d.is_displayed())
+            self._poller.poll("click.displayed", timeout, self._wrapped.is_displayed, interval, (),
+                              clock=self._clock)
         except TimeoutException:
             template = ("Waited for element to be displayed for {sec} seconds, ",
                         "but <{target} ...> was not displayed:: <{dumped}>")
@@ -301,15 +628,49 @@ class SeleniumWrapper(object):
             raise ElementNotVisibleException(msg)
 
     def _dump(self):
-        element = self._wrapped
-        info = {"visibility": element.value_of_css_property("visibility"),
-                "display": element.value_of_css_property("display"),
-                "height": element.value_of_css_property("height"),
-                "width": element.value_of_css_property("width"),
-                "x": element.location["x"],
-                "y": element.location["y"]}
-        dumped = " ".join(["{k}:{v}".format(k=k, v=info[k]) for k in info])
-        return dumped
+        return self._format_dump(self._driver.execute_script(scripts.CLICK_READINESS, self._wrapped))
+
+    def _format_dump(self, info):
+        keys = ("visibility", "display", "height", "width", "x", "y")
+        return " ".join(["{k}:{v}".format(k=k, v=info[k]) for k in keys])
+
+    def _wait_until_ready(self, timeout, interval):
+        progress = {"last": None, "errors": []}
+        try:
+            return self._poller.poll("click.ready", timeout, lambda: self._ready_step(progress), interval, (),
+                                     clock=self._clock)
+        except TimeoutException:
+            raise self._not_ready(progress, timeout)
+
+    def _ready_step(self, progress):
+        # one polling of scripted click. progress is carried between pollings.
+        state = progress["state"] = self._driver.execute_script(scripts.CLICK_READINESS, self._wrapped)
+        position = (state["x"], state["y"])
+        progress["stopping"] = position == progress["last"]
+        progress["last"] = position
+        if state["blockers"]:
+            progress["errors"].extend(state["blockers"])
+        elif progress["stopping"] and state["displayed"]:
+            try:
+                self._wrapped.click()
+                return True
+            except WebDriverException as e:
+                progress["errors"].append(e.msg.split(":")[-1].strip())
+        return False
+
+    def _not_ready(self, progress, timeout):
+        state = progress["state"]
+        if not progress["stopping"]:
+            return WebDriverException("Element was not stably displayed for {sec} seconds.".format(sec=timeout))
+        if not state["displayed"]:
+            template = ("Waited for element to be displayed for {sec} seconds, ",
+                        "but <{target} ...> was not displayed:: <{dumped}>")
+            msg = "".join(template).format(sec=timeout, target=self._wrapped.tag_name,
+                                           dumped=self._format_dump(state))
+            return ElementNotVisibleException(msg)
+        template = ("Waited for element to be clickable for {sec} seconds, ",
+                    "but clicked other elements. {err}")
+        return WebDriverException("".join(template).format(sec=timeout, err=progress["errors"]))
 
     def attr(self, name):
         if isinstance(self._wrapped, WebElement):
@@ -317,17 +678,20 @@ class SeleniumWrapper(object):
         else:
             raise AttributeError("This is WebDriver wrapped object.")
 
-    def click(self, timeout=None, presleep=0, postsleep=0):
+    def click(self, timeout=None, presleep=0, postsleep=0, scripted=False):
         timeout = timeout or self._timeout
         if isinstance(self._wrapped, WebElement):
             try:
                 if presleep:
-                    time.sleep(presleep)
-                self._wait_until_stopping(timeout, 0.01)
-                self._wait_until_displayed(timeout, 0.01)
-                self._wait_until_clickable(timeout, 0.01)
+                    self._clock.sleep(presleep)
+                if scripted:
+                    self._wait_until_ready(timeout, 0.01)
+                else:
+                    self._wait_until_stopping(timeout, 0.01)
+                    self._wait_until_displayed(timeout, 0.01)
+                    self._wait_until_clickable(timeout, 0.01)
                 if postsleep:
-                    time.sleep(postsleep)
+                    self._clock.sleep(postsleep)
             except Exception as e:
                 raise e
 
@@ -356,41 +720,208 @@ class SeleniumWrapper(object):
 
     def waitfor(self, type, target, eager=False, timeout=None):
         timeout = timeout or self._timeout
+        if self._cache is not None:
+            return self._cached_waitfor(type, target, eager, timeout)
+        try:
+            return self._found(self._search(type, target, eager, timeout), eager)
+        except TimeoutException:
+            return self._missing(type, target, timeout)
+
+    def _search(self, type, target, eager, timeout):
+        result = self._observe_for(type, target, eager, timeout) if self._observe else _MISSING
+        if result is _MISSING:
+            finder = _finder(type, target, eager)
+            result = self._poller.poll("waitfor", timeout, lambda: finder(self._wrapped), 0.5, clock=self._clock)
+        elif not result:
+            raise TimeoutException()
+        return result
+
+    def _cache_key(self, type, target, eager):
+        driver = self._driver
+        return (id(driver), None if driver is self._wrapped else self._wrapped.id, type, target, eager)
+
+    def _cached_waitfor(self, type, target, eager, timeout):
+        key = self._cache_key(type, target, eager)
+        result = self._cache.lookup(key, self._driver)
+        if result is None:
+            try:
+                result = self._search(type, target, eager, timeout)
+            except TimeoutException:
+                return self._missing(type, target, timeout)
+            self._cache.store(key, result, self._driver)
         if eager:
-            types = {"id": lambda d: d.find_elements_by_id(target),
-                     "name": lambda d: d.find_elements_by_name(target),
-                     "xpath": lambda d: d.find_elements_by_xpath(target),
-                     "link_text": lambda d: d.find_elements_by_link_text(target),
-                     "partial_link_text": lambda d: d.find_elements_by_partial_link_text(target),
-                     "tag": lambda d: d.find_elements_by_tag_name(target),
-                     "class": lambda d: d.find_elements_by_class_name(target),
-                     "css": lambda d: d.find_elements_by_css_selector(target), }
+            return self._found(result, eager)
+        return _Refinding(result, self, type, target)
+
+    def _found(self, result, eager):
+        if eager and len(result):
+            return self._spawn_all(result)
+        elif _is_wrappable(result):
+            return self._spawn(result)
         else:
-            types = {"id": lambda d: d.find_element_by_id(target),
-                     "name": lambda d: d.find_element_by_name(target),
-                     "xpath": lambda d: d.find_element_by_xpath(target),
-                     "link_text": lambda d: d.find_element_by_link_text(target),
-                     "partial_link_text": lambda d: d.find_element_by_partial_link_text(target),
-                     "tag": lambda d: d.find_element_by_tag_name(target),
-                     "class": lambda d: d.find_element_by_class_name(target),
-                     "css": lambda d: d.find_element_by_css_selector(target), }
-        finder = types[type]
+            return result
+
+    def _missing(self, type, target, timeout):
+        if self.silent:
+            return None
+        else:
+            template = ("Waited for element to appear for {sec} seconds, ",
+                        "but {type}:{target} didn't appear.")
+            msg = "".join(template).format(sec=timeout, type=type, target=target)
+            raise NoSuchElementException(msg)
+
+    def _observe_for(self, type, target, eager, timeout):
+        driver = self._driver
+        scope = None if driver is self._wrapped else self._wrapped
         try:
-            result = WebDriverWait(self._wrapped, timeout).until(finder)
-            if eager and len(result):
-                return SeleniumContainerWrapper(result, self.timeout, self.silent)
-            elif _is_wrappable(result):
-                return SeleniumWrapper(result, self.timeout, self.silent)
-            else:
-                return result
+            return _with_script_timeout(driver, timeout + 5, driver.execute_async_script, scripts.OBSERVE, scope,
+                                        type, target, eager, timeout)
         except TimeoutException:
-            if self.silent:
-                return None
-            else:
-                template = ("Waited for element to appear for {sec} seconds, ",
-                            "but {type}:{target} didn't appear.")
-                msg = "".join(template).format(sec=timeout, type=type, target=target)
-                raise NoSuchElementException(msg)
+            return None
+        except WebDriverException:
+            # execute_async_script or MutationObserver is not supported.
+            return _MISSING
+
+    def find_many(self, locators, timeout=None):
+        timeout = timeout or self._timeout
+        queries = {}
+        for key in locators:
+            query = locators[key]
+            query = query.compile() if isinstance(query, locator.Locator) else tuple(query)
+            if len(query) == 2:
+                query += (False,)
+            if query[0] not in _LOCATOR_TYPES:
+                msg = "locator type should be one of {0}. given {1}".format(_LOCATOR_TYPES, query[0])
+                raise ValueError(msg)
+            queries[key] = [query[0], query[1], bool(query[2])]
+        scope = None if isinstance(self._wrapped, WebDriver) else self._wrapped
+        executor = self._driver.execute_script
+        pending = list(queries)
+        found = {}
+
+        def resolved():
+            results = executor(scripts.FIND_MANY, scope, [queries[key] for key in pending])
+            for key, result in zip(pending, results):
+                if isinstance(result, list):
+                    found[key] = self._spawn_all(result)
+                elif _is_wrappable(result):
+                    found[key] = self._spawn(result)
+            pending[:] = [key for key in pending if key not in found]
+            return not pending
+
+        try:
+            self._poller.poll("find_many", timeout, resolved, 0.5, clock=self._clock)
+        except TimeoutException:
+            pass
+        if pending and not self.silent:
+            template = ("Waited for elements to appear for {sec} seconds, ",
+                        "but {targets} didn't appear.")
+            targets = ", ".join(["{0}:{1}".format(*queries[key][:2]) for key in pending])
+            raise NoSuchElementException("".join(template).format(sec=timeout, targets=targets))
+        for key in pending:
+            found[key] = None
+        return found
+
+    def fill_form(self, mapping, by="name", timeout=None, native=None):
+        """Fills fields of the page (or of the wrapped form) located by keys of
+        mapping with its values, with one script per polling: text for inputs
+        and textareas, bool for checkboxes, the value of the radio to check
+        and values or texts of options (a list for multiple selects). Fields
+        listed in native (or all if True), and the ones a script can't fill
+        like file inputs, are filled with send_keys or click. Buttons and
+        hidden inputs are not filled, and disabled fields are waited for
+        to be enabled. Returns a dict of ActionResult by key; fields missing
+        after timeout seconds raise NoSuchElementException unless silent."""
+        if by not in _LOCATOR_TYPES:
+            msg = "locator type should be one of {0}. given {1}".format(_LOCATOR_TYPES, by)
+            raise ValueError(msg)
+        timeout = timeout or self._timeout
+        scope = None if isinstance(self._wrapped, WebDriver) else self._wrapped
+        executor = self._driver.execute_script
+        results = dict((key, ActionResult(None)) for key in mapping)
+        pending = list(mapping)
+
+        def filled():
+            fields = [[key, mapping[key], native is True or bool(native and key in native)] for key in pending]
+            for key, report in zip(list(pending), executor(scripts.FILL_FORM, scope, by, fields)):
+                result = results[key]
+                result.polls += 1
+                if report is None:
+                    result.error = "not found"
+                    continue
+                element, kind, result.error, natively = report
+                result.element = self._spawn(element)
+                if result.error == "disabled":
+                    # not ready yet, tried again on the next polling
+                    continue
+                pending.remove(key)
+                if result.error is None and natively:
+                    result.via = "native"
+                    try:
+                        self._fill_natively(element, kind, mapping[key])
+                    except WebDriverException as e:
+                        result.error = e.msg
+                elif result.error is None:
+                    result.via = "script"
+                result.ok = result.error is None
+            return not pending
+
+        try:
+            self._poller.poll("fill_form", timeout, filled, 0.5, clock=self._clock)
+        except TimeoutException:
+            pass
+        missing = [key for key in pending if results[key].element is None]
+        if missing and not self.silent:
+            template = ("Waited for fields to appear for {sec} seconds, ",
+                        "but {targets} didn't appear.")
+            targets = ", ".join(["{0}:{1}".format(by, key) for key in missing])
+            raise NoSuchElementException("".join(template).format(sec=timeout, targets=targets))
+        return results
+
+    def _fill_natively(self, element, kind, value):
+        if kind == "checkbox" or kind == "radio":
+            if element.is_selected() != (kind == "radio" or bool(value)):
+                element.click()
+        elif kind == "select":
+            select = _Select(element)
+            for wanted in value if isinstance(value, (list, tuple)) else [value]:
+                try:
+                    select.select_by_value(str(wanted))
+                except NoSuchElementException:
+                    select.select_by_visible_text(str(wanted))
+        else:
+            if kind == "text":
+                element.clear()
+            element.send_keys(str(value))
+
+    def stream(self, type, target, chunk_size=100, autoscroll=False, settle=2, limit=None, timeout=None):
+        if type not in _LOCATOR_TYPES:
+            msg = "locator type should be one of {0}. given {1}".format(_LOCATOR_TYPES, type)
+            raise ValueError(msg)
+        return SeleniumStreamWrapper(self, type, target, chunk_size, autoscroll, settle, limit, timeout)
+
+    def snapshot(self, parser=None):
+        """Returns snapshot.Snapshot of the document (or of the wrapped element)
+        read with one command, whose finders run in-process."""
+        from .snapshot import Snapshot
+        scope = None if isinstance(self._wrapped, WebDriver) else self._wrapped
+        return Snapshot(self._driver.execute_script(scripts.SNAPSHOT, scope), self, parser)
+
+    def table(self, selector="table", chunk_size=100, links=False, headers=None, timeout=None):
+        """Waits for a table located by selector (CSS, (type, target) or
+        locator.Locator) and returns table.Table of it, reading chunk_size
+        rows per script while iterating."""
+        from .table import Table
+        if isinstance(selector, str):
+            type, target = "css", selector
+        elif isinstance(selector, tuple):
+            type, target = selector
+        else:
+            type, target = selector.compile()
+        found = self.waitfor(type, target, timeout=timeout)
+        if found is None:
+            return None
+        return Table(found.unwrap, chunk_size, links, headers)
 
     def xpath(self, target, eager=False, timeout=None):
         return self.waitfor("xpath", target, eager, timeout)
@@ -398,16 +929,15 @@ class SeleniumWrapper(object):
     def css(self, target, eager=False, timeout=None):
         return self.waitfor("css", target, eager, timeout)
 
+    def locate(self, locator, eager=False, timeout=None):
+        """Waits for a locator.Locator (compiled once, to CSS when possible)."""
+        return self.waitfor(*locator.compile(), eager=eager, timeout=timeout)
+
     def by_tag(self, tag, eager=False, timeout=None, **attributes):
-        subjects = ["@{key}='{val}'".format(key=k, val=attributes[k]) for k in attributes]
-        subject = " and ".join(subjects)
-        xpath = ".//{tag}[{subject}]".format(tag=tag, subject=subject) if subject else ".//{tag}".format(tag=tag)
-        return self.waitfor('xpath', xpath, eager, timeout)
+        return self.waitfor(*locator.by_tag(tag, attributes), eager=eager, timeout=timeout)
 
     def by_text(self, text, tag="*", partial=False, eager=False, timeout=None):
-        if partial:
-            return self.xpath(".//{tag}[contains(text(), '{text}')]".format(tag=tag, text=text), eager, timeout)
-        return self.xpath(".//{tag}[text()='{text}']".format(tag=tag, text=text), eager, timeout)
+        return self.waitfor(*locator.by_text(text, tag, partial), eager=eager, timeout=timeout)
 
     def by_class(self, target, eager=False, timeout=None):
         return self.waitfor("class", target, eager, timeout)
@@ -420,29 +950,18 @@ class SeleniumWrapper(object):
 
     def by_linktxt(self, target, eager=False, timeout=None, partial=False):
         if partial:
-            return self.waitfor("partial_link_text", target, eager, timeout=None)
+            return self.waitfor("partial_link_text", target, eager, timeout)
         else:
             return self.waitfor("link_text", target, eager, timeout)
 
     def href(self, partialurl=None, eager=False, timeout=None):
-        if partialurl:
-            return self.xpath(".//a[contains(@href, '{0}')]".format(partialurl), eager, timeout)
-        return self.xpath(".//a", eager, timeout)
+        return self.waitfor(*locator.href(partialurl), eager=eager, timeout=timeout)
 
     def img(self, alt=None, ext=None, eager=False, timeout=None):
-        options = []
-        if alt:
-            options.append("@alt='{0}'".format(alt))
-        if ext:
-            options.append("contains(@src, '{0}')".format(ext))
-        option = " and ".join(options)
-        xpath = ".//img" + "[{0}]".format(option) if option else ".//img"
-        return self.xpath(xpath, eager, timeout)
+        return self.waitfor(*locator.img(alt, ext), eager=eager, timeout=timeout)
 
     def button(self, value, eager=False, timeout=None):
-        return self.xpath(
-            ".//input[@type='submit' or @type='button' and @value='{0}']"
-            "|.//button[text()='{0}']".format(value), eager, timeout)
+        return self.waitfor(*locator.button(value), eager=eager, timeout=timeout)
 
     def checkbox(self, eager=False, timeout=None, **attributes):
         attributes["type"] = "checkbox"
@@ -455,10 +974,10 @@ class SeleniumWrapper(object):
     def select(self, eager=False, timeout=None, **attributes):
         selected = self.by_tag("select", eager, timeout, **attributes)
         if isinstance(selected, SeleniumWrapper) and selected._is_selectable():
-            return Select(selected.unwrap)
+            return _Select(selected.unwrap)
         elif isinstance(selected, SeleniumContainerWrapper):
             iterable = selected._iterable
-            selected._iterable = [Select(element) for element in iterable if element.tag_name == 'select']
+            selected._iterable = [_Select(element) for element in iterable if element.tag_name == 'select']
             return selected
         else:
             template = ("Waited for element to appear for {sec} seconds, ",
@@ -467,24 +986,102 @@ class SeleniumWrapper(object):
             raise NoSuchElementException(msg)
 
 
+class _Refinding(SeleniumWrapper):
+    """Element given by ElementCache. When it went stale on use, it is found
+    again with the locator and the use is retried once. If it can't be found
+    again, the StaleElementReferenceException is raised.
+
+    Elements of eager (container) hits are not refound: their position is
+    all that locates them, which doesn't identify an element once the list
+    has changed."""
+    __slots__ = ("_scope", "_type", "_target")
+
+    def __init__(self, element, scope, type, target):
+        SeleniumWrapper.__init__(self, element, scope._timeout, scope._silent, scope._observe,
+                                 scope._poller, scope._cache, scope._clock)
+        self._scope = scope
+        self._type = type
+        self._target = target
+
+    def _resolve(self, name):
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            return SeleniumWrapper.__getattr__(self, name)
+
+    def __getattribute__(self, name):
+        if name.startswith("_"):
+            return object.__getattribute__(self, name)
+        try:
+            attr = self._resolve(name)
+        except StaleElementReferenceException as e:
+            self._refind(e)
+            return self._resolve(name)
+        if isinstance(attr, (MethodType, partial)):
+            return self._retrying(name, attr)
+        return attr
+
+    def _retrying(self, name, method):
+        def retrying(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            except StaleElementReferenceException as e:
+                self._refind(e)
+                return self._resolve(name)(*args, **kwargs)
+        return retrying
+
+    def _refind(self, stale):
+        scope, cache = self._scope, self._cache
+        try:
+            self._wrapped = scope._search(self._type, self._target, False, self._timeout)
+        except (TimeoutException, NoSuchElementException) as e:
+            stale.__cause__ = e
+            raise stale
+        cache.stats["refinds"] += 1
+        cache.store(scope._cache_key(self._type, self._target, False), self._wrapped, scope._driver)
+
+
+class ActionResult(object):
+    """Outcome of a container action for one element. via is 'script' or
+    'native', error the last reason it was not done."""
+    __slots__ = ("element", "ok", "via", "error", "polls")
+
+    def __init__(self, element, ok=False, via=None, error=None, polls=0):
+        self.element = element
+        self.ok = ok
+        self.via = via
+        self.error = error
+        self.polls = polls
+
+    def __repr__(self):
+        state = "ok via {0}".format(self.via) if self.ok else "error={0!r}".format(self.error)
+        return "<ActionResult {0} polls={1}>".format(state, self.polls)
+
+
 class SeleniumContainerWrapper(object):
-    def __init__(self, iterable, timeout=5, silent=False):
-        if not isinstance(iterable, collections.Sequence):
+    __slots__ = ("_iterable", "_timeout", "_silent", "_observe", "_poller", "_cache", "_clock")
+
+    def __init__(self, iterable, timeout=5, silent=False, observe=False, poller=None, cache=None, clock=None):
+        if not isinstance(iterable, Sequence):
             msg = "2nd argument should be an instance of collections.Sequence. given {0}".format(type(iterable))
             raise TypeError(msg)
         self._iterable = iterable
         self._timeout = timeout
         self._silent = silent
+        self._observe = observe
+        self._poller = poller or _default_poller
+        self._cache = cache
+        self._clock = clock or _default_clock
 
-    @_chainreact
     def __getattr__(self, name):
         """Wrap return value using '_chanreact'."""
-        return self._iterable, getattr(self._iterable, name)
+        return _delegate(self, "_iterable", name)
 
     def __getitem__(self, key):
         obj = self._iterable[key]
         if _is_wrappable(obj):
-            return SeleniumWrapper(obj, self._timeout, self._silent)
+            return SeleniumWrapper(obj, self._timeout, self._silent, self._observe, self._poller, self._cache,
+                                   self._clock)
         return obj
 
     def __len__(self):
@@ -500,13 +1097,232 @@ class SeleniumContainerWrapper(object):
 
     def sample(self, size):
         picked = random.sample(self._iterable, size)
-        if isinstance(picked, collections.Sequence):
-            return SeleniumContainerWrapper(picked, self._timeout, self._silent)
+        if isinstance(picked, Sequence):
+            return SeleniumContainerWrapper(picked, self._timeout, self._silent, self._observe, self._poller,
+                                            self._cache, self._clock)
         return picked
 
     def choice(self):
         picked = random.choice(self._iterable)
         if _is_wrappable(picked):
-            return SeleniumWrapper(picked, self._timeout, self._silent)
+            return SeleniumWrapper(picked, self._timeout, self._silent, self._observe, self._poller, self._cache,
+                                   self._clock)
         else:
             return picked
+
+    def _elements(self, purpose):
+        elements = [obj.unwrap if isinstance(obj, SeleniumWrapper) else obj for obj in self._iterable]
+        if not all([isinstance(element, WebElement) for element in elements]):
+            raise TypeError("{0} is only supported for containers of WebElement.".format(purpose))
+        return elements
+
+    def _bulk_read(self, kind, names=None):
+        elements = self._elements("Bulk reading")
+        columns = names if names is None or isinstance(names, (list, tuple)) else [names]
+        if elements:
+            values = elements[0].parent.execute_script(scripts.BULK_READ, elements, kind, columns)
+        else:
+            values = []
+        if columns is names:
+            if names is None:
+                return values
+            return dict((name, [row[i] for row in values]) for i, name in enumerate(names))
+        return [row[0] for row in values]
+
+    def texts(self):
+        return self._bulk_read("text")
+
+    def attrs(self, names):
+        return self._bulk_read("attr", names)
+
+    def props(self, names):
+        return self._bulk_read("prop", names)
+
+    def css_values(self, names):
+        return self._bulk_read("css", names)
+
+    def locations(self):
+        return self._bulk_read("location")
+
+    def sizes(self):
+        return self._bulk_read("size")
+
+    def click_all(self, timeout=None, native=None):
+        """Clicks every element once it is displayed, stopped, enabled and not
+        covered. Returns a list of ActionResult in the order of elements.
+
+        Readiness of all pending elements is read with one script per polling.
+        Ready elements are clicked with one script if native is False, natively
+        one by one if True, and by default with the script only for form
+        controls where it is equivalent (checkbox, radio, button, ...).
+        """
+        return self._act("click", None, timeout, native)
+
+    def fill_all(self, values, timeout=None, clear=True, native=None):
+        """Fills every element with values (a list in the order of elements, or
+        one value for all) once it is displayed and editable. Values are set
+        with one script (firing input and change events) for plain inputs
+        and textareas, and with send_keys for other elements or if native is
+        True. Returns a list of ActionResult."""
+        count = len(self._iterable)
+        if isinstance(values, (list, tuple)):
+            if len(values) != count:
+                msg = "values should be as many as elements. given {0} for {1}".format(len(values), count)
+                raise ValueError(msg)
+        else:
+            values = [values] * count
+        return self._act("fill" if clear else "append", list(values), timeout, native)
+
+    def _act(self, kind, values, timeout, native):
+        timeout = timeout or self._timeout
+        elements = self._elements("Container action")
+        results = [ActionResult(self[i]) for i in range(len(elements))]
+        if not elements:
+            return results
+        driver = elements[0].parent
+        clicking = kind == "click"
+        pending = list(range(len(elements)))
+        last = {}
+
+        def readiness():
+            # {index: state}. An element gone stale (a native click may have
+            # navigated) fails the whole script, so on errors each element is
+            # checked alone: stale ones are given up, others tried again.
+            try:
+                return dict(zip(pending, driver.execute_script(scripts.ACTION_READINESS,
+                                                               [elements[i] for i in pending])))
+            except WebDriverException:
+                pass
+            states = {}
+            for i in list(pending):
+                try:
+                    states[i] = driver.execute_script(scripts.ACTION_READINESS, [elements[i]])[0]
+                except StaleElementReferenceException as e:
+                    results[i].polls += 1
+                    results[i].error = e.msg or "stale element"
+                    pending.remove(i)
+                except WebDriverException as e:
+                    results[i].polls += 1
+                    results[i].error = e.msg
+            return states
+
+        def step():
+            states = readiness()
+            scripted, natives = [], []
+            for i in [i for i in pending if i in states]:
+                state = states[i]
+                result = results[i]
+                result.polls += 1
+                position = (state["x"], state["y"])
+                stopped, last[i] = position == last.get(i), position
+                if not state["displayed"]:
+                    result.error = "not displayed"
+                elif state["disabled"] or (state["readonly"] and not clicking):
+                    result.error = "disabled" if state["disabled"] else "read only"
+                elif clicking and state["blocker"]:
+                    result.error = "covered by {0}".format(state["blocker"])
+                elif clicking and not stopped:
+                    result.error = "moving"
+                elif native is None and state["click" if clicking else "fill"] or native is False:
+                    scripted.append(i)
+                else:
+                    natives.append(i)
+            if scripted:
+                try:
+                    errors = driver.execute_script(scripts.BULK_ACTION, [elements[i] for i in scripted], kind,
+                                                   [values[i] for i in scripted] if values else None)
+                except WebDriverException as e:
+                    errors = [e.msg] * len(scripted)
+                for i, error in zip(scripted, errors):
+                    self._acted(results[i], i, pending, "script", error)
+            for i in natives:
+                try:
+                    if clicking:
+                        elements[i].click()
+                    else:
+                        if kind == "fill":
+                            elements[i].clear()
+                        elements[i].send_keys(values[i])
+                    self._acted(results[i], i, pending, "native", None)
+                except WebDriverException as e:
+                    self._acted(results[i], i, pending, "native", e.msg)
+            return not pending
+
+        try:
+            self._poller.poll("container." + ("click_all" if clicking else "fill_all"), timeout, step, 0.01, (),
+                              clock=self._clock)
+        except TimeoutException:
+            pass
+        return results
+
+    def _acted(self, result, index, pending, via, error):
+        result.via = via
+        result.error = error
+        if error is None:
+            result.ok = True
+            pending.remove(index)
+
+
+class SeleniumStreamWrapper(object):
+    """Elements matched by a locator, fetched chunk_size elements at a time
+    with one script while iterating, so that only one chunk is held at once.
+
+    Iterating waits for the first element up to timeout seconds and yields
+    SeleniumWrapper. chunks() yields SeleniumContainerWrapper per chunk. len()
+    counts matched elements without transferring them. With autoscroll, the
+    page is scrolled to the end after the last element, and iteration goes
+    on if more elements appear within settle seconds, up to limit elements.
+    """
+    __slots__ = ("_scope", "_type", "_target", "_chunk_size", "_autoscroll", "_settle", "_limit", "_timeout")
+
+    def __init__(self, scope, type, target, chunk_size=100, autoscroll=False, settle=2, limit=None, timeout=None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be 1 or more. given {0}".format(chunk_size))
+        self._scope = scope
+        self._type = type
+        self._target = target
+        self._chunk_size = chunk_size
+        self._autoscroll = autoscroll
+        self._settle = settle
+        self._limit = limit
+        self._timeout = timeout or scope.timeout
+
+    def _slice(self, offset, size, scroll=False):
+        scope = self._scope
+        element = None if isinstance(scope.unwrap, WebDriver) else scope.unwrap
+        return scope._driver.execute_script(scripts.SLICE, element, self._type, self._target, offset, size, scroll)
+
+    def __len__(self):
+        return self._slice(0, None)
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            for element in chunk:
+                yield element
+
+    def chunks(self):
+        scope = self._scope
+        try:
+            scope.poller.poll("stream", self._timeout, lambda: self._slice(0, None), 0.5, clock=scope.clock)
+        except TimeoutException:
+            scope._missing(self._type, self._target, self._timeout)
+            return
+        offset = 0
+        while self._limit is None or offset < self._limit:
+            size = self._chunk_size if self._limit is None else min(self._chunk_size, self._limit - offset)
+            chunk = self._slice(offset, size)
+            if chunk:
+                offset += len(chunk)
+                yield scope._spawn_all(chunk)
+            elif not (self._autoscroll and self._load_more(offset)):
+                return
+
+    def _load_more(self, offset):
+        self._slice(0, None, True)
+        try:
+            self._scope.poller.poll("stream.autoscroll", self._settle, lambda: self._slice(0, None) > offset, 0.2,
+                                    clock=self._scope.clock)
+            return True
+        except TimeoutException:
+            return False
+
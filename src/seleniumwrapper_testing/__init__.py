@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Test support of seleniumwrapper, kept out of the installed package."""
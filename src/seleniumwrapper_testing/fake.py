@@ -0,0 +1,851 @@
+# -*- coding: utf-8 -*-
+"""In-process fake browser for wrapper tests and benchmarks. It lives
+beside the seleniumwrapper package in the source tree (and the sdist, for
+the tests), but is not installed.
+
+FakeWebDriver answers WebDriver commands from HTML pages whose elements
+follow scripted timelines (appearing late, moving, hidden or covered for
+a while, ...) on a clock, which may be a clock.VirtualClock so that waits
+take no real time. Every command is counted and may be delayed by
+latency seconds::
+
+    >>> page = FakePage("<form><input type='submit' value='Send'></form>")
+    >>> page.on("css", "input", appears=0.5, blocked=1.0)
+    >>> driver = FakeWebDriver({"http://example.com/": page}, clock=VirtualClock())
+    >>> br = SeleniumWrapper(driver)
+    >>> br.get("http://example.com/")
+    >>> br.button("Send").click()
+    >>> driver.commands
+
+FakeServer serves FakeBrowser sessions over the JSON wire protocol, so
+that connect() (and anything else speaking HTTP) can be used against it.
+"""
+
+import json
+import re
+import threading
+import uuid
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.errorhandler import ErrorCode
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver
+from seleniumwrapper import dom, scripts
+from seleniumwrapper.clock import Clock
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urljoin
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urljoin
+
+BLANK = "<html><head><title></title></head><body></body></html>"
+
+_LOCATORS = {By.ID: "id", By.NAME: "name", By.XPATH: "xpath", By.LINK_TEXT: "link_text",
+             By.PARTIAL_LINK_TEXT: "partial_link_text", By.TAG_NAME: "tag", By.CLASS_NAME: "class",
+             By.CSS_SELECTOR: "css"}
+_COMMANDS = ("NEW_SESSION", "QUIT", "CLOSE", "GET", "GET_CURRENT_URL", "GET_TITLE", "GET_PAGE_SOURCE", "GO_BACK",
+             "GO_FORWARD", "REFRESH", "SET_SCRIPT_TIMEOUT", "IMPLICIT_WAIT", "SET_TIMEOUTS", "FIND_ELEMENT",
+             "FIND_ELEMENTS", "FIND_CHILD_ELEMENT", "FIND_CHILD_ELEMENTS", "CLICK_ELEMENT", "CLEAR_ELEMENT",
+             "SEND_KEYS_TO_ELEMENT", "GET_ELEMENT_TEXT", "GET_ELEMENT_TAG_NAME", "GET_ELEMENT_ATTRIBUTE",
+             "IS_ELEMENT_DISPLAYED", "IS_ELEMENT_ENABLED", "IS_ELEMENT_SELECTED", "GET_ELEMENT_LOCATION",
+             "GET_ELEMENT_SIZE", "GET_ELEMENT_VALUE_OF_CSS_PROPERTY", "GET_ALERT_TEXT", "ACCEPT_ALERT",
+             "DISMISS_ALERT", "EXECUTE_SCRIPT", "EXECUTE_ASYNC_SCRIPT")
+_FILLABLE = ("", "text", "email", "number", "password", "search", "tel", "url", "date", "time",
+             "datetime-local", "month", "week", "color", "range")
+_UNFILLABLE = ("button", "submit", "reset", "image", "hidden")
+
+
+class _Error(Exception):
+    def __init__(self, code, message):
+        Exception.__init__(self, message)
+        self.code = code[0]
+        self.message = message
+
+
+class Behaviour(object):
+    """Timeline of one element, in seconds since its page was loaded.
+
+    The element is in the document from appears until removed (stale
+    afterwards) and displayed from shown until hidden. Until moves it
+    moves, and until blocked clicks on it are received by blocker.
+    on_click(browser, element) is called after each click on it.
+    """
+    __slots__ = ("appears", "removed", "shown", "hidden", "moves", "blocked", "blocker", "location", "size",
+                 "on_click")
+
+    def __init__(self, appears=0.0, removed=None, shown=0.0, hidden=None, moves=0.0, blocked=0.0,
+                 blocker='<div class="overlay">', location=None, size=(100, 20), on_click=None):
+        self.appears = appears
+        self.removed = removed
+        self.shown = shown
+        self.hidden = hidden
+        self.moves = moves
+        self.blocked = blocked
+        self.blocker = blocker
+        self.location = location
+        self.size = size
+        self.on_click = on_click
+
+
+_DEFAULT = Behaviour()
+
+
+class FakePage(object):
+    """HTML of a page, timelines of its elements and alerts it opens.
+    load is the number of seconds the load event takes after navigation."""
+
+    def __init__(self, html, title=None, load=0.0):
+        self.html = html
+        self.title = title
+        self.load = load
+        self.behaviours = []
+        self.alerts = []
+
+    def on(self, type, target, **behaviour):
+        """Gives the elements matched by a (type, target) locator a Behaviour."""
+        self.behaviours.append((type, target, behaviour))
+        return self
+
+    def alert(self, text, at=0.0):
+        """Opens an alert at seconds after load."""
+        self.alerts.append((at, text))
+        return self
+
+
+class _Document(object):
+    # a loaded page: the parsed tree and the state of its timeline.
+    def __init__(self, url, page, loaded_at, number):
+        self.url = url
+        self.page = page
+        self.loaded_at = loaded_at
+        self.number = number
+        self.root = dom.parse(page.html)
+        self.behaviours = {}
+        self.events = [0.0, page.load]
+        for type, target, behaviour in page.behaviours:
+            for element in dom.select(self.root, type, target):
+                b = self.behaviours[element] = Behaviour(**behaviour)
+                self.events.extend([t for t in (b.appears, b.removed, b.shown, b.hidden, b.moves, b.blocked)
+                                    if t])
+        self.events.extend([at for at, text in page.alerts])
+        self.events = sorted(set(self.events))
+        self.alerts = sorted(page.alerts)
+        self.mutations = 0
+        self.order = dict([(id(e), i) for i, e in enumerate(self.root.descendants())])
+
+
+class FakeBrowser(object):
+    """Command executor of FakeWebDriver, in place of RemoteConnection.
+
+    pages maps urls to FakePage (or HTML). Unknown urls load a blank page.
+    commands counts executed commands by name, and scripts maps sources of
+    additional scripts to handler(browser, args) returning their result.
+    """
+
+    def __init__(self, pages=None, clock=None, latency=0.0):
+        self.pages = dict(pages or {})
+        self.clock = clock or Clock()
+        self.latency = latency
+        self.commands = {}
+        self.scripts = {}
+        self.session_id = None
+        self.document = None
+        self.history = []
+        self.index = -1
+        self.script_timeout = 0.0
+        self.implicit_wait = 0.0
+        self._alert = None
+        self._ids = {}
+        self._nodes = {}
+        self._loads = 0
+        self._lock = threading.RLock()
+        self._handlers = dict([(getattr(Command, name), getattr(self, "_" + name.lower())) for name in _COMMANDS])
+        # scripts of seleniumwrapper.scripts by name (see scripts.name_of)
+        self._scripts = {"click_readiness": self._click_readiness,
+                         "action_readiness": self._action_readiness,
+                         "bulk_action": self._bulk_action,
+                         "bulk_read": self._bulk_read,
+                         "fill_form": self._fill_form,
+                         "table_rows": self._table_rows,
+                         "find_many": self._find_many,
+                         "slice": self._slice,
+                         "generation": self._generation,
+                         "snapshot": self._snapshot,
+                         "resolve": self._resolve}
+        self._async_scripts = {"observe": self._observe,
+                               "performance": self._performance}
+        self._navigate("about:blank")
+
+    @property
+    def elapsed(self):
+        """Seconds since the current page was loaded."""
+        return self.clock.time() - self.document.loaded_at
+
+    @property
+    def total(self):
+        return sum(self.commands.values())
+
+    def execute(self, command, params):
+        if self.latency:
+            self.clock.sleep(self.latency)
+        with self._lock:
+            self.commands[command] = self.commands.get(command, 0) + 1
+            handler = self._handlers.get(command)
+            try:
+                if handler is None:
+                    raise _Error(ErrorCode.UNKNOWN_COMMAND, "FakeBrowser doesn't support {0}".format(command))
+                value = handler(params or {})
+            except _Error as e:
+                return {"status": e.code, "sessionId": self.session_id, "value": {"message": e.message}}
+            except dom.SelectorError as e:
+                return {"status": ErrorCode.INVALID_SELECTOR[0], "sessionId": self.session_id,
+                        "value": {"message": str(e)}}
+            return {"status": ErrorCode.SUCCESS, "sessionId": self.session_id, "value": value}
+
+    # the document
+
+    def _navigate(self, url, remember=True):
+        page = self.pages.get(url, BLANK)
+        if not isinstance(page, FakePage):
+            page = self.pages[url] = FakePage(page)
+        self._loads += 1
+        self.document = _Document(url, page, self.clock.time(), self._loads)
+        self._ids, self._nodes, self._alert = {}, {}, None
+        if remember:
+            del self.history[self.index + 1:]
+            self.history.append(url)
+            self.index = len(self.history) - 1
+
+    def behaviour(self, element):
+        return self.document.behaviours.get(element, _DEFAULT)
+
+    def attached(self, element):
+        elapsed = self.elapsed
+        for node in [element] + list(element.ancestors()):
+            if node.tag is None:
+                return True
+            b = self.behaviour(node)
+            if elapsed < b.appears or (b.removed is not None and elapsed >= b.removed):
+                return False
+        return False
+
+    def displayed(self, element):
+        elapsed = self.elapsed
+        for node in [element] + list(element.ancestors()):
+            if node.tag is None:
+                return True
+            b = self.behaviour(node)
+            if elapsed < b.shown or (b.hidden is not None and elapsed >= b.hidden):
+                return False
+            style = node.attrs.get("style", "").replace(" ", "")
+            if "hidden" in node.attrs or node.tag in ("head", "script", "style", "title") or \
+                    "display:none" in style or "visibility:hidden" in style or \
+                    (node.tag == "input" and node.attrs.get("type") == "hidden"):
+                return False
+        return False
+
+    def location(self, element):
+        b = self.behaviour(element)
+        x, y = b.location or (8, 8 + 20 * self.document.order.get(id(element), 0))
+        remaining = b.moves - self.elapsed
+        if remaining > 0:
+            x += int(remaining * 100) + 1
+        return {"x": x, "y": y}
+
+    def blocker(self, element):
+        b = self.behaviour(element)
+        return b.blocker if self.elapsed < b.blocked else None
+
+    def mutate(self):
+        """Counts a change of the document made by a handler (on_click, scripts)."""
+        self.document.mutations += 1
+
+    def open_alert(self, text):
+        self._alert = text
+
+    def reference(self, element):
+        id = self._ids.get(element)
+        if id is None:
+            id = self._ids[element] = "{0}-{1}".format(self.document.number, len(self._ids) + 1)
+            self._nodes[id] = element
+        return {"ELEMENT": id}
+
+    def element(self, params_or_reference):
+        id = params_or_reference.get("id") or params_or_reference.get("ELEMENT")
+        element = self._nodes.get(id)
+        if element is None or not self.attached(element):
+            raise _Error(ErrorCode.STALE_ELEMENT_REFERENCE, "stale element reference: element is not attached "
+                                                            "to the page document")
+        return element
+
+    def select(self, scope, type, target):
+        return dom.select(scope or self.document.root, type, target, self.attached)
+
+    def _wait(self, found, timeout):
+        # calls found() again on each change of the timeline until it returns
+        # something or timeout seconds pass on the clock.
+        deadline = self.clock.time() + timeout
+        result = found()
+        while not result:
+            now = self.clock.time()
+            if now >= deadline:
+                break
+            upcoming = [t + self.document.loaded_at for t in self.document.events
+                        if t + self.document.loaded_at > now]
+            self.clock.sleep(min(upcoming + [deadline]) - now)
+            result = found()
+        return result
+
+    def _current_alert(self):
+        if self._alert is not None:
+            return self._alert
+        elapsed = self.elapsed
+        for at, text in self.document.alerts:
+            if at <= elapsed:
+                return text
+        return None
+
+    def _close_alert(self):
+        if self._alert is not None:
+            self._alert = None
+            return
+        if self._current_alert() is None:
+            raise _Error(ErrorCode.NO_ALERT_OPEN, "no alert open")
+        self.document.alerts.pop(0)
+
+    def _click(self, element):
+        if not self.displayed(element):
+            raise _Error(ErrorCode.ELEMENT_NOT_VISIBLE, "element not visible")
+        blocker = self.blocker(element)
+        if blocker:
+            template = "unknown error: Element is not clickable at point ({x}, {y}). Other element would receive " \
+                       "the click: {blocker}"
+            raise _Error(ErrorCode.UNKNOWN_ERROR, template.format(blocker=blocker, **self.location(element)))
+        if "disabled" in element.attrs:
+            return
+        kind = element.attrs.get("type")
+        if element.tag == "input" and kind == "checkbox":
+            if "checked" in element.attrs:
+                del element.attrs["checked"]
+            else:
+                element.attrs["checked"] = "checked"
+        elif element.tag == "input" and kind == "radio":
+            for other in self.select(None, "css", 'input[type="radio"]'):
+                if other.attrs.get("name") == element.attrs.get("name"):
+                    other.attrs.pop("checked", None)
+            element.attrs["checked"] = "checked"
+        elif element.tag == "option":
+            self._choose(element, True)
+        on_click = self.behaviour(element).on_click
+        if on_click is not None:
+            on_click(self, element)
+        elif element.tag == "a" and "href" in element.attrs:
+            self._navigate(urljoin(self.document.url, element.attrs["href"]))
+
+    def _text(self, element):
+        if not self.displayed(element):
+            return ""
+        texts = [node.data for node in element.iter() if isinstance(node, dom.Text) and self._visible_text(node)]
+        return " ".join("".join(texts).split())
+
+    def _visible_text(self, text):
+        parent = text.parent
+        return parent.tag is None or (self.attached(parent) and self.displayed(parent))
+
+    def _value(self, element):
+        if element.tag == "textarea":
+            return element.attrs.get("value", element.text)
+        return element.attrs.get("value", "")
+
+    def _fill(self, element, value):
+        element.attrs["value"] = value
+
+    def _choose(self, option, selected):
+        select = next((e for e in option.ancestors() if e.tag == "select"), None)
+        if selected and select is not None and "multiple" not in select.attrs:
+            for other in select.descendants():
+                other.attrs.pop("selected", None)
+        if selected:
+            option.attrs["selected"] = "selected"
+        else:
+            option.attrs.pop("selected", None)
+
+    # commands
+
+    def _new_session(self, params):
+        self.session_id = self.session_id or uuid.uuid4().hex
+        return {"browserName": "fake", "javascriptEnabled": True, "takesScreenshot": False}
+
+    def _quit(self, params):
+        return None
+
+    def _close(self, params):
+        return None
+
+    def _get(self, params):
+        self._navigate(params["url"])
+
+    def _get_current_url(self, params):
+        return self.document.url
+
+    def _get_title(self, params):
+        if self.document.page.title is not None:
+            return self.document.page.title
+        titles = dom.select(self.document.root, "tag", "title")
+        return titles[0].text if titles else ""
+
+    def _get_page_source(self, params):
+        return dom.serialize(self.document.root, self.attached)
+
+    def _go_back(self, params):
+        if self.index > 0:
+            self.index -= 1
+            self._navigate(self.history[self.index], remember=False)
+
+    def _go_forward(self, params):
+        if self.index < len(self.history) - 1:
+            self.index += 1
+            self._navigate(self.history[self.index], remember=False)
+
+    def _refresh(self, params):
+        self._navigate(self.document.url, remember=False)
+
+    def _set_script_timeout(self, params):
+        self.script_timeout = params["ms"] / 1000.0
+
+    def _implicit_wait(self, params):
+        self.implicit_wait = params["ms"] / 1000.0
+
+    def _set_timeouts(self, params):
+        if params.get("type") == "script":
+            self.script_timeout = params["ms"] / 1000.0
+        elif params.get("type") == "implicit":
+            self.implicit_wait = params["ms"] / 1000.0
+
+    def _find(self, params, scope, eager):
+        type = _LOCATORS.get(params["using"])
+        if type is None:
+            raise _Error(ErrorCode.INVALID_SELECTOR, "unsupported locator: {0}".format(params["using"]))
+        found = self._wait(lambda: self.select(scope, type, params["value"]), self.implicit_wait)
+        if eager:
+            return [self.reference(e) for e in found]
+        if not found:
+            raise _Error(ErrorCode.NO_SUCH_ELEMENT, "no such element: Unable to locate element: "
+                                                    "{0}".format(json.dumps(params)))
+        return self.reference(found[0])
+
+    def _find_element(self, params):
+        return self._find(params, None, False)
+
+    def _find_elements(self, params):
+        return self._find(params, None, True)
+
+    def _find_child_element(self, params):
+        return self._find(params, self.element(params), False)
+
+    def _find_child_elements(self, params):
+        return self._find(params, self.element(params), True)
+
+    def _click_element(self, params):
+        self._click(self.element(params))
+
+    def _clear_element(self, params):
+        self._fill(self.element(params), "")
+
+    def _send_keys_to_element(self, params):
+        element = self.element(params)
+        if not self.displayed(element):
+            raise _Error(ErrorCode.ELEMENT_NOT_VISIBLE, "element not visible")
+        self._fill(element, self._value(element) + "".join(params["value"]))
+
+    def _get_element_text(self, params):
+        return self._text(self.element(params))
+
+    def _get_element_tag_name(self, params):
+        return self.element(params).tag
+
+    def _get_element_attribute(self, params):
+        element = self.element(params)
+        name = params["name"]
+        if name == "value":
+            return self._value(element)
+        if name in ("checked", "selected", "disabled", "readonly", "hidden"):
+            return "true" if name in element.attrs else None
+        return element.attrs.get(name)
+
+    def _is_element_displayed(self, params):
+        return self.displayed(self.element(params))
+
+    def _is_element_enabled(self, params):
+        return "disabled" not in self.element(params).attrs
+
+    def _is_element_selected(self, params):
+        element = self.element(params)
+        return "checked" in element.attrs or "selected" in element.attrs
+
+    def _get_element_location(self, params):
+        return self.location(self.element(params))
+
+    def _get_element_size(self, params):
+        element = self.element(params)
+        width, height = self.behaviour(element).size if self.displayed(element) else (0, 0)
+        return {"width": width, "height": height}
+
+    def _get_element_value_of_css_property(self, params):
+        return self._css(self.element(params), params["propertyName"])
+
+    def _css(self, element, name):
+        displayed = self.displayed(element)
+        width, height = self.behaviour(element).size if displayed else (0, 0)
+        values = {"display": "block" if displayed else "none", "visibility": "visible" if displayed else "hidden",
+                  "width": "{0}px".format(width), "height": "{0}px".format(height)}
+        return values.get(name, "")
+
+    def _get_alert_text(self, params):
+        text = self._current_alert()
+        if text is None:
+            raise _Error(ErrorCode.NO_ALERT_OPEN, "no alert open")
+        return text
+
+    def _accept_alert(self, params):
+        self._close_alert()
+
+    def _dismiss_alert(self, params):
+        self._close_alert()
+
+    def _execute_script(self, params):
+        handler = self._scripts.get(scripts.name_of(params["script"]))
+        if handler is not None:
+            return handler(params.get("args", []))
+        handler = self.scripts.get(params["script"])
+        if handler is None:
+            raise _Error(ErrorCode.JAVASCRIPT_ERROR, "FakeBrowser can't run this script")
+        return handler(self, params.get("args", []))
+
+    def _execute_async_script(self, params):
+        handler = self._async_scripts.get(scripts.name_of(params["script"]))
+        if handler is None:
+            raise _Error(ErrorCode.JAVASCRIPT_ERROR, "FakeBrowser can't run this script")
+        return handler(params.get("args", []))
+
+    # scripts.py
+
+    def _readiness(self, element):
+        displayed = self.displayed(element)
+        return dict(self.location(element), displayed=displayed, blocker=self.blocker(element) if displayed else None)
+
+    def _click_readiness(self, args):
+        element = self.element(args[0])
+        state = self._readiness(element)
+        blocker = state.pop("blocker")
+        state["blockers"] = [blocker] if blocker else []
+        for name in ("visibility", "display", "height", "width"):
+            state[name] = self._css(element, name)
+        return state
+
+    def _action_readiness(self, args):
+        states = []
+        for reference in args[0]:
+            element = self.element(reference)
+            state = self._readiness(element)
+            kind = element.attrs.get("type", "").lower() if element.tag == "input" else None
+            state.update(disabled="disabled" in element.attrs, readonly="readonly" in element.attrs,
+                         click=element.tag in ("button", "label") or
+                         kind in ("checkbox", "radio", "button", "submit", "reset"),
+                         fill=element.tag == "textarea" or (kind is not None and kind in _FILLABLE))
+            states.append(state)
+        return states
+
+    def _bulk_action(self, args):
+        references, kind, values = args
+        errors = []
+        for i, reference in enumerate(references):
+            try:
+                element = self.element(reference)
+                if kind == "click":
+                    self._click(element)
+                else:
+                    value = self._value(element) + values[i] if kind == "append" else values[i]
+                    self._fill(element, value)
+                errors.append(None)
+            except _Error as e:
+                errors.append(e.message)
+        return errors
+
+    def _fill_form(self, args):
+        scope, by, fields = args
+        reports = []
+        for key, value, native in fields:
+            try:
+                found = self.select(self.element(scope) if scope else None, by, key)
+            except dom.SelectorError:
+                found = []
+            if not found:
+                reports.append(None)
+                continue
+            element = found[0]
+            kind = element.attrs.get("type", "").lower() if element.tag == "input" else None
+            if kind in ("checkbox", "radio"):
+                pass
+            elif element.tag == "select":
+                kind = "select"
+            elif element.tag == "textarea" or kind in _FILLABLE:
+                kind = "text"
+            else:
+                kind = "other"
+            if kind == "radio":
+                element = next((e for e in found if e.attrs.get("value") == str(value)), None)
+                if element is None:
+                    reports.append([self.reference(found[0]), kind, "no radio of value {0}".format(value), False])
+                    continue
+            report = [self.reference(element), kind, None, False]
+            if element.tag == "input" and element.attrs.get("type", "").lower() in _UNFILLABLE:
+                report[2] = "not fillable"
+            elif "disabled" in element.attrs:
+                report[2] = "disabled"
+            elif kind == "text" and "readonly" in element.attrs:
+                report[2] = "read only"
+            elif native or kind == "other":
+                report[3] = True
+            elif kind == "checkbox" or kind == "radio":
+                if kind == "radio":
+                    for other in self.select(None, "css", 'input[type="radio"]'):
+                        if other.attrs.get("name") == element.attrs.get("name"):
+                            other.attrs.pop("checked", None)
+                if kind == "radio" or value:
+                    element.attrs["checked"] = "checked"
+                else:
+                    element.attrs.pop("checked", None)
+            elif kind == "select":
+                wanted = [str(v) for v in value] if isinstance(value, list) else [str(value)]
+                options = [e for e in element.descendants() if e.tag == "option"]
+                chosen = [o for o in options if o.attrs.get("value", o.text.strip()) in wanted or
+                          o.text.strip() in wanted][:None if "multiple" in element.attrs else 1]
+                if chosen:
+                    for option in options:
+                        self._choose(option, option in chosen)
+                else:
+                    report[2] = "no option {0}".format(", ".join(wanted))
+            else:
+                self._fill(element, str(value))
+            reports.append(report)
+        return reports
+
+    def _table_rows(self, args):
+        table, start, size, links = args
+        table = self.element(table)
+        rows = [e for e in table.descendants() if e.tag == "tr" and self.attached(e) and
+                next((a for a in e.ancestors() if a.tag == "table"), None) is table]
+        found = []
+        for row in rows[start:start + size]:
+            cells = [e for e in row.elements if e.tag in ("td", "th")]
+            head = row.parent.tag == "thead" or (bool(cells) and all([cell.tag == "th" for cell in cells]))
+            values = []
+            for cell in cells:
+                link = next((e for e in cell.descendants() if e.tag == "a" and "href" in e.attrs), None)
+                href = urljoin(self.document.url, link.attrs["href"]) if links and link is not None else None
+                spans = [int(cell.attrs.get(name) or 1) for name in ("colspan", "rowspan")]
+                values.append([self._text(cell)] + spans + [href])
+            found.append([head, values])
+        return found
+
+    def _bulk_read(self, args):
+        references, what, names = args
+        values = []
+        for reference in references:
+            element = self.element(reference)
+            if what == "text":
+                read = lambda name: self._text(element)
+            elif what == "attr":
+                read = lambda name: element.attrs.get(name)
+            elif what == "prop":
+                read = lambda name: self._value(element) if name == "value" else element.attrs.get(name)
+            elif what == "css":
+                read = lambda name: self._css(element, name)
+            elif what == "location":
+                read = lambda name: self.location(element)
+            else:
+                read = lambda name: dict(zip(("width", "height"), self.behaviour(element).size))
+            values.append(read(None) if names is None else [read(name) for name in names])
+        return values
+
+    def _locate(self, scope, type, target, eager):
+        found = self.select(self.element(scope) if scope else None, type, target)
+        if eager:
+            return [self.reference(e) for e in found] or None
+        return self.reference(found[0]) if found else None
+
+    def _find_many(self, args):
+        results = []
+        for type, target, eager in args[1]:
+            try:
+                results.append(self._locate(args[0], type, target, eager))
+            except dom.SelectorError:
+                results.append(None)
+        return results
+
+    def _slice(self, args):
+        scope, type, target, start, size = args[:5]
+        found = self._locate(scope, type, target, True) or []
+        if size is None:
+            return len(found)
+        return found[start:start + size]
+
+    def _generation(self, args):
+        elapsed = self.elapsed
+        passed = len([t for t in self.document.events if 0 < t <= elapsed])
+        return [self.document.url, str(self.document.number), passed + self.document.mutations]
+
+    def _snapshot(self, args):
+        return dom.serialize(self.element(args[0]) if args[0] else self.document.root, self.attached)
+
+    def _resolve(self, args):
+        root = self.element(args[0]) if args[0] else self.document.root
+        found = []
+        for path, tag in zip(args[1], args[2]):
+            node = root
+            for index in path:
+                children = [e for e in node.elements if self.attached(e)]
+                node = children[index] if index < len(children) else None
+                if node is None:
+                    break
+            found.append(self.reference(node) if node is not None and node.tag == tag else None)
+        return found
+
+    def _observe(self, args):
+        scope, type, target, eager, timeout = args[:5]
+        if timeout > self.script_timeout:
+            timeout = self.script_timeout
+        return self._wait(lambda: self._locate(scope, type, target, eager), timeout)
+
+    def _performance(self, args):
+        wait = args[0]
+        document = self.document
+        if wait and self.elapsed < document.page.load:
+            self._wait(lambda: self.elapsed >= document.page.load, self.script_timeout)
+            if self.elapsed < document.page.load:
+                raise _Error(ErrorCode.SCRIPT_TIMEOUT, "script timeout")
+        start = int(document.loaded_at * 1000)
+        end = start + int(document.page.load * 1000) if self.elapsed >= document.page.load else 0
+        timing = {"navigationStart": start, "fetchStart": start, "responseStart": start,
+                  "responseEnd": start, "domLoading": start, "domInteractive": start,
+                  "domContentLoadedEventStart": start, "domContentLoadedEventEnd": start,
+                  "domComplete": end, "loadEventStart": end, "loadEventEnd": end}
+        return {"timing": timing, "navigation": {"type": 0, "redirectCount": 0}}
+
+
+class FakeWebDriver(WebDriver):
+    """WebDriver whose commands are executed by a FakeBrowser in process.
+    See FakeBrowser for pages, clock and latency."""
+
+    def __init__(self, pages=None, clock=None, latency=0.0, browser=None):
+        WebDriver.__init__(self, browser or FakeBrowser(pages, clock, latency), {"browserName": "fake"})
+
+    @property
+    def browser(self):
+        return self.command_executor
+
+    @property
+    def clock(self):
+        return self.command_executor.clock
+
+    @property
+    def commands(self):
+        return self.command_executor.commands
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        response = self.server.fake.dispatch(self.command, self.path, body)
+        data = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_DELETE = _respond
+
+
+class FakeServer(object):
+    """Serves FakeBrowser sessions over the JSON wire protocol on localhost.
+    Each new session gets browser_factory(). Use url as the executor."""
+
+    def __init__(self, browser_factory=FakeBrowser, host="127.0.0.1", port=0, path="/wd/hub"):
+        self.browser_factory = browser_factory
+        self.path = path
+        self.sessions = {}
+        self._lock = threading.Lock()
+        self._routes = []
+        commands = RemoteConnection("http://{0}:1".format(host), resolve_ip=False)._commands
+        for command, (method, template) in commands.items():
+            pattern = re.sub(r"\\\$(\w+)", r"(?P<\1>[^/]+)", re.escape(template))
+            self._routes.append((method, re.compile("^" + pattern + "$"), command))
+        self._server = _Server((host, port), _Handler)
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return "http://{0}:{1}{2}".format(host, port, self.path)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def dispatch(self, method, path, body):
+        path = path.split("?")[0]
+        if path.startswith(self.path):
+            path = path[len(self.path):]
+        for route_method, pattern, command in self._routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            return {"status": ErrorCode.UNKNOWN_COMMAND[0], "value": {"message": "unknown command: " + path}}
+        params = json.loads(body.decode("utf-8")) if body else {}
+        params.update(match.groupdict())
+        if command == Command.NEW_SESSION:
+            browser = self.browser_factory()
+            browser.session_id = uuid.uuid4().hex
+            with self._lock:
+                self.sessions[browser.session_id] = browser
+        else:
+            with self._lock:
+                browser = self.sessions.get(params.get("sessionId"))
+            if browser is None:
+                return {"status": ErrorCode.UNKNOWN_ERROR[0], "value": {"message": "no such session"}}
+        response = browser.execute(command, params)
+        if command == Command.QUIT:
+            with self._lock:
+                self.sessions.pop(browser.session_id, None)
+        return response
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""WebDriver answering commands in-process without any page, for tests
+which only count finds and commands. FakeWebDriver (fake.py) is for tests
+which need pages."""
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+
+class StubDriver(WebDriver):
+    """Finds a new element for every locator unless its value contains
+    'missing' or is in gone, and answers other commands with None.
+
+    finds counts found elements (element-1, element-2, ...). Elements whose
+    id is in stale raise StaleElementReferenceException on use, token is
+    returned by every script (as scripts.GENERATION for ElementCache) and
+    clicked lists clicked element ids. Every driver made is kept in created.
+    """
+    created = []
+
+    def __init__(self, label="stub"):
+        self.session_id = "stub"
+        self.w3c = False
+        self.label = label
+        self.finds = 0
+        self.token = ["http://www.example.com/", "page", 0]
+        self.stale = set()
+        self.gone = set()
+        self.clicked = []
+        self.quitted = False
+        StubDriver.created.append(self)
+
+    def execute(self, driver_command, params=None):
+        if driver_command in (Command.FIND_ELEMENT, Command.FIND_CHILD_ELEMENT,
+                              Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENTS):
+            if "missing" in params["value"] or params["value"] in self.gone:
+                raise NoSuchElementException()
+            self.finds += 1
+            element = WebElement(self, "element-{0}".format(self.finds))
+            eager = driver_command in (Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENTS)
+            return {"value": [element] if eager else element}
+        if driver_command == Command.EXECUTE_SCRIPT:
+            return {"value": list(self.token)}
+        if params and params.get("id") in self.stale:
+            raise StaleElementReferenceException()
+        if driver_command == Command.GET_TITLE:
+            return {"value": "stub"}
+        if driver_command == Command.GET_CURRENT_URL:
+            return {"value": self.token[0]}
+        if driver_command == Command.GET_ELEMENT_LOCATION:
+            return {"value": {"x": 0, "y": 0}}
+        if driver_command == Command.IS_ELEMENT_DISPLAYED:
+            return {"value": True}
+        if driver_command == Command.CLICK_ELEMENT:
+            self.clicked.append(params["id"])
+        if driver_command == Command.QUIT:
+            self.quitted = True
+        return {"value": None}
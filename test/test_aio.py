@@ -0,0 +1,138 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+import mock
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, WebDriverException
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.polling import Fixed
+from seleniumwrapper.wrapper import SeleniumWrapper
+# seleniumwrapper.aio needs Python 3.7+, older interpreters skip these tests.
+if sys.version_info >= (3, 7):
+    import asyncio
+    from seleniumwrapper.aio import AsyncSeleniumWrapper, AsyncSeleniumContainerWrapper
+else:
+    asyncio = None
+
+
+@unittest.skipIf(asyncio is None, "seleniumwrapper.aio requires Python 3.7+")
+class TestAsyncSeleniumWrapper(unittest.TestCase):
+    def setUp(self):
+        self.mock = mock.Mock(WebDriver)
+
+    def test_finders_are_awaitable_and_return_async_wrappers(self):
+        mock_elem = mock.Mock(WebElement)
+        self.mock.find_element_by_css_selector.side_effect = [NoSuchElementException(), mock_elem]
+        wrapper = AsyncSeleniumWrapper(SeleniumWrapper(self.mock, poller=Fixed(0.001)))
+        found = asyncio.run(wrapper.by_tag("input", type="submit"))
+        self.assertIsInstance(found, AsyncSeleniumWrapper)
+        self.assertTrue(found.unwrap is mock_elem)
+        self.assertEqual(self.mock.find_element_by_css_selector.call_args, mock.call('input[type="submit"]'))
+
+    def test_eager_finders_return_async_container(self):
+        self.mock.find_elements_by_css_selector.return_value = [mock.Mock(WebElement), mock.Mock(WebElement)]
+        found = asyncio.run(AsyncSeleniumWrapper(self.mock).css("a", eager=True))
+        self.assertIsInstance(found, AsyncSeleniumContainerWrapper)
+        self.assertEqual(len(found), 2)
+        self.assertIsInstance(found[0], AsyncSeleniumWrapper)
+
+    def test_waitfor_raise_or_return_None_in_silent_mode(self):
+        self.mock.find_element_by_id.side_effect = NoSuchElementException()
+        wrapper = AsyncSeleniumWrapper(self.mock, timeout=0.05)
+        self.assertRaises(NoSuchElementException, asyncio.run, wrapper.by_id("hoge"))
+        wrapper.silent = True
+        self.assertIsNone(asyncio.run(wrapper.by_id("hoge")))
+
+    def test_delegated_methods_are_coroutine_functions(self):
+        mock_elem = mock.Mock(WebElement)
+
+        class Hoge(WebDriver):
+            def __init__(self):
+                pass
+
+            def find(self, value):
+                return mock_elem
+
+            @property
+            def title(self):
+                return "hoge"
+
+        wrapper = AsyncSeleniumWrapper(Hoge())
+        self.assertIsInstance(asyncio.run(wrapper.find("x")), AsyncSeleniumWrapper)
+
+        async def title():
+            return await wrapper.title
+        self.assertEqual(asyncio.run(title()), "hoge")
+
+    def test_click_checks_readiness_with_script(self):
+        mock_elem = mock.Mock(WebElement)
+        mock_elem.parent.execute_script.return_value = {
+            "x": 0, "y": 0, "displayed": True, "blockers": ['<div class="overlay">'],
+            "visibility": "visible", "display": "block", "height": "10px", "width": "10px"}
+        wrapper = AsyncSeleniumWrapper(mock_elem)
+        self.assertRaises(WebDriverException, asyncio.run, wrapper.click(timeout=0.05))
+        mock_elem.parent.execute_script.return_value["blockers"] = []
+        asyncio.run(wrapper.click(timeout=1))
+        mock_elem.click.assert_called_once_with()
+
+    def test_waitfor_observes_and_uses_element_cache(self):
+        mock_elem = mock.Mock(WebElement)
+        self.mock.execute_async_script.return_value = mock_elem
+        wrapper = AsyncSeleniumWrapper(SeleniumWrapper(self.mock, observe=True, cache=True))
+        asyncio.run(wrapper.by_id("hoge"))
+        found = asyncio.run(wrapper.by_id("hoge"))
+        self.assertTrue(found.unwrap is mock_elem)
+        self.assertEqual(self.mock.execute_async_script.call_count, 1)
+        self.assertFalse(self.mock.find_element_by_id.called)
+        self.assertEqual(wrapper.wrapper.cache.stats["hits"], 1)
+
+    def test_stale_cached_element_is_found_again(self):
+        class Element(WebElement):
+            def __init__(self, value):
+                self.value = value
+
+            def get_attribute(self, name):
+                if self.value is None:
+                    raise StaleElementReferenceException()
+                return self.value
+
+        self.mock.find_element_by_id.side_effect = [Element(None), Element("hoge")]
+        wrapper = AsyncSeleniumWrapper(SeleniumWrapper(self.mock, cache=True))
+        found = asyncio.run(wrapper.by_id("hoge"))
+        self.assertEqual(asyncio.run(found.get_attribute("name")), "hoge")
+        self.assertEqual(wrapper.wrapper.cache.stats["refinds"], 1)
+
+    def test_navigating_clears_element_cache(self):
+        self.mock.find_element_by_id.side_effect = [mock.Mock(WebElement), mock.Mock(WebElement)]
+        wrapper = AsyncSeleniumWrapper(SeleniumWrapper(self.mock, cache=True))
+        first = asyncio.run(wrapper.by_id("hoge"))
+        asyncio.run(wrapper.get("http://example.com/next"))
+        second = asyncio.run(wrapper.by_id("hoge"))
+        self.mock.get.assert_called_once_with("http://example.com/next")
+        self.assertFalse(first.unwrap is second.unwrap)
+        self.assertEqual(self.mock.find_element_by_id.call_count, 2)
+        self.assertEqual(wrapper.wrapper.cache.stats["hits"], 0)
+
+    def test_waits_run_on_virtual_clock(self):
+        self.mock.find_element_by_id.side_effect = NoSuchElementException()
+        clock = VirtualClock()
+        wrapper = AsyncSeleniumWrapper(self.mock, timeout=120, silent=True, clock=clock)
+        self.assertIsNone(asyncio.run(wrapper.by_id("hoge")))
+        self.assertEqual(clock.time(), 120)
+        self.assertEqual(self.mock.find_element_by_id.call_count, 120 / 0.5 + 1)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestAsyncSeleniumWrapper))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
@@ -0,0 +1,127 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from seleniumwrapper import instrument
+from seleniumwrapper.cache import ElementCache
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.wrapper import SeleniumWrapper, SeleniumContainerWrapper
+from seleniumwrapper_testing.stub import StubDriver
+
+
+class TestElementCache(unittest.TestCase):
+    def setUp(self):
+        self.driver = StubDriver()
+        self.cache = ElementCache(size=2, recheck=0)
+        self.wrapper = SeleniumWrapper(self.driver, timeout=0.1, cache=self.cache)
+
+    def test_cache_is_created_if_true_is_given_and_propagated(self):
+        wrapper = SeleniumWrapper(self.driver, cache=True)
+        self.assertTrue(isinstance(wrapper.cache, ElementCache))
+        self.assertTrue(wrapper.by_id("hoge").cache is wrapper.cache)
+        self.assertTrue(SeleniumWrapper(self.driver).cache is None)
+
+    def test_same_locator_is_found_once(self):
+        first = self.wrapper.by_id("hoge")
+        second = self.wrapper.by_id("hoge")
+        self.assertEqual(self.driver.finds, 1)
+        self.assertEqual(first.unwrap, second.unwrap)
+        self.assertEqual((self.cache.stats["hits"], self.cache.stats["misses"]), (1, 1))
+
+    def test_locators_are_keyed_by_scope_and_eager(self):
+        element = self.wrapper.by_id("hoge")
+        element.by_id("hoge")
+        links = self.wrapper.by_id("hoge", eager=True)
+        self.assertTrue(isinstance(links, SeleniumContainerWrapper))
+        self.assertEqual(self.driver.finds, 3)
+
+    def test_dom_generation_change_invalidates_entries(self):
+        self.wrapper.by_id("hoge")
+        self.driver.token[2] += 1
+        self.wrapper.by_id("hoge")
+        self.assertEqual(self.driver.finds, 2)
+        self.assertEqual(self.cache.stats["invalidations"], 1)
+
+    def test_generation_is_rechecked_only_after_recheck_seconds(self):
+        self.cache.recheck = 60
+        self.wrapper.by_id("hoge")
+        self.driver.token[2] += 1
+        self.wrapper.by_id("hoge")
+        self.assertEqual(self.driver.finds, 1)
+
+    def test_generation_is_rechecked_on_clock_of_wrapper(self):
+        clock = VirtualClock()
+        wrapper = SeleniumWrapper(self.driver, cache=True, clock=clock)
+        wrapper.cache.recheck = 60
+        wrapper.by_id("hoge")
+        self.driver.token[2] += 1
+        wrapper.by_id("hoge")
+        clock.advance(60)
+        wrapper.by_id("hoge")
+        self.assertEqual(self.driver.finds, 2)
+
+    def test_navigation_clears_entries(self):
+        self.cache.recheck = 60
+        self.wrapper.by_id("hoge")
+        self.wrapper.get("http://www.example.com/next")
+        self.wrapper.by_id("hoge")
+        self.assertEqual(self.driver.finds, 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.wrapper.by_id("a")
+        self.wrapper.by_id("b")
+        self.wrapper.by_id("a")
+        self.wrapper.by_id("c")
+        self.wrapper.by_id("a")
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.stats["evictions"], 1)
+        self.wrapper.by_id("b")
+        self.assertEqual(self.driver.finds, 4)
+
+    def test_missing_elements_are_not_cached(self):
+        self.wrapper.silent = True
+        self.assertEqual(self.wrapper.by_id("missing"), None)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_stale_element_is_found_again_on_use(self):
+        element = self.wrapper.by_id("hoge")
+        self.driver.stale.add("element-1")
+        element.click()
+        self.assertEqual(self.driver.clicked, ["element-2"])
+        self.assertEqual(self.cache.stats["refinds"], 1)
+        self.assertEqual(self.wrapper.by_id("hoge").unwrap.id, "element-2")
+        self.assertEqual(self.driver.finds, 2)
+
+    def test_stale_exception_is_raised_if_element_is_gone(self):
+        element = self.wrapper.by_id("hoge")
+        self.driver.stale.add("element-1")
+        self.driver.gone.add("hoge")
+        try:
+            element.click()
+            self.fail("StaleElementReferenceException wasn't raised.")
+        except StaleElementReferenceException as e:
+            self.assertIsInstance(e.__cause__, TimeoutException)
+        self.assertEqual(self.driver.clicked, [])
+        self.assertEqual(self.cache.stats["refinds"], 0)
+
+    def test_stale_element_is_found_again_on_delegated_call_while_instrumented(self):
+        element = self.wrapper.by_id("hoge")
+        self.driver.stale.add("element-1")
+        with instrument.enabled(instrument.Collector()):
+            self.assertEqual(element.get_attribute("name"), None)
+        self.assertEqual(self.cache.stats["refinds"], 1)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestElementCache))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
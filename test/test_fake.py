@@ -0,0 +1,354 @@
+import sys
+import time
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException,
+                                        ElementNotVisibleException, NoAlertPresentException,
+                                        InvalidSelectorException, WebDriverException)
+from seleniumwrapper import dom, scripts
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.locator import tag
+from seleniumwrapper.polling import Fixed
+from seleniumwrapper.wrapper import SeleniumWrapper, SeleniumContainerWrapper, connect
+from seleniumwrapper_testing.fake import FakeBrowser, FakePage, FakeServer, FakeWebDriver
+
+URL = "http://www.example.com/"
+HTML = """<html><head><title>Example</title></head><body>
+<div id="main" class="content wide">
+  <p>Hello <b>O'Neil</b></p>
+  <a href="/next" class="nav">Next  page</a>
+  <img src="/logo.png" alt="logo">
+  <form>
+    <input type="text" name="q" value="">
+    <input type="checkbox" name="agree">
+    <input type="submit" value="Search">
+    <button>Search</button>
+  </form>
+  <table><tr><td>1</td><td>2</td></tr><tr><td>3</td></tr></table>
+  <p style="display: none">secret</p>
+</div>
+</body></html>"""
+
+
+class TestDom(unittest.TestCase):
+    def setUp(self):
+        self.document = dom.parse(HTML)
+
+    def tags(self, type, target):
+        return [e.tag for e in dom.select(self.document, type, target)]
+
+    def test_simple_locators(self):
+        self.assertEqual(self.tags("id", "main"), ["div"])
+        self.assertEqual(self.tags("name", "agree"), ["input"])
+        self.assertEqual(self.tags("class", "wide"), ["div"])
+        self.assertEqual(self.tags("tag", "td"), ["td", "td", "td"])
+        self.assertEqual(self.tags("link_text", "Next page"), ["a"])
+        self.assertEqual(self.tags("partial_link_text", "Next"), ["a"])
+
+    def test_css(self):
+        self.assertEqual(self.tags("css", "div.content > p b"), ["b"])
+        self.assertEqual(self.tags("css", "a[href^='/n'], img[src$=\".png\"]"), ["a", "img"])
+        self.assertEqual(self.tags("css", "#main [type=checkbox]"), ["input"])
+        self.assertRaises(dom.SelectorError, self.tags, "css", "p:first-child")
+
+    def test_xpath(self):
+        self.assertEqual(self.tags("xpath", "//td[2]"), ["td"])
+        self.assertEqual([e.text for e in dom.select(self.document, "xpath", "//tr[last()]/td")], ["3"])
+        self.assertEqual(self.tags("xpath", "(//td)[last()]/../.."), ["table"])
+        self.assertEqual(self.tags("xpath", "//b/ancestor::div[@id='main']"), ["div"])
+        self.assertEqual(self.tags("xpath", "//td[not(following-sibling::td)]"), ["td", "td"])
+        self.assertEqual(self.tags("xpath", "//p[normalize-space()=\"Hello O'Neil\"]"), ["p"])
+        self.assertRaises(dom.SelectorError, self.tags, "xpath", "//p[")
+        self.assertRaises(dom.SelectorError, self.tags, "xpath", "//p[.='O\\'Neil']")
+
+    def test_compiled_locators_select_the_same_elements(self):
+        for locator in (tag("input").attr("type", ("submit", "button")).attr("value", "Search"),
+                        tag("a").has_class("nav").contains("href", "next"),
+                        tag("img").endswith("src", ".png"),
+                        tag("input").attr("name", "q") | tag("b").text("O'Neil")):
+            type, target = locator.compile()
+            self.assertEqual(dom.select(self.document, type, target),
+                             dom.select(self.document, "xpath", locator._xpath()))
+
+    def test_serialize(self):
+        p = dom.select(self.document, "css", "p")[0]
+        self.assertEqual(dom.serialize(p), "<p>Hello <b>O'Neil</b></p>")
+        self.assertEqual(dom.serialize(dom.parse(dom.serialize(self.document))), dom.serialize(self.document))
+
+
+class TestFakeWebDriver(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.page = FakePage(HTML)
+        self.driver = FakeWebDriver({URL: self.page, URL + "next": "<title>Next</title>"}, clock=self.clock)
+
+    def test_commands_of_a_page(self):
+        self.driver.get(URL)
+        self.assertEqual(self.driver.title, "Example")
+        self.assertEqual(self.driver.current_url, URL)
+        self.assertEqual(self.driver.find_element_by_css_selector("p").text, "Hello O'Neil")
+        self.assertEqual(len(self.driver.find_elements_by_tag_name("td")), 3)
+        self.assertFalse(self.driver.find_element_by_xpath("//p[2]").is_displayed())
+        self.assertRaises(NoSuchElementException, self.driver.find_element_by_id, "missing")
+        self.assertRaises(InvalidSelectorException, self.driver.find_element_by_css_selector, "p:hover")
+        self.assertEqual(self.driver.commands["findElement"], 4)
+
+    def test_element_state_and_navigation(self):
+        self.driver.get(URL)
+        q = self.driver.find_element_by_name("q")
+        q.send_keys("fake")
+        self.assertEqual(q.get_attribute("value"), "fake")
+        q.clear()
+        self.assertEqual(q.get_attribute("value"), "")
+        agree = self.driver.find_element_by_name("agree")
+        agree.click()
+        self.assertTrue(agree.is_selected())
+        self.driver.find_element_by_link_text("Next page").click()
+        self.assertEqual(self.driver.title, "Next")
+        self.assertRaises(StaleElementReferenceException, agree.click)
+        self.driver.back()
+        self.assertEqual(self.driver.current_url, URL)
+
+    def test_timeline(self):
+        self.page.on("name", "q", appears=1, removed=5).on("css", "button", shown=2, blocked=3, moves=1)
+        self.driver.get(URL)
+        self.assertRaises(NoSuchElementException, self.driver.find_element_by_name, "q")
+        self.clock.advance(1)
+        q = self.driver.find_element_by_name("q")
+        button = self.driver.find_element_by_tag_name("button")
+        self.assertRaises(ElementNotVisibleException, button.click)
+        self.clock.advance(1)
+        self.assertRaises(WebDriverException, button.click)
+        self.assertEqual(button.location, button.location)
+        self.clock.advance(1)
+        button.click()
+        self.clock.advance(2)
+        self.assertRaises(StaleElementReferenceException, q.send_keys, "late")
+
+    def test_moving_element(self):
+        self.page.on("css", "button", moves=0.5)
+        self.driver.get(URL)
+        button = self.driver.find_element_by_tag_name("button")
+        first = button.location
+        self.clock.advance(0.1)
+        self.assertNotEqual(button.location, first)
+        self.clock.advance(0.5)
+        self.assertEqual(button.location, button.location)
+
+    def test_alerts(self):
+        self.page.alert("Are you sure?", at=2)
+        self.driver.get(URL)
+        self.assertRaises(NoAlertPresentException, lambda: self.driver.switch_to_alert().text)
+        self.clock.advance(2)
+        self.assertEqual(self.driver.switch_to_alert().text, "Are you sure?")
+        self.driver.switch_to_alert().accept()
+        self.assertRaises(NoAlertPresentException, lambda: self.driver.switch_to_alert().text)
+
+    def test_implicit_wait_and_latency_advance_the_clock(self):
+        self.page.on("name", "q", appears=1.5)
+        driver = FakeWebDriver({URL: self.page}, clock=self.clock, latency=0.1)
+        driver.get(URL)
+        started = self.clock.time()
+        driver.implicitly_wait(5)
+        self.assertEqual(driver.find_element_by_name("q").tag_name, "input")
+        # the element appears 1.5 seconds after load, then tag_name takes latency.
+        self.assertAlmostEqual(self.clock.time() - started, 1.5 + 0.1, 6)
+        self.assertEqual(driver.browser.total, 5)
+
+    def test_unknown_scripts_are_not_supported_unless_registered(self):
+        self.driver.get(URL)
+        self.assertRaises(WebDriverException, self.driver.execute_script, "return 1;")
+        self.driver.browser.scripts["return 1;"] = lambda browser, args: 1
+        self.assertEqual(self.driver.execute_script("return 1;"), 1)
+
+    def test_scripts_of_seleniumwrapper_are_told_apart_by_name(self):
+        self.driver.get(URL)
+        script = scripts.SNAPSHOT.replace("documentElement", "body")
+        self.assertEqual(scripts.name_of(script), "snapshot")
+        self.assertIsNone(scripts.name_of("return 1;"))
+        self.assertTrue(self.driver.execute_script(script, None).startswith("<html"))
+
+
+class TestSeleniumWrapperOnFakeWebDriver(unittest.TestCase):
+    # waits of both the wrapper and the browser take clock time.
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.page = FakePage(HTML)
+        self.driver = FakeWebDriver({URL: self.page}, clock=self.clock)
+        self.wrapper = SeleniumWrapper(self.driver, timeout=1, poller=Fixed(0.001), clock=self.clock)
+
+    def test_finders(self):
+        self.wrapper.get(URL)
+        self.assertEqual(self.wrapper.button("Search", eager=True).texts(), ["", "Search"])
+        self.assertEqual(self.wrapper.by_text("O'Neil", "b").text, "O'Neil")
+        self.assertIsInstance(self.wrapper.href("next", eager=True), SeleniumContainerWrapper)
+        self.assertEqual(self.wrapper.img(alt="logo").attr("src"), "/logo.png")
+        self.wrapper.silent = True
+        found = self.wrapper.find_many({"q": ("name", "q"), "missing": ("id", "none")}, timeout=0.01)
+        self.assertEqual(found["q"].attr("name"), "q")
+        self.assertIsNone(found["missing"])
+
+    def test_observed_waitfor_follows_the_timeline(self):
+        self.page.on("css", "b", appears=0.7)
+        wrapper = SeleniumWrapper(self.driver, timeout=1, observe=True, clock=self.clock)
+        wrapper.get(URL)
+        started = self.clock.time()
+        self.assertEqual(wrapper.css("b").text, "O'Neil")
+        self.assertAlmostEqual(self.clock.time() - started, 0.7, 6)
+        self.assertEqual(self.driver.commands["executeAsyncScript"], 1)
+
+    def test_scripted_click_waits_for_blocked_element(self):
+        self.page.on("css", "button", blocked=0.05)
+        self.wrapper.get(URL)
+        self.wrapper.css("button").click(scripted=True)
+        self.assertEqual(self.driver.commands["clickElement"], 1)
+        self.assertEqual(self.driver.commands["executeScript"], 51)
+        self.assertAlmostEqual(self.clock.time(), 0.05, 6)
+
+    def test_timeouts_take_no_real_time(self):
+        self.page.on("css", "button", appears=3600, blocked=7200)
+        wrapper = SeleniumWrapper(self.driver, silent=True, clock=self.clock)
+        wrapper.get(URL)
+        started = time.time()
+        self.assertIsNone(wrapper.css("button", timeout=600))
+        self.assertEqual(self.clock.time(), 600)
+        self.clock.advance(3000)
+        self.assertRaises(WebDriverException, wrapper.css("button").click, timeout=60)
+        self.assertAlmostEqual(self.clock.time(), 3600 + 0.01 + 60, 6)
+        self.assertTrue(time.time() - started < 5)
+
+    def test_click_reports_blocker(self):
+        self.page.on("css", "button", blocked=600, blocker='<div id="cover">')
+        self.wrapper.get(URL)
+        try:
+            self.wrapper.css("button").click(timeout=5, scripted=True)
+            self.fail()
+        except WebDriverException as e:
+            self.assertTrue('<div id="cover">' in e.msg)
+
+    def test_performance(self):
+        self.page.load = 2.5
+        self.wrapper.get(URL)
+        timing = self.wrapper.get_performance(timeout=5).timing
+        self.assertEqual(timing.loadEventEnd - timing.navigationStart, 2500)
+        self.assertAlmostEqual(self.clock.time(), 2.5, 6)
+
+
+FORM = """<html><body><form id="signup">
+  <input type="text" name="user" value="old">
+  <textarea name="bio"></textarea>
+  <input type="password" name="secret" readonly>
+  <input type="checkbox" name="agree">
+  <input type="checkbox" name="spam" checked>
+  <input type="radio" name="plan" value="free" checked>
+  <input type="radio" name="plan" value="pro">
+  <select name="country"><option value="jp">Japan</option><option value="us">United States</option></select>
+  <select name="tags" multiple><option>a</option><option>b</option><option>c</option></select>
+  <input type="file" name="avatar">
+  <input type="text" name="code" disabled>
+  <input type="hidden" name="token" value="t">
+  <input type="submit" name="send" value="Send">
+</form></body></html>"""
+
+
+class TestFillFormOnFakeWebDriver(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.page = FakePage(FORM)
+        self.driver = FakeWebDriver({URL: self.page}, clock=self.clock)
+        self.wrapper = SeleniumWrapper(self.driver, timeout=1, clock=self.clock)
+
+    def values(self):
+        form = self.wrapper.snapshot()
+        selected = [option.text for option in form.by_tag("option", eager=True) if option.attr("selected")]
+        return {"user": form.by_name("user").attr("value"), "bio": form.by_name("bio").attr("value"),
+                "checked": form.css("input[checked]", eager=True).attrs("name"),
+                "plan": form.css("input[name=plan][checked]").attr("value"), "selected": selected}
+
+    def test_fill_form_sets_every_kind_of_field_with_one_script(self):
+        self.wrapper.get(URL)
+        results = self.wrapper.fill_form({"user": "john", "bio": "Hi", "agree": True, "spam": False,
+                                          "plan": "pro", "country": "United States", "tags": ["a", "c"]})
+        self.assertEqual(self.driver.commands["executeScript"], 1)
+        self.assertTrue(all([result.ok and result.via == "script" for result in results.values()]))
+        self.assertEqual(results["user"].element.attr("name"), "user")
+        self.assertEqual(self.values(), {"user": "john", "bio": "Hi", "checked": ["agree", "plan"], "plan": "pro",
+                                         "selected": ["United States", "a", "c"]})
+
+    def test_fill_form_types_native_fields_and_reports_errors(self):
+        self.wrapper.get(URL)
+        form = self.wrapper.by_id("signup")
+        results = form.fill_form({"user": "john", "agree": True, "avatar": "/tmp/me.png", "secret": "x",
+                                  "plan": "gold", "country": "fr"}, native=["user", "agree"])
+        self.assertEqual([results[key].via for key in ("user", "agree", "avatar")], ["native"] * 3)
+        self.assertEqual(self.driver.commands["sendKeysToElement"], 2)
+        self.assertEqual(self.driver.commands["clickElement"], 1)
+        self.assertEqual(results["secret"].error, "read only")
+        self.assertEqual(results["plan"].error, "no radio of value gold")
+        self.assertEqual(results["country"].error, "no option fr")
+        self.assertFalse(any([results[key].ok for key in ("secret", "plan", "country")]))
+        self.assertEqual(self.values()["user"], "john")
+        self.assertEqual(self.values()["checked"], ["agree", "spam", "plan"])
+
+    def test_fill_form_skips_buttons_and_waits_for_disabled_fields(self):
+        self.wrapper.get(URL)
+        results = self.wrapper.fill_form({"user": "john", "token": "x", "send": "y", "code": "1"},
+                                         native=["send"])
+        self.assertEqual([results[key].error for key in ("token", "send", "code")],
+                         ["not fillable", "not fillable", "disabled"])
+        self.assertEqual((results["user"].polls, results["code"].polls), (1, 3))
+        self.assertFalse(any([results[key].ok for key in ("token", "send", "code")]))
+        self.assertEqual(self.driver.commands.get("sendKeysToElement", 0), 0)
+        self.assertEqual(self.values()["user"], "john")
+
+    def test_click_all_selects_options_natively(self):
+        self.wrapper.get(URL)
+        results = self.wrapper.css("select[name=tags] option", eager=True).click_all()
+        self.assertEqual([result.via for result in results], ["native"] * 3)
+        self.assertEqual(self.driver.commands["clickElement"], 3)
+        self.assertEqual(self.values()["selected"], ["a", "b", "c"])
+
+    def test_fill_form_waits_for_missing_fields(self):
+        self.page.on("name", "bio", appears=0.6)
+        self.wrapper.get(URL)
+        results = self.wrapper.fill_form({"user": "john", "bio": "Hi"})
+        self.assertEqual((results["user"].polls, results["bio"].polls), (1, 3))
+        self.assertEqual(self.values()["bio"], "Hi")
+        self.assertRaises(NoSuchElementException, self.wrapper.fill_form, {"user": "jane", "none": ""})
+        self.assertEqual(self.values()["user"], "jane")
+        self.wrapper.silent = True
+        results = self.wrapper.fill_form({"none": ""}, by="css", timeout=0.1)
+        self.assertEqual(results["none"].error, "not found")
+        self.assertRaises(ValueError, self.wrapper.fill_form, {}, by="label")
+
+
+class TestFakeServer(unittest.TestCase):
+    def test_connect_runs_commands_over_http(self):
+        with FakeServer(lambda: FakeBrowser({URL: HTML})) as server:
+            wrapper = connect("chrome", server.url)
+            wrapper.get(URL)
+            self.assertEqual(wrapper.title, "Example")
+            self.assertEqual(wrapper.by_linktxt("Next", partial=True).text, "Next page")
+            self.assertEqual(len(wrapper.css("td", eager=True)), 3)
+            self.assertEqual(len(server.sessions), 1)
+            wrapper.quit()
+            self.assertEqual(len(server.sessions), 0)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestDom))
+    suite.addTests(unittest.makeSuite(TestFakeWebDriver))
+    suite.addTests(unittest.makeSuite(TestSeleniumWrapperOnFakeWebDriver))
+    suite.addTests(unittest.makeSuite(TestFillFormOnFakeWebDriver))
+    suite.addTests(unittest.makeSuite(TestFakeServer))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
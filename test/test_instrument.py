@@ -0,0 +1,127 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+import threading
+import time
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+from selenium.common.exceptions import NoSuchElementException
+from seleniumwrapper import instrument
+from seleniumwrapper.polling import Fixed, Poller
+from seleniumwrapper.wrapper import SeleniumWrapper
+from seleniumwrapper_testing.stub import StubDriver
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        self.collector = instrument.Collector()
+        self.driver = StubDriver()
+        self.wrapper = SeleniumWrapper(self.driver, timeout=0.1, poller=Poller())
+
+    def tearDown(self):
+        instrument.disable()
+
+    def test_nothing_is_replaced_while_disabled(self):
+        click = SeleniumWrapper.__dict__["click"]
+        instrument.enable(self.collector)
+        self.assertTrue(instrument.is_enabled())
+        self.assertFalse(SeleniumWrapper.__dict__["click"] is click)
+        self.wrapper.by_id("found")
+        self.assertTrue("execute" in self.driver.__dict__)
+        instrument.disable()
+        self.assertTrue(SeleniumWrapper.__dict__["click"] is click)
+        self.assertFalse("execute" in self.driver.__dict__)
+        self.wrapper.by_id("found")
+        self.assertEqual(self.collector.stats["by_id"]["calls"], 1)
+
+    def test_outermost_call_is_recorded_with_locator_commands_and_polls(self):
+        calls = []
+
+        class Hook(object):
+            def record(self, call):
+                calls.append(call)
+
+        with instrument.enabled(Hook()):
+            self.wrapper.by_id("found")
+        self.assertEqual(len(calls), 1)
+        call = calls[0]
+        self.assertEqual((call.name, call.locator, call.outcome), ("by_id", ("id", "found"), "found"))
+        self.assertEqual((call.commands, call.polls), (1, 1))
+
+    def test_missing_elements_are_recorded_as_timeout_or_silent_none(self):
+        with instrument.enabled(self.collector):
+            self.assertRaises(NoSuchElementException, self.wrapper.xpath, "//missing")
+            self.wrapper.silent = True
+            self.wrapper.by_name("missing")
+        self.assertEqual(self.collector.stats["xpath"]["outcomes"], {"timeout": 1})
+        self.assertEqual(self.collector.stats["by_name"]["outcomes"], {"silent-None": 1})
+        self.assertTrue(self.collector.stats["xpath"]["polls"] > 1)
+        slowest = [locator for locator, stat in self.collector.slowest(2)]
+        self.assertEqual(sorted(slowest), [("name", "missing"), ("xpath", "//missing")])
+
+    def test_delegated_methods_and_properties_are_recorded(self):
+        with instrument.enabled(self.collector):
+            self.wrapper.get("http://www.example.com")
+            self.assertEqual(self.wrapper.title, "stub")
+        self.assertEqual(self.collector.stats["get"]["commands"], 1)
+        self.assertEqual(self.collector.stats["title"]["outcomes"], {"ok": 1})
+
+    def test_span_counts_commands_and_polls_of_calls_in_block(self):
+        with instrument.enabled(self.collector):
+            with self.collector.span("scenario") as span:
+                self.wrapper.get("http://www.example.com")
+                self.wrapper.by_id("found")
+        self.assertEqual((span.commands, span.polls, span.outcome), (2, 1, "ok"))
+        self.assertEqual(sum(count for bound, count in self.collector.histogram("scenario")), 1)
+        stream = StringIO()
+        self.collector.dump(stream)
+        self.assertTrue("scenario" in stream.getvalue())
+        self.assertTrue("id:found" in stream.getvalue())
+
+    def test_polls_of_other_threads_are_not_counted(self):
+        calls = []
+
+        class Hook(object):
+            def record(self, call):
+                calls.append(call)
+
+        class SlowDriver(StubDriver):
+            def execute(self, driver_command, params=None):
+                time.sleep(0.05)
+                return StubDriver.execute(self, driver_command, params)
+
+        poller = Fixed(0.01)
+        waiting = SeleniumWrapper(StubDriver(), timeout=0.3, silent=True, poller=poller)
+        wrapper = SeleniumWrapper(SlowDriver(), timeout=0.1, poller=poller)
+        with instrument.enabled(Hook()):
+            thread = threading.Thread(target=waiting.by_id, args=("missing",))
+            thread.start()
+            time.sleep(0.1)
+            wrapper.by_id("found")
+            thread.join()
+        polls = dict((call.locator[1], call.polls) for call in calls)
+        self.assertEqual(polls["found"], 1)
+        self.assertTrue(polls["missing"] > 10)
+
+    def test_span_keeps_profile_if_asked(self):
+        collector = instrument.Collector(profile=True)
+        with collector.span("scenario"):
+            sorted(range(10))
+        self.assertTrue("scenario" in collector.profiles)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestInstrument))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
@@ -0,0 +1,127 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+import mock
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from seleniumwrapper import locator
+from seleniumwrapper.locator import tag, xpath_literal, css_string, css_identifier
+from seleniumwrapper.wrapper import SeleniumWrapper
+
+
+class TestEscaping(unittest.TestCase):
+    def test_xpath_literal_picks_quotes_or_concat(self):
+        self.assertEqual(xpath_literal("plain"), "'plain'")
+        self.assertEqual(xpath_literal("O'Neil"), '"O\'Neil"')
+        self.assertEqual(xpath_literal("say \"hi\" O'Neil"), "concat('say \"hi\" O', \"'\", 'Neil')")
+
+    def test_css_escapes(self):
+        self.assertEqual(css_string('a "b" \\c'), '"a \\"b\\" \\\\c"')
+        self.assertEqual(css_identifier("a.b:c"), "a\\.b\\:c")
+        self.assertEqual(css_identifier("1st"), "\\31 st")
+
+    def test_by_text_with_quote(self):
+        self.assertEqual(locator.by_text("O'Neil"), ("xpath", './/*[text()="O\'Neil"]'))
+
+    def test_invalid_names_are_rejected(self):
+        self.assertRaises(ValueError, tag, "a]|//b")
+        self.assertRaises(ValueError, tag("a").attr, "x=1", "y")
+
+    def test_by_tag_and_by_text_keep_taking_xpath_steps(self):
+        self.assertEqual(locator.by_tag("svg:rect", {}), ("xpath", ".//svg:rect"))
+        self.assertEqual(locator.by_tag("td[2]", {"class": "price"}), ("xpath", ".//td[2][@class='price']"))
+        self.assertEqual(locator.by_text("hoge", "td[2]"), ("xpath", ".//td[2][text()='hoge']"))
+        self.assertEqual(locator.by_tag("td", {}), ("css", "td"))
+
+
+class TestLocator(unittest.TestCase):
+    def test_attribute_predicates_compile_to_css(self):
+        self.assertEqual(tag("input").attr("type", "checkbox").attr("name", "agree").compile(),
+                         ("css", 'input[type="checkbox"][name="agree"]'))
+        self.assertEqual(tag("a").contains("href", "example").has_class("nav").compile(),
+                         ("css", 'a[href*="example"].nav'))
+        self.assertEqual(locator.by_tag("div", {}), ("css", "div"))
+
+    def test_alternatives_expand_to_selector_list(self):
+        compiled = tag("input").attr("type", ("submit", "button")).attr("value", "Go").compile()
+        self.assertEqual(compiled, ("css", 'input[type="submit"][value="Go"], input[type="button"][value="Go"]'))
+
+    def test_text_predicates_fall_back_to_xpath(self):
+        compiled = tag("td").has_class("name").text("x", partial=True).compile()
+        self.assertEqual(compiled, ("xpath", ".//td[contains(concat(' ', normalize-space(@class), ' '), ' name ')"
+                                             " and contains(text(), 'x')]"))
+        compiled = tag("a").attr("rel", ("next", "prev")).compile()
+        self.assertEqual(compiled[0], "css")
+        compiled = tag("a").attr("rel", ("next", "prev")).text("more").compile()
+        self.assertEqual(compiled, ("xpath", ".//a[(@rel='next' or @rel='prev') and text()='more']"))
+
+    def test_endswith_in_xpath(self):
+        compiled = tag("img").endswith("src", ".png").text("x").compile()
+        self.assertEqual(compiled[1], ".//img[substring(@src, string-length(@src) - string-length('.png') + 1)='.png'"
+                                      " and text()='x']")
+
+    def test_union(self):
+        self.assertEqual((tag("a") | tag("b").attr("id", "x")).compile(), ("css", 'a, b[id="x"]'))
+        self.assertEqual((tag("a") | tag("b").text("x")).compile(), ("xpath", ".//a | .//b[text()='x']"))
+        self.assertEqual((tag("a") | tag("b")).attr("id", "x").compile(), ("css", 'a[id="x"], b[id="x"]'))
+
+    def test_button_is_restricted_to_value(self):
+        # the value condition applies to both input types, not only to type=button.
+        type, target = locator.button("Login")
+        self.assertEqual(type, "xpath")
+        self.assertEqual(target, ".//input[(@type='submit' or @type='button') and @value='Login']"
+                                 " | .//button[text()='Login']")
+
+    def test_compile_is_memoised(self):
+        login = tag("input").attr("value", "Login")
+        self.assertTrue(login.compile() is login.compile())
+        self.assertTrue(locator.href("example") is locator.href("example"))
+        self.assertTrue(locator.by_tag("a", {"id": 1}) is locator.by_tag("a", {"id": "1"}))
+
+
+class TestSeleniumWrapperLocator(unittest.TestCase):
+    def setUp(self):
+        self.mock = mock.Mock(WebDriver)
+        self.elem = mock.Mock(WebElement)
+
+    def test_locate_and_aliases_use_compiled_locators(self):
+        self.mock.find_element_by_css_selector.return_value = self.elem
+        self.mock.find_element_by_xpath.return_value = self.elem
+        wrapper = SeleniumWrapper(self.mock)
+        self.assertTrue(wrapper.locate(tag("a").has_class("nav")).unwrap is self.elem)
+        self.assertEqual(self.mock.find_element_by_css_selector.call_args, mock.call("a.nav"))
+        wrapper.checkbox(name="agree")
+        self.assertEqual(self.mock.find_element_by_css_selector.call_args,
+                         mock.call('input[name="agree"][type="checkbox"]'))
+        wrapper.by_text("O'Neil", "td")
+        self.assertEqual(self.mock.find_element_by_xpath.call_args, mock.call('.//td[text()="O\'Neil"]'))
+
+    def test_partial_by_linktxt_keeps_timeout(self):
+        wrapper = SeleniumWrapper(self.mock)
+        with mock.patch.object(SeleniumWrapper, "waitfor") as waitfor:
+            wrapper.by_linktxt("more", partial=True, timeout=7)
+        self.assertEqual(waitfor.call_args, mock.call("partial_link_text", "more", False, 7))
+
+    def test_find_many_accepts_locators(self):
+        self.mock.execute_script.return_value = [self.elem]
+        wrapper = SeleniumWrapper(self.mock)
+        found = wrapper.find_many({"nav": tag("a").has_class("nav")})
+        self.assertTrue(found["nav"].unwrap is self.elem)
+        self.assertEqual(self.mock.execute_script.call_args[0][2], [["css", "a.nav", False]])
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestEscaping))
+    suite.addTests(unittest.makeSuite(TestLocator))
+    suite.addTests(unittest.makeSuite(TestSeleniumWrapperLocator))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
@@ -0,0 +1,137 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+import itertools
+import threading
+import time
+import mock
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.polling import Poller, Fixed, Backoff, Jittered
+from seleniumwrapper.wrapper import SeleniumWrapper
+
+
+def take(iterable, n):
+    return list(itertools.islice(iterable, n))
+
+
+class TestPollingStrategies(unittest.TestCase):
+    def test_fixed_uses_call_site_interval_unless_interval_is_given(self):
+        self.assertEqual(take(Fixed().intervals(0.2), 3), [0.2, 0.2, 0.2])
+        self.assertEqual(take(Fixed(0.05).intervals(0.2), 2), [0.05, 0.05])
+
+    def test_backoff_multiplies_interval_up_to_cap(self):
+        self.assertEqual(take(Backoff(factor=2, cap=0.5).intervals(0.1), 4), [0.1, 0.2, 0.4, 0.5])
+
+    def test_jittered_randomizes_intervals_of_wrapped_poller(self):
+        poller = Jittered(jitter=0.5, poller=Backoff(cap=1.0))
+        for expected, interval in zip([0.1, 0.2, 0.4, 0.8, 1.0], take(poller.intervals(0.1), 5)):
+            self.assertTrue(expected * 0.5 <= interval <= expected * 1.5, interval)
+
+
+class TestPoller(unittest.TestCase):
+    def test_poll_returns_first_truthy_value_and_counts_polls(self):
+        values = iter([None, False, NoSuchElementException(), "found"])
+
+        def condition():
+            value = next(values)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        poller = Poller()
+        self.assertEqual(poller.poll("site", 1, condition, 0.001), "found")
+        self.assertEqual(poller.stats["site"]["calls"], 1)
+        self.assertEqual(poller.stats["site"]["polls"], 4)
+
+    def test_poll_raise_TimeoutException_after_timeout(self):
+        poller = Poller()
+        self.assertRaises(TimeoutException, poller.poll, "site", 0.05, lambda: None, 0.01)
+        self.assertTrue(poller.stats["site"]["waited"] >= 0.05)
+        poller.reset()
+        self.assertEqual(poller.stats, {})
+
+    def test_poll_reads_and_sleeps_with_given_clock(self):
+        clock = VirtualClock(100)
+        poller = Backoff(0.1, factor=2, cap=1.0)
+        started = time.time()
+        self.assertRaises(TimeoutException, poller.poll, "site", 60, lambda: None, 0.1, clock=clock)
+        self.assertTrue(time.time() - started < 1)
+        self.assertEqual(clock.time(), 160)
+        self.assertEqual(poller.stats["site"]["waited"], 60)
+        # 0.1 + 0.2 + 0.4 + 0.8 and 1.0 up to 60 seconds
+        self.assertEqual(poller.stats["site"]["polls"], 4 + 59 + 1)
+
+    def test_stats_are_counted_by_threads_sharing_poller(self):
+        poller = Poller()
+
+        def run():
+            for i in range(200):
+                values = iter([None, "found"])
+                poller.poll("site", 1, lambda: next(values), 0, clock=VirtualClock())
+        threads = [threading.Thread(target=run) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(poller.stats["site"]["calls"], 1600)
+        self.assertEqual(poller.stats["site"]["polls"], 3200)
+
+    def test_poll_does_not_ignore_other_exceptions(self):
+        def condition():
+            raise TypeError()
+
+        self.assertRaises(TypeError, Poller().poll, "site", 1, condition, 0.01)
+
+
+class TestSeleniumWrapperPolling(unittest.TestCase):
+    def test_waits_of_wrapper_are_routed_through_its_poller(self):
+        mocked_driver = mock.Mock(WebDriver)
+        mocked_driver.find_element_by_id.side_effect = [NoSuchElementException(), mock.Mock(WebElement)]
+        poller = Fixed(0.001)
+        wrapper = SeleniumWrapper(mocked_driver, poller=poller)
+        element = wrapper.by_id("hoge")
+        self.assertEqual(poller.stats["waitfor"]["polls"], 2)
+        self.assertTrue(element.poller is poller)
+
+    def test_clock_of_wrapper_is_passed_to_its_poller_and_spawned_wrappers(self):
+        mocked_driver = mock.Mock(WebDriver)
+        mocked_element = mock.Mock(WebElement)
+        mocked_driver.find_element_by_id.return_value = mocked_element
+        mocked_element.location = {"x": 0, "y": 0}
+        mocked_element.click.side_effect = WebDriverException("Other element would receive the click")
+        clock = VirtualClock()
+        wrapper = SeleniumWrapper(mocked_driver, timeout=30, clock=clock)
+        element = wrapper.by_id("hoge")
+        self.assertTrue(element.clock is clock)
+        self.assertRaises(WebDriverException, element.click, presleep=1, postsleep=1)
+        # presleep, one polling interval to see it stopped, then the clickable
+        # wait times out (postsleep is skipped).
+        self.assertAlmostEqual(clock.time(), 1 + 0.01 + 30, 6)
+        self.assertRaises(AttributeError, setattr, wrapper, "clock", 1)
+
+    def test_poller_property_raise_AttributeError_if_none_poller_given(self):
+        wrapper = SeleniumWrapper(mock.Mock(WebDriver))
+        self.assertRaises(AttributeError, setattr, wrapper, 'poller', 1)
+        poller = Backoff()
+        wrapper.poller = poller
+        self.assertTrue(wrapper.poller is poller)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestPollingStrategies))
+    suite.addTests(unittest.makeSuite(TestPoller))
+    suite.addTests(unittest.makeSuite(TestSeleniumWrapperPolling))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
@@ -0,0 +1,141 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+import threading
+import time
+import mock
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.pool import SessionPool
+from seleniumwrapper.wrapper import SeleniumWrapper
+
+
+class FakeDriverFactory(object):
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        driver = mock.Mock(WebDriver)
+        driver.window_handles = ["main"]
+        self.drivers.append(driver)
+        return driver
+
+
+class TestSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.factory = FakeDriverFactory()
+
+    def test_pool_raise_if_invalid_arguments_are_given(self):
+        self.assertRaises(TypeError, SessionPool, 1)
+        self.assertRaises(ValueError, SessionPool, self.factory, min_size=3, max_size=2)
+
+    def test_checkout_returns_wrapper_with_pool_options(self):
+        pool = SessionPool(self.factory, timeout=1, silent=True)
+        wrapper = pool.checkout()
+        self.assertIsInstance(wrapper, SeleniumWrapper)
+        self.assertEqual(wrapper.timeout, 1)
+        self.assertTrue(wrapper.silent)
+        self.assertEqual(pool.size, 1)
+
+    def test_checked_in_session_is_reset_and_reused(self):
+        pool = SessionPool(self.factory)
+        driver = pool.checkout().unwrap
+        driver.window_handles = ["main", "popup"]
+        pool.checkin(driver)
+        driver.switch_to_window.assert_has_calls([mock.call("popup"), mock.call("main")])
+        driver.close.assert_called_once_with()
+        driver.delete_all_cookies.assert_called_once_with()
+        driver.get.assert_called_once_with("about:blank")
+        self.assertTrue(pool.checkout().unwrap is driver)
+        self.assertEqual(len(self.factory.drivers), 1)
+
+    def test_checkout_raise_TimeoutException_if_all_sessions_are_in_use(self):
+        pool = SessionPool(self.factory, max_size=1)
+        pool.checkout()
+        self.assertRaises(TimeoutException, pool.checkout, 0.05)
+
+    def test_checkout_waits_for_checkout_timeout_not_wrapper_timeout(self):
+        pool = SessionPool(self.factory, max_size=1, timeout=10, checkout_timeout=0.05)
+        self.assertEqual(pool.checkout().timeout, 10)
+        started = time.time()
+        self.assertRaises(TimeoutException, pool.checkout)
+        self.assertTrue(time.time() - started < 1)
+
+    def test_checkout_waits_for_checkin_of_other_thread(self):
+        pool = SessionPool(self.factory, max_size=1)
+        wrapper = pool.checkout()
+        timer = threading.Timer(0.05, pool.checkin, [wrapper])
+        timer.start()
+        self.assertTrue(pool.checkout(1).unwrap is wrapper.unwrap)
+        timer.join()
+
+    def test_session_is_recycled_after_max_uses(self):
+        pool = SessionPool(self.factory, max_uses=2)
+        for i in range(3):
+            with pool.session():
+                pass
+        self.assertEqual(len(self.factory.drivers), 2)
+        self.factory.drivers[0].quit.assert_called_once_with()
+        self.assertEqual(pool.stats["recycled"], 1)
+
+    def test_session_is_recycled_after_max_age(self):
+        pool = SessionPool(self.factory, max_age=0)
+        with pool.session():
+            pass
+        self.factory.drivers[0].quit.assert_called_once_with()
+
+    def test_idle_session_is_recycled_at_checkout_after_max_age(self):
+        clock = VirtualClock()
+        pool = SessionPool(self.factory, max_age=60, clock=clock)
+        wrapper = pool.checkout()
+        pool.checkin(wrapper)
+        clock.advance(60)
+        self.assertFalse(pool.checkout().unwrap is wrapper.unwrap)
+        wrapper.unwrap.quit.assert_called_once_with()
+        self.assertEqual(pool.stats["recycled"], 1)
+        self.assertEqual(pool.size, 1)
+
+    def test_unhealthy_session_is_replaced_at_checkout(self):
+        pool = SessionPool(self.factory)
+        wrapper = pool.checkout()
+        pool.checkin(wrapper)
+        type(wrapper.unwrap).current_url = mock.PropertyMock(side_effect=WebDriverException)
+        self.assertFalse(pool.checkout().unwrap is wrapper.unwrap)
+        self.assertEqual(pool.stats["discarded"], 1)
+
+    def test_session_is_discarded_if_webdriver_exception_was_raised(self):
+        pool = SessionPool(self.factory)
+        try:
+            with pool.session():
+                raise WebDriverException()
+        except WebDriverException:
+            pass
+        self.factory.drivers[0].quit.assert_called_once_with()
+        self.assertEqual(pool.size, 0)
+
+    def test_pool_prespawns_min_size_sessions_in_background(self):
+        pool = SessionPool(self.factory, min_size=2)
+        endtime = time.time() + 2
+        while pool.idle < 2 and time.time() < endtime:
+            time.sleep(0.01)
+        self.assertEqual(pool.idle, 2)
+        pool.close()
+        for driver in self.factory.drivers:
+            driver.quit.assert_called_once_with()
+        self.assertRaises(WebDriverException, pool.checkout)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestSessionPool))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
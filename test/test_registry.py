@@ -0,0 +1,107 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+import os
+import subprocess
+import mock
+import selenium.webdriver
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+import seleniumwrapper
+from seleniumwrapper import registry
+from seleniumwrapper.registry import DriverRegistry
+
+# modules which importing seleniumwrapper should not import, and the budget
+# of seconds spent in seleniumwrapper's own modules (compiling included).
+LAZY_MODULES = ("numpy", "lxml", "multiprocessing", "seleniumwrapper.aio", "seleniumwrapper.dom",
+                "seleniumwrapper.snapshot", "seleniumwrapper.table", "seleniumwrapper.transport")
+IMPORT_BUDGET = 0.25
+
+
+class TestDriverRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = DriverRegistry()
+
+    def test_paths_are_resolved_on_first_use(self):
+        self.registry.register("Remote", "selenium.webdriver:Remote",
+                               "selenium.webdriver.common.desired_capabilities:DesiredCapabilities.FIREFOX")
+        self.registry.register("missing", "selenium.webdriver:NoSuchDriver")
+        self.assertTrue("remote" in self.registry)
+        self.assertTrue(self.registry.driver("REMOTE") is selenium.webdriver.Remote)
+        self.assertEqual(self.registry.capabilities("remote"), DesiredCapabilities.FIREFOX)
+        self.assertRaises(ValueError, self.registry.driver, "missing")
+        self.assertRaises(ValueError, self.registry.capabilities, "missing")
+        self.assertEqual(self.registry.names(), ["missing", "remote"])
+
+    def test_capabilities_are_copied(self):
+        self.registry.register("hoge", capabilities={"browserName": "hoge"})
+        self.registry.capabilities("hoge")["browserName"] = "fuga"
+        self.assertEqual(self.registry.capabilities("hoge"), {"browserName": "hoge"})
+        self.assertRaises(ValueError, self.registry.driver, "hoge")
+        self.assertEqual(self.registry.names(local=True), [])
+
+    def test_register_raise_if_nothing_is_given(self):
+        self.assertRaises(ValueError, self.registry.register, "hoge")
+        self.assertRaises(TypeError, self.registry.register, 1, "selenium.webdriver:Remote")
+
+    def test_create_and_connect_use_registered_drivers(self):
+        driver = mock.Mock(WebDriver)
+        factory = mock.Mock(return_value=driver)
+        registry.register("custom", factory, {"browserName": "custom"})
+        try:
+            self.assertTrue(seleniumwrapper.create("Custom", "arg", key="value").unwrap is driver)
+            factory.assert_called_once_with("arg", key="value")
+            with mock.patch("selenium.webdriver.Remote") as remote:
+                remote.return_value = driver
+                seleniumwrapper.connect("custom", "http://localhost:4444/wd/hub", {"version": "1"})
+                remote.assert_called_once_with("http://localhost:4444/wd/hub",
+                                               {"browserName": "custom", "version": "1"})
+        finally:
+            registry.unregister("custom")
+        self.assertRaises(ValueError, seleniumwrapper.create, "custom")
+
+    def test_connect_phantomjs(self):
+        with mock.patch("selenium.webdriver.Remote") as remote:
+            remote.return_value = mock.Mock(WebDriver)
+            seleniumwrapper.connect("PhantomJS", "http://localhost:4444/wd/hub")
+            remote.assert_called_once_with("http://localhost:4444/wd/hub", DesiredCapabilities.PHANTOMJS)
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "-X importtime is required")
+class TestImportTime(unittest.TestCase):
+    def test_import_seleniumwrapper_is_cheap(self):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(seleniumwrapper.__file__)))
+        command = [sys.executable, "-X", "importtime", "-c", "import seleniumwrapper"]
+        output = subprocess.check_output(command, stderr=subprocess.STDOUT, env=env).decode("utf-8")
+        own, imported = 0, set()
+        for line in output.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            fields = line[len("import time:"):].split("|")
+            if not fields[0].strip().isdigit():
+                continue
+            name = fields[2].strip()
+            imported.add(name)
+            if name.startswith("seleniumwrapper"):
+                own += int(fields[0])
+        self.assertTrue("seleniumwrapper.wrapper" in imported)
+        for name in LAZY_MODULES:
+            self.assertFalse(name in imported, "{0} is imported by seleniumwrapper".format(name))
+        self.assertTrue(own / 1e6 < IMPORT_BUDGET, "seleniumwrapper took {0} us to import".format(own))
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestDriverRegistry))
+    suite.addTests(unittest.makeSuite(TestImportTime))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
@@ -0,0 +1,127 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+import io
+import json
+import os
+import tempfile
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from seleniumwrapper import scripts
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.polling import Fixed
+from seleniumwrapper.replay import Recorder, ReplayError, ReplayWebDriver, Replayer, load, record
+from seleniumwrapper.wrapper import SeleniumWrapper
+from seleniumwrapper_testing.fake import FakeBrowser, FakePage, FakeWebDriver
+
+URL = "http://www.example.com/"
+HTML = """<html><head><title>Example</title></head><body>
+<ul><li>one</li><li>two</li></ul>
+<button id="go">Go</button>
+</body></html>"""
+
+
+def scenario(wrapper):
+    wrapper.get(URL)
+    go = wrapper.by_id("go")
+    go.click(scripted=True)
+    return [wrapper.title, wrapper.css("li", eager=True).texts(), go.text]
+
+
+class TestRecordAndReplay(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".ndjson")
+        os.close(handle)
+        self.clock = VirtualClock()
+        page = FakePage(HTML).on("id", "go", appears=0.3, blocked=0.5)
+        self.driver = FakeWebDriver({URL: page}, clock=self.clock, latency=0.01)
+        self.wrapper = SeleniumWrapper(self.driver, poller=Fixed(0.1), clock=self.clock)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def recorded(self):
+        recorder = record(self.wrapper, self.path)
+        result = scenario(self.wrapper)
+        recorder.close()
+        self.assertTrue(self.driver.command_executor is self.driver.browser)
+        return result, recorder
+
+    def replay(self, speed=0.0, clock=None):
+        clock = clock or VirtualClock()
+        driver = ReplayWebDriver(self.path, speed=speed, clock=clock)
+        return driver, SeleniumWrapper(driver, poller=Fixed(0.1), clock=clock)
+
+    def test_replay_answers_with_recorded_responses(self):
+        result, recorder = self.recorded()
+        driver, wrapper = self.replay()
+        self.assertEqual(scenario(wrapper), result)
+        self.assertEqual(result, ["Example", ["one", "two"], "Go"])
+        self.assertEqual(driver.replayer.remaining, 0)
+        self.assertEqual(sum(driver.commands.values()), recorder.recorded)
+        self.assertEqual(driver.commands["findElement"], self.driver.commands["findElement"])
+
+    def test_recording_is_compact_and_append_only(self):
+        self.recorded()
+        self.recorded()
+        with io.open(self.path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        sources = [line["v"] for line in lines if "d" in line]
+        # scripts are written once per recording
+        self.assertEqual(sources.count(scripts.CLICK_READINESS), 2)
+        self.assertTrue(all(["script" not in line.get("p", {}) for line in lines]))
+        self.assertEqual(len(load(self.path)), len(lines) - len(sources))
+
+    def test_replay_at_recorded_speed(self):
+        started = self.clock.time()
+        self.recorded()
+        recorded = self.clock.time() - started
+        clock = VirtualClock()
+        driver, wrapper = self.replay(speed=1.0, clock=clock)
+        scenario(wrapper)
+        # latency of the fake replayed, polling sleeps of the wrapper taken again.
+        self.assertAlmostEqual(clock.time(), recorded, 6)
+        driver, wrapper = self.replay(speed=0.0)
+        scenario(wrapper)
+        self.assertTrue(wrapper.clock.time() < recorded)
+
+    def test_replay_raise_if_commands_differ(self):
+        self.recorded()
+        driver, wrapper = self.replay()
+        wrapper.get(URL)
+        self.assertRaises(ReplayError, wrapper.get, URL + "other")
+        replayer = Replayer(self.path, strict=False)
+        WebDriver(replayer, {}).get(URL + "other")
+        replayer.position = len(replayer.records)
+        self.assertRaises(ReplayError, replayer.execute, "getTitle", {})
+
+    def test_recorder_from_new_session_and_errors_of_executor(self):
+        browser = FakeBrowser({URL: HTML}, clock=self.clock)
+        with Recorder(browser, self.path) as recorder:
+            driver = WebDriver(recorder, {"browserName": "fake"})
+            driver.get(URL)
+            self.assertRaises(NoSuchElementException, driver.find_element_by_id, "none")
+            recorder.executor = None
+            self.assertRaises(AttributeError, driver.get, URL)
+        records = load(self.path)
+        self.assertEqual([r["c"] for r in records], ["newSession", "get", "findElement", "get"])
+        self.assertTrue(records[-1]["e"].startswith("AttributeError"))
+        replayed = ReplayWebDriver(self.path)
+        replayed.get(URL)
+        self.assertRaises(NoSuchElementException, replayed.find_element_by_id, "none")
+        self.assertRaises(WebDriverException, replayed.get, URL)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestRecordAndReplay))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
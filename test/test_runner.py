@@ -0,0 +1,109 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+import os
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from seleniumwrapper.runner import run_parallel, Result
+from seleniumwrapper_testing.stub import StubDriver
+
+
+def double(wrapper, item):
+    return item * 2
+
+
+def crash_once(wrapper, item):
+    if wrapper.unwrap is StubDriver.created[0]:
+        raise WebDriverException("session crashed")
+    return item
+
+
+def sleep_for(wrapper, item):
+    time.sleep(item)
+    return item
+
+
+def exit_on_zero(wrapper, item):
+    if not item:
+        os._exit(1)
+    return item
+
+
+class TestRunParallel(unittest.TestCase):
+    def setUp(self):
+        del StubDriver.created[:]
+
+    def test_results_are_streamed_with_each_worker_keeping_its_wrapper(self):
+        run = run_parallel(double, range(20), driver=StubDriver, workers=3)
+        results = list(run)
+        self.assertTrue(all(isinstance(result, Result) and result.ok for result in results))
+        self.assertEqual(sorted(result.value for result in results), [i * 2 for i in range(20)])
+        self.assertTrue(len(StubDriver.created) <= 3)
+        self.assertTrue(all(driver.quitted for driver in StubDriver.created))
+        self.assertEqual(run.stats.completed, 20)
+        self.assertTrue(run.stats.throughput > 0)
+
+    def test_driver_args_are_passed_to_driver(self):
+        list(run_parallel(double, [1], driver=StubDriver, workers=1, driver_args=("hoge",)))
+        self.assertEqual(StubDriver.created[0].label, "hoge")
+
+    def test_task_is_retried_with_fresh_driver_on_WebDriverException(self):
+        run = run_parallel(crash_once, [1], driver=StubDriver, workers=1)
+        result = next(run)
+        self.assertTrue(result.ok, result)
+        self.assertEqual(result.attempts, 2)
+        self.assertEqual(len(StubDriver.created), 2)
+        self.assertTrue(StubDriver.created[0].quitted)
+        self.assertEqual(run.stats.retries, 1)
+
+    def test_task_fails_after_retries(self):
+        run = run_parallel(crash_once, [1], driver=StubDriver, workers=1, retries=0)
+        result = next(run)
+        self.assertIsInstance(result.error, WebDriverException)
+        self.assertEqual(run.stats.failed, 1)
+
+    def test_task_running_longer_than_task_timeout_is_reported(self):
+        run = run_parallel(sleep_for, [0.5, 0], driver=StubDriver, workers=2, task_timeout=0.1)
+        results = dict((result.input, result) for result in run)
+        self.assertTrue(results[0].ok)
+        self.assertIsInstance(results[0.5].error, TimeoutException)
+        self.assertEqual(run.stats.timeouts, 1)
+
+    def test_timed_out_worker_is_replaced(self):
+        for mode in ("thread", "process"):
+            run = run_parallel(sleep_for, [5, 0, 0], driver=StubDriver, workers=1, mode=mode, task_timeout=0.3)
+            started = time.time()
+            results = dict((result.input, result) for result in run)
+            self.assertTrue(time.time() - started < 4, mode)
+            self.assertIsInstance(results[5].error, TimeoutException)
+            self.assertTrue(results[0].ok)
+            self.assertEqual(run.stats.completed, 2)
+
+    def test_task_of_dead_worker_process_is_reported_as_failed(self):
+        run = run_parallel(exit_on_zero, [0, 1, 2], driver=StubDriver, workers=1, mode="process")
+        results = dict((result.input, result) for result in run)
+        self.assertIsInstance(results[0].error, RuntimeError)
+        self.assertEqual([results[1].value, results[2].value], [1, 2])
+        self.assertEqual(run.stats.failed, 1)
+
+    def test_process_mode(self):
+        results = list(run_parallel(double, range(6), driver=StubDriver, workers=2, mode="process"))
+        self.assertEqual(sorted(result.value for result in results), [0, 2, 4, 6, 8, 10])
+
+    def test_invalid_mode_raise_ValueError(self):
+        self.assertRaises(ValueError, run_parallel, double, [1], StubDriver, 1, "greenlet")
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestRunParallel))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
@@ -9,6 +9,8 @@ import collections
 import mock
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import WebDriverException, StaleElementReferenceException
+from seleniumwrapper import scripts
 from seleniumwrapper.wrapper import SeleniumWrapper, SeleniumContainerWrapper
 
 
@@ -113,9 +115,133 @@ class TestSeleniumContainerWrapper(unittest.TestCase):
         self.assertEqual(container[-1].timeout, 1)
         self.assertTrue(container[-1].silent)
 
+
+class TestSeleniumContainerWrapperBulkRead(unittest.TestCase):
+    def setUp(self):
+        self.driver = mock.Mock(WebDriver)
+        self.elements = [mock.Mock(WebElement) for i in range(3)]
+        for element in self.elements:
+            element.parent = self.driver
+
+    def test_texts_reads_all_elements_in_one_script(self):
+        self.driver.execute_script.return_value = ["a", "b", "c"]
+        container = SeleniumContainerWrapper(self.elements)
+        self.assertEqual(container.texts(), ["a", "b", "c"])
+        self.assertEqual(self.driver.execute_script.call_count, 1)
+        args = self.driver.execute_script.call_args[0]
+        self.assertEqual(args[1:], (self.elements, "text", None))
+        for element in self.elements:
+            self.assertFalse(element.get_attribute.called)
+
+    def test_attrs_returns_list_for_a_name_and_columns_for_names(self):
+        container = SeleniumContainerWrapper(self.elements)
+        self.driver.execute_script.return_value = [["/a"], ["/b"], ["/c"]]
+        self.assertEqual(container.attrs("href"), ["/a", "/b", "/c"])
+        self.assertEqual(self.driver.execute_script.call_args[0][2:], ("attr", ["href"]))
+        self.driver.execute_script.return_value = [["x", True], ["y", False], ["z", True]]
+        self.assertEqual(container.props(["value", "checked"]),
+                         {"value": ["x", "y", "z"], "checked": [True, False, True]})
+
+    def test_bulk_read_of_empty_container_does_not_execute_script(self):
+        container = SeleniumContainerWrapper([])
+        self.assertEqual(container.texts(), [])
+        self.assertEqual(container.css_values(["color"]), {"color": []})
+
+    def test_bulk_read_raise_if_container_holds_other_than_webelement(self):
+        container = SeleniumContainerWrapper([1, 2])
+        self.assertRaises(TypeError, container.locations)
+
+
+def state(**kwargs):
+    ready = {"x": 0, "y": 0, "displayed": True, "blocker": None, "disabled": False, "readonly": False,
+             "click": True, "fill": True}
+    ready.update(kwargs)
+    return ready
+
+
+class TestSeleniumContainerWrapperActions(unittest.TestCase):
+    def setUp(self):
+        self.driver = mock.Mock(WebDriver)
+        self.elements = [mock.Mock(WebElement) for i in range(3)]
+        for element in self.elements:
+            element.parent = self.driver
+        self.states = dict((element, [state()]) for element in self.elements)
+        self.acted = []
+        self.stale = set()
+
+        def execute_script(script, elements, *args):
+            if self.stale.intersection(elements):
+                raise StaleElementReferenceException("stale element reference")
+            if script == scripts.ACTION_READINESS:
+                return [self.states[e][0] if len(self.states[e]) == 1 else self.states[e].pop(0)
+                        for e in elements]
+            self.acted.append((elements, args))
+            return [None] * len(elements)
+
+        self.driver.execute_script.side_effect = execute_script
+
+    def test_click_all_checks_readiness_of_all_elements_in_one_script_per_poll(self):
+        results = SeleniumContainerWrapper(self.elements).click_all(timeout=1)
+        self.assertTrue(all(result.ok and result.via == "script" for result in results))
+        self.assertEqual(self.driver.execute_script.call_count, 3)
+        self.assertEqual(self.acted, [(self.elements, ("click", None))])
+        self.assertEqual([result.element.unwrap for result in results], self.elements)
+        for element in self.elements:
+            self.assertFalse(element.click.called)
+
+    def test_click_all_clicks_natively_only_elements_which_need_it(self):
+        self.states[self.elements[1]] = [state(click=False)]
+        results = SeleniumContainerWrapper(self.elements).click_all(timeout=1)
+        self.assertEqual([result.via for result in results], ["script", "native", "script"])
+        self.elements[1].click.assert_called_once_with()
+        self.assertEqual(self.acted[0][0], [self.elements[0], self.elements[2]])
+
+    def test_click_all_waits_for_moving_or_covered_elements_and_reports_failures(self):
+        self.states[self.elements[0]] = [state(x=0), state(x=10), state(x=10)]
+        self.states[self.elements[2]] = [state(blocker="<div class='overlay'>")]
+        results = SeleniumContainerWrapper(self.elements).click_all(timeout=0.2)
+        self.assertEqual([result.ok for result in results], [True, True, False])
+        self.assertEqual(results[0].polls, 3)
+        self.assertEqual(results[2].error, "covered by <div class='overlay'>")
+
+    def test_click_all_retries_failed_native_clicks(self):
+        self.elements[0].click.side_effect = [WebDriverException("other element would receive the click"), None]
+        results = SeleniumContainerWrapper(self.elements[:1]).click_all(timeout=1, native=True)
+        self.assertTrue(results[0].ok)
+        self.assertEqual(self.elements[0].click.call_count, 2)
+
+    def test_click_all_gives_up_elements_gone_stale_after_native_click(self):
+        self.states[self.elements[0]] = [state(click=False)]
+        self.states[self.elements[1]] = [state(blocker="<div>")]
+        self.states[self.elements[2]] = [state(blocker="<div>"), state()]
+        self.elements[0].click.side_effect = lambda: self.stale.add(self.elements[1])
+        results = SeleniumContainerWrapper(self.elements).click_all(timeout=1)
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertEqual(results[1].error, "stale element reference")
+        self.assertEqual(self.acted, [([self.elements[2]], ("click", None))])
+
+    def test_fill_all_sets_values_with_one_script_or_send_keys(self):
+        self.states[self.elements[2]] = [state(fill=False)]
+        results = SeleniumContainerWrapper(self.elements).fill_all(["a", "b", "c"], timeout=1)
+        self.assertEqual(self.acted, [([self.elements[0], self.elements[1]], ("fill", ["a", "b"]))])
+        self.elements[2].clear.assert_called_once_with()
+        self.elements[2].send_keys.assert_called_once_with("c")
+        self.assertEqual([result.via for result in results], ["script", "script", "native"])
+
+    def test_fill_all_skips_read_only_elements_and_validates_values(self):
+        self.states[self.elements[0]] = [state(readonly=True)]
+        container = SeleniumContainerWrapper(self.elements)
+        self.assertRaises(ValueError, container.fill_all, ["a"])
+        results = container.fill_all("x", timeout=0.1, clear=False)
+        self.assertEqual((results[0].ok, results[0].error), (False, "read only"))
+        self.assertEqual(self.acted[0][1], ("append", ["x", "x"]))
+
+
 def suite():
     suite = unittest.TestSuite()
     suite.addTests(unittest.makeSuite(TestSeleniumContainerWrapper))
+    suite.addTests(unittest.makeSuite(TestSeleniumContainerWrapperBulkRead))
+    suite.addTests(unittest.makeSuite(TestSeleniumContainerWrapperActions))
     return suite
 
 
@@ -9,6 +9,8 @@ try:
     import StringIO
 except ImportError:
     from io import StringIO
+import collections
+import math
 import mock
 import seleniumwrapper
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
@@ -16,6 +18,11 @@ from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from seleniumwrapper.wrapper import SeleniumWrapper
 from seleniumwrapper.wrapper import SeleniumContainerWrapper
+from seleniumwrapper.wrapper import Performance, Timing, Memory, Navigation
+from seleniumwrapper.transport import PooledRemoteConnection
+from seleniumwrapper import scripts
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.polling import Fixed
 from selenium.common.exceptions import (
     NoSuchElementException,WebDriverException, ElementNotVisibleException, TimeoutException
 )
@@ -45,6 +52,18 @@ class TestSeleniumWrapperFactory(unittest.TestCase):
         p2.stop()
         p.stop()
 
+    def test_connect_uses_pooled_transport_if_pool_size_is_given(self):
+        p = mock.patch("selenium.webdriver.Remote")
+        m = p.start()
+        p2 = mock.patch("seleniumwrapper.wrapper.SeleniumWrapper")
+        p2.start()
+        seleniumwrapper.connect("firefox", "http://localhost:4444/wd/hub", pool_size=2)
+        executor = m.call_args[0][0]
+        self.assertTrue(isinstance(executor, PooledRemoteConnection))
+        self.assertEqual(executor.pool.port, 4444)
+        p2.stop()
+        p.stop()
+
 
 class TestSeleniumWrapper(unittest.TestCase):
     def test_init_raise_if_driver_is_not_a_webdriver_object(self):
@@ -75,6 +94,19 @@ class TestSeleniumWrapper(unittest.TestCase):
         self.assertTrue(isinstance(wrapped_element, SeleniumWrapper))
         self.assertFalse(isinstance(unwrapped_element, SeleniumWrapper))
 
+    def test_wrapper_should_chain_wrapping_with_its_options(self):
+        mocked_driver = mock.Mock(WebDriver)
+        mocked_driver.find_element_by_id = lambda given: mock.Mock(WebElement)
+        mocked_driver.switch_to_active_element = lambda: mock.Mock(WebElement)
+        clock = VirtualClock()
+        poller = Fixed(0.1)
+        wrapper = SeleniumWrapper(mocked_driver, timeout=1, silent=True, poller=poller, clock=clock)
+        for i in range(2):
+            for wrapped in (wrapper.find_element_by_id("hoge"), wrapper.switch_to_active_element()):
+                self.assertEqual((wrapped.timeout, wrapped.silent), (1, True))
+                self.assertTrue(wrapped.poller is poller)
+                self.assertTrue(wrapped.clock is clock)
+
     def test_wrapper_should_respond_to_waitfor(self):
         mocked_driver = mock.Mock(WebDriver)
         mocked_driver.find_element_by_id = lambda target: target
@@ -101,6 +133,67 @@ class TestSeleniumWrapper(unittest.TestCase):
         self.assertEqual(wrapper.num, 100)
         self.assertTrue(isinstance(wrapper.hoge, SeleniumWrapper), wrapper.hoge)
 
+    def test_wrapper_should_pass_keyword_arguments_to_delegated_methods(self):
+        mocked_element = mock.Mock(WebElement)
+
+        class Hoge(WebDriver):
+            def __init__(self):
+                pass
+
+            def find(self, by, value=None):
+                return mocked_element if value else by
+
+        wrapper = SeleniumWrapper(Hoge())
+        self.assertIsInstance(wrapper.find("id", value="hoge"), SeleniumWrapper)
+        self.assertEqual(wrapper.find("id"), "id")
+
+    def test_wrapper_should_respect_attributes_overridden_by_instance(self):
+        class Hoge(WebDriver):
+            def __init__(self):
+                pass
+
+            def num(self):
+                return 100
+
+        driver = Hoge()
+        wrapper = SeleniumWrapper(driver)
+        self.assertEqual(wrapper.num(), 100)
+        driver.num = lambda: 200
+        self.assertEqual(wrapper.num(), 200)
+
+    def test_wrapper_should_not_install_descriptors_for_missing_attributes(self):
+        wrapper = SeleniumWrapper(mock.Mock(WebElement))
+        size = len(SeleniumWrapper.__dict__)
+        for i in range(100):
+            self.assertFalse(hasattr(wrapper, "missing{0}".format(i)))
+        self.assertEqual(len(SeleniumWrapper.__dict__), size)
+
+    def test_wrapper_should_delegate_static_and_class_methods(self):
+        mocked_element = mock.Mock(WebElement)
+
+        class Hoge(WebDriver):
+            def __init__(self):
+                pass
+
+            @staticmethod
+            def static(value):
+                return mocked_element if value else value
+
+            @classmethod
+            def klass(cls):
+                return mocked_element
+
+        wrapper = SeleniumWrapper(Hoge())
+        for i in range(2):
+            self.assertIsInstance(wrapper.static(1), SeleniumWrapper)
+            self.assertEqual(wrapper.static(0), 0)
+            self.assertIsInstance(wrapper.klass(), SeleniumWrapper)
+
+    def test_wrapper_should_not_have_instance_dict(self):
+        wrapper = SeleniumWrapper(mock.Mock(WebDriver))
+        self.assertRaises(AttributeError, setattr, wrapper, 'hoge', 1)
+        self.assertRaises(AttributeError, setattr, SeleniumContainerWrapper([]), 'hoge', 1)
+
     def test_click_should_raise_if_element_is_not_stopping_for_time_seconds(self):
         class Hoge(object):
             def __init__(self):
@@ -129,10 +222,14 @@ class TestSeleniumWrapper(unittest.TestCase):
     def test_click_should_raise_if_element_is_not_displayed_for_timeout_seconds(self):
         mocked_element = mock.Mock(WebElement)
         mocked_element.is_displayed = lambda: False
-        mocked_element.value_of_css_property.return_value = 0
         mocked_element.location = {"x": 0, "y": 0}
+        mocked_element.parent.execute_script.return_value = {
+            "x": 0, "y": 0, "displayed": False, "blockers": [],
+            "visibility": "hidden", "display": "block", "height": "10px", "width": "10px"}
         wrapper = SeleniumWrapper(mocked_element)
         self.assertRaises(ElementNotVisibleException, wrapper.click, **{'timeout': 0.5})
+        mocked_element.parent.execute_script.assert_called_once_with(scripts.CLICK_READINESS, mocked_element)
+        self.assertFalse(mocked_element.value_of_css_property.called)
 
     def test_click_should_raise_if_other_exception_is_thrown(self):
         def dummy():
@@ -143,6 +240,40 @@ class TestSeleniumWrapper(unittest.TestCase):
         wrapper = SeleniumWrapper(mocked_element)
         self.assertRaises(TypeError, wrapper.click, **{'timeout': 0.5})
 
+    def test_scripted_click_checks_readiness_in_one_script_per_poll(self):
+        mocked_element = mock.Mock(WebElement)
+        mocked_element.parent.execute_script.return_value = {
+            "x": 0, "y": 0, "displayed": True, "blockers": [],
+            "visibility": "visible", "display": "block", "height": "10px", "width": "10px"}
+        wrapper = SeleniumWrapper(mocked_element)
+        wrapper.click(timeout=0.5, scripted=True)
+        self.assertEqual(mocked_element.parent.execute_script.call_count, 2)
+        mocked_element.click.assert_called_once_with()
+        self.assertFalse(mocked_element.is_displayed.called)
+        self.assertEqual(len(mocked_element.mock_calls), 3)
+
+    def test_scripted_click_should_raise_if_element_is_not_displayed_for_timeout_seconds(self):
+        mocked_element = mock.Mock(WebElement)
+        mocked_element.parent.execute_script.return_value = {
+            "x": 0, "y": 0, "displayed": False, "blockers": [],
+            "visibility": "hidden", "display": "block", "height": "10px", "width": "10px"}
+        wrapper = SeleniumWrapper(mocked_element)
+        self.assertRaises(ElementNotVisibleException, wrapper.click, **{'timeout': 0.1, 'scripted': True})
+        self.assertFalse(mocked_element.click.called)
+
+    def test_scripted_click_should_raise_with_intercepting_elements(self):
+        mocked_element = mock.Mock(WebElement)
+        mocked_element.parent.execute_script.return_value = {
+            "x": 0, "y": 0, "displayed": True, "blockers": ['<div class="overlay">'],
+            "visibility": "visible", "display": "block", "height": "10px", "width": "10px"}
+        wrapper = SeleniumWrapper(mocked_element)
+        try:
+            wrapper.click(timeout=0.1, scripted=True)
+            self.fail("WebDriverException was not raised")
+        except WebDriverException as e:
+            self.assertTrue('<div class="overlay">' in e.msg, e.msg)
+        self.assertFalse(mocked_element.click.called)
+
     def test_unwrap_return_its_wrapped_object(self):
         mocked_element = mock.Mock(WebElement)
         wrapper = SeleniumWrapper(mocked_element)
@@ -233,6 +364,97 @@ class TestSeleniumWrapperAliases(unittest.TestCase):
         self.assertIsInstance(wrapper.parent, SeleniumWrapper)
 
 
+class TestSeleniumWrapperFindMany(unittest.TestCase):
+    def setUp(self):
+        mocky = mock.Mock(WebDriver)
+        self.mock = mocky
+
+    def test_find_many_resolves_all_locators_in_one_script(self):
+        elem1, elem2, elem3 = [mock.Mock(WebElement) for i in range(3)]
+        self.mock.execute_script.return_value = [elem1, [elem2, elem3]]
+        wrapper = SeleniumWrapper(self.mock)
+        found = wrapper.find_many({"login": ("css", "#login"), "links": ("tag", "a", True)})
+        self.assertEqual(self.mock.execute_script.call_count, 1)
+        self.assertIsInstance(found["login"], SeleniumWrapper)
+        self.assertEqual(found["login"].unwrap, elem1)
+        self.assertEqual(len(found["links"]), 2)
+
+    def test_find_many_polls_only_pending_locators(self):
+        elem1, elem2 = mock.Mock(WebElement), mock.Mock(WebElement)
+        self.mock.execute_script.side_effect = [[elem1, None], [elem2]]
+        wrapper = SeleniumWrapper(self.mock)
+        found = wrapper.find_many({"a": ("id", "a")})
+        self.assertEqual(found["a"].unwrap, elem1)
+        locators = collections.OrderedDict([("a", ("id", "a")), ("b", ("name", "b"))])
+        self.mock.execute_script.side_effect = [[elem1, None], [elem2]]
+        found = wrapper.find_many(locators, timeout=1)
+        self.assertEqual(found["b"].unwrap, elem2)
+        self.assertEqual(self.mock.execute_script.call_args[0][2], [["name", "b", False]])
+
+    def test_find_many_raise_or_return_None_for_missing_locators(self):
+        self.mock.execute_script.return_value = [None]
+        wrapper = SeleniumWrapper(self.mock)
+        self.assertRaises(NoSuchElementException, wrapper.find_many, {"a": ("id", "a")}, timeout=0.1)
+        wrapper.silent = True
+        self.assertEqual(wrapper.find_many({"a": ("id", "a")}, timeout=0.1), {"a": None})
+
+    def test_find_many_raise_ValueError_if_unknown_locator_type_is_given(self):
+        wrapper = SeleniumWrapper(self.mock)
+        self.assertRaises(ValueError, wrapper.find_many, {"a": ("jquery", "#a")})
+        self.assertFalse(self.mock.execute_script.called)
+
+
+class TestSeleniumWrapperObserve(unittest.TestCase):
+    def setUp(self):
+        mocky = mock.Mock(WebDriver)
+        self.mock = mocky
+
+    def test_waitfor_waits_with_one_async_script_in_observe_mode(self):
+        mock_elem = mock.Mock(WebElement)
+        self.mock.execute_async_script.return_value = mock_elem
+        wrapper = SeleniumWrapper(self.mock, observe=True)
+        found = wrapper.by_id("hoge", timeout=2)
+        self.assertIsInstance(found, SeleniumWrapper)
+        self.assertTrue(found.observe)
+        self.assertEqual(self.mock.execute_async_script.call_args[0][1:], (None, "id", "hoge", False, 2))
+        self.assertFalse(self.mock.find_element_by_id.called)
+
+    def test_waitfor_raise_or_return_None_if_observer_timed_out(self):
+        self.mock.execute_async_script.return_value = None
+        wrapper = SeleniumWrapper(self.mock, observe=True)
+        self.assertRaises(NoSuchElementException, wrapper.css, "#hoge", timeout=0.1)
+        wrapper.silent = True
+        self.assertIsNone(wrapper.css("#hoge", timeout=0.1))
+        self.mock.execute_async_script.side_effect = TimeoutException
+        self.assertIsNone(wrapper.css("#hoge", timeout=0.1))
+
+    def test_waitfor_restores_script_timeout_after_observing(self):
+        self.mock.execute_async_script.return_value = mock.Mock(WebElement)
+        wrapper = SeleniumWrapper(self.mock, observe=True)
+        wrapper.by_id("hoge", timeout=2)
+        wrapper.set_script_timeout(60)
+        wrapper.by_id("hoge", timeout=2)
+        self.assertEqual(self.mock.set_script_timeout.call_args_list,
+                         [mock.call(7), mock.call(60), mock.call(7), mock.call(60)])
+
+    def test_waitfor_sends_script_timeout_only_if_it_changes(self):
+        self.mock.execute_async_script.return_value = mock.Mock(WebElement)
+        wrapper = SeleniumWrapper(self.mock, observe=True)
+        for i in range(3):
+            wrapper.by_id("hoge", timeout=2)
+        wrapper.by_id("hoge", timeout=5)
+        self.assertEqual(self.mock.set_script_timeout.call_args_list, [mock.call(7), mock.call(10)])
+        self.assertEqual(self.mock.execute_async_script.call_count, 4)
+
+    def test_waitfor_falls_back_to_polling_if_async_script_is_not_supported(self):
+        mock_elem = mock.Mock(WebElement)
+        self.mock.execute_async_script.side_effect = WebDriverException
+        self.mock.find_elements_by_xpath.return_value = [mock_elem]
+        wrapper = SeleniumWrapper(self.mock, observe=True)
+        self.assertIsInstance(wrapper.xpath("//a", eager=True), SeleniumContainerWrapper)
+        self.assertTrue(self.mock.find_elements_by_xpath.called)
+
+
 class TestSeleniumWrapperJavascriptSupport(unittest.TestCase):
     def setUp(self):
         mocky = mock.Mock(WebDriver)
@@ -268,6 +490,13 @@ class TestSeleniumWrapperOptions(unittest.TestCase):
         wrapper.timeout = 1
         self.assertEqual(wrapper.timeout, 1)
 
+    def test_observe_property_raise_AttributeError_if_none_bool_given(self):
+        wrapper = SeleniumWrapper(self.mock)
+        self.assertFalse(wrapper.observe)
+        self.assertRaises(AttributeError, setattr, wrapper, 'observe', 1)
+        wrapper.observe = True
+        self.assertTrue(wrapper.observe)
+
     def test_silent_property_raise_AttributeError_if_none_bool_given(self):
         wrapper = SeleniumWrapper(self.mock)
         try:
@@ -276,11 +505,163 @@ class TestSeleniumWrapperOptions(unittest.TestCase):
             pass
 
 
+class TestSeleniumWrapperStream(unittest.TestCase):
+    def setUp(self):
+        self.mock = mock.Mock(WebDriver)
+        self.items = [mock.Mock(WebElement) for i in range(25)]
+        self.more = []
+        self.calls = []
+
+        def execute_script(script, scope, type, target, offset, size, scroll):
+            self.calls.append((offset, size, scroll))
+            if scroll:
+                self.items.extend(self.more)
+                self.more = []
+            if size is None:
+                return len(self.items)
+            return self.items[offset:offset + size]
+
+        self.mock.execute_script.side_effect = execute_script
+        self.wrapper = SeleniumWrapper(self.mock, timeout=0.1)
+
+    def test_stream_fetches_chunks_lazily(self):
+        stream = self.wrapper.stream("css", "li", chunk_size=10)
+        self.assertEqual(self.calls, [])
+        elements = iter(stream)
+        first = next(elements)
+        self.assertTrue(isinstance(first, SeleniumWrapper))
+        self.assertEqual(self.calls, [(0, None, False), (0, 10, False)])
+        self.assertEqual(len(list(elements)), 24)
+        self.assertEqual([len(chunk) for chunk in stream.chunks()], [10, 10, 5])
+        self.assertEqual(self.mock.execute_script.call_args[0][0], scripts.SLICE)
+
+    def test_len_counts_without_fetching_elements(self):
+        self.assertEqual(len(self.wrapper.stream("xpath", "//li")), 25)
+        self.assertEqual(self.calls, [(0, None, False)])
+
+    def test_stream_scrolls_to_load_more_and_stops_at_limit(self):
+        self.more = [mock.Mock(WebElement) for i in range(10)]
+        stream = self.wrapper.stream("css", "li", chunk_size=20, autoscroll=True, settle=0.1)
+        self.assertEqual(len(list(stream)), 35)
+        self.assertEqual(len([call for call in self.calls if call[2]]), 2)
+        self.assertEqual(len(list(self.wrapper.stream("css", "li", chunk_size=20, limit=30))), 30)
+
+    def test_stream_of_missing_elements(self):
+        del self.items[:]
+        self.assertRaises(NoSuchElementException, list, self.wrapper.stream("css", "li"))
+        self.wrapper.silent = True
+        self.assertEqual(list(self.wrapper.stream("css", "li")), [])
+        self.assertRaises(ValueError, self.wrapper.stream, "hoge", "li")
+
+
+class TestSeleniumWrapperPerformance(unittest.TestCase):
+    def setUp(self):
+        self.mock = mock.Mock(WebDriver)
+        self.wrapper = SeleniumWrapper(self.mock, timeout=3)
+
+    def test_performance_is_read_with_one_async_script_waiting_for_load(self):
+        self.mock.execute_async_script.return_value = {"timing": {"loadEventEnd": 1500}}
+        performance = self.wrapper.performance
+        self.assertEqual(performance.timing.loadEventEnd, 1500)
+        self.assertEqual(self.mock.set_script_timeout.call_args_list, [mock.call(3)])
+        self.mock.execute_async_script.assert_called_once_with(scripts.PERFORMANCE, True)
+        self.assertFalse(self.mock.execute_script.called)
+
+    def test_get_performance_without_waiting(self):
+        self.mock.execute_async_script.return_value = {"timing": {"loadEventEnd": 0}}
+        performance = self.wrapper.get_performance(timeout=10, wait=False)
+        self.assertEqual(performance.timing.loadEventEnd, 0)
+        self.assertEqual(self.mock.set_script_timeout.call_args_list, [mock.call(10)])
+        self.mock.execute_async_script.assert_called_once_with(scripts.PERFORMANCE, False)
+
+    def test_get_performance_restores_script_timeout_set_through_wrapper(self):
+        self.mock.execute_async_script.return_value = {"timing": {}}
+        self.wrapper.set_script_timeout(60)
+        self.wrapper.get_performance()
+        self.assertEqual(self.mock.set_script_timeout.call_args_list, [mock.call(60), mock.call(3), mock.call(60)])
+
+    def test_get_performance_raise_if_page_is_not_loaded_for_timeout_seconds(self):
+        self.mock.execute_async_script.side_effect = TimeoutException()
+        self.assertRaises(TimeoutException, self.wrapper.get_performance)
+
+    def test_get_performance_raise_if_timing_api_is_not_supported(self):
+        self.mock.execute_async_script.return_value = None
+        self.assertRaises(AttributeError, self.wrapper.get_performance)
+
+    def test_get_performance_polls_if_async_script_is_not_supported(self):
+        self.mock.execute_async_script.side_effect = WebDriverException("unsupported")
+        self.mock.execute_script.side_effect = [True, 0, 1500, {"timing": {"loadEventEnd": 1500}}]
+        performance = self.wrapper.get_performance(timeout=1)
+        self.assertEqual(performance.timing.loadEventEnd, 1500)
+        self.assertEqual(self.mock.execute_script.call_count, 4)
+
+    def test_performance_raise_if_element_is_wrapped(self):
+        wrapper = SeleniumWrapper(mock.Mock(WebElement))
+        self.assertRaises(AttributeError, wrapper.get_performance)
+
+
+class TestPerformanceRecords(unittest.TestCase):
+    def timing(self, start, load):
+        return Timing({"navigationStart": start, "requestStart": start + 10, "responseStart": start + 30,
+                       "loadEventStart": start + load - 5, "loadEventEnd": start + load, "toJSON": {}})
+
+    def test_records_keep_attribute_names_and_iteration(self):
+        performance = Performance({"timing": {"navigationStart": 1000, "loadEventEnd": 1500},
+                                   "memory": {"usedJSHeapSize": 10.0},
+                                   "navigation": {"type": 1, "redirectCount": 0}})
+        timing = performance.timing
+        self.assertEqual((timing.navigationStart, timing.loadEventEnd), (1000, 1500))
+        self.assertRaises(KeyError, getattr, timing, "domComplete")
+        self.assertEqual(list(timing), ["navigationStart", "loadEventEnd"])
+        self.assertEqual(timing.__dict__["loadEventEnd"], 1500)
+        self.assertEqual(performance.memory.usedJSHeapSize, 10.0)
+        self.assertEqual(dict(performance.navigation.__dict__), {"type": 1, "redirectCount": 0})
+        self.assertRaises(AttributeError, setattr, timing, "hoge", 1)
+        self.assertRaises(AttributeError, getattr, timing, "toJSON")
+
+    def test_values_which_are_not_numbers_are_kept(self):
+        navigation = Navigation({"type": "navigate", "redirectCount": "2"})
+        self.assertEqual((navigation.type, navigation.redirectCount), ("navigate", 2))
+        self.assertEqual(Navigation.summary([navigation])["type"]["count"], 0)
+
+    def test_columns_of_samples(self):
+        samples = [self.timing(1000, 500), self.timing(2000, 700)]
+        columns = Timing.columns(samples, ["navigationStart"])
+        self.assertEqual(list(columns["navigationStart"]), [1000.0, 2000.0])
+        self.assertEqual(list(Timing.phases(samples)["request"]), [20.0, 20.0])
+        self.assertEqual(sorted(Memory.columns([Memory({})])), ["jsHeapSizeLimit", "totalJSHeapSize",
+                                                                "usedJSHeapSize"])
+
+    def test_summary_gives_percentiles_per_phase(self):
+        samples = [self.timing(1000 * i, 100 * i) for i in range(1, 11)]
+        summary = Timing.summary(samples, percentiles=(50, 90))
+        self.assertEqual(summary["total"]["count"], 10)
+        self.assertEqual((summary["total"]["min"], summary["total"]["max"]), (100, 1000))
+        self.assertEqual(summary["total"]["p50"], 550.0)
+        self.assertEqual(summary["total"]["p90"], 910.0)
+        self.assertEqual(summary["load"]["mean"], 5.0)
+        self.assertEqual(Navigation.summary([])["type"]["p50"], None)
+
+    def test_phases_of_samples_missing_fields_are_left_out(self):
+        samples = [self.timing(1000, 500), Timing({"navigationStart": 1000})]
+        total = list(Timing.phases(samples)["total"])
+        self.assertEqual(total[0], 500.0)
+        self.assertTrue(math.isnan(total[1]))
+        summary = Timing.summary(samples)
+        self.assertEqual(summary["total"]["count"], 1)
+        self.assertEqual(summary["total"]["min"], 500)
+
+
 def suite():
     suite = unittest.TestSuite()
     suite.addTests(unittest.makeSuite(TestSeleniumWrapperAliases))
     suite.addTests(unittest.makeSuite(TestSeleniumWrapper))
+    suite.addTests(unittest.makeSuite(TestSeleniumWrapperFindMany))
+    suite.addTests(unittest.makeSuite(TestSeleniumWrapperObserve))
     suite.addTests(unittest.makeSuite(TestSeleniumWrapperJavascriptSupport))
+    suite.addTests(unittest.makeSuite(TestSeleniumWrapperStream))
+    suite.addTests(unittest.makeSuite(TestSeleniumWrapperPerformance))
+    suite.addTests(unittest.makeSuite(TestPerformanceRecords))
     return suite
 
 
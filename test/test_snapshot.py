@@ -0,0 +1,165 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+from selenium.common.exceptions import (NoSuchElementException, InvalidSelectorException,
+                                        StaleElementReferenceException)
+from seleniumwrapper import snapshot
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.locator import tag
+from seleniumwrapper.snapshot import Snapshot, SnapshotElement, SnapshotContainer
+from seleniumwrapper.wrapper import SeleniumWrapper, SeleniumContainerWrapper
+from seleniumwrapper_testing.fake import FakePage, FakeWebDriver
+
+URL = "http://www.example.com/"
+HTML = """<html><head><title>Example</title></head><body>
+<div id="main" class="content">
+  <!-- navigation -->
+  <ul class="nav">
+    <li><a href="/a" class="item">First  item</a></li>
+    <li><a href="/b" class="item selected">Second item</a></li>
+    <li><a href="/c.pdf">Third</a></li>
+  </ul>
+  <img src="/logo.png" alt="logo">
+  <form><input type="text" name="q"><input type="submit" value="Search"></form>
+</div>
+<p id="late">Late</p>
+</body></html>"""
+
+
+class TestSnapshot(unittest.TestCase):
+    parser = "dom"
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.page = FakePage(HTML)
+        self.driver = FakeWebDriver({URL: self.page}, clock=self.clock)
+        self.wrapper = SeleniumWrapper(self.driver, timeout=1, clock=self.clock)
+        self.wrapper.get(URL)
+
+    def take(self, wrapper=None):
+        return (wrapper or self.wrapper).snapshot(self.parser)
+
+    def test_snapshot_is_read_with_one_command_and_queried_without_commands(self):
+        shot = self.take()
+        self.assertEqual(shot.parser, self.parser)
+        before = self.driver.browser.total
+        links = shot.css("ul.nav a", eager=True)
+        self.assertIsInstance(links, SnapshotContainer)
+        self.assertEqual(links.texts(), ["First item", "Second item", "Third"])
+        self.assertEqual(links.attrs("href"), ["/a", "/b", "/c.pdf"])
+        self.assertEqual(links.attrs(["href", "class"])["class"], ["item", "item selected", None])
+        self.assertEqual(shot.by_class("selected").text, "Second item")
+        self.assertEqual(shot.by_id("main").tag_name, "div")
+        self.assertEqual(shot.by_name("q").attr("type"), "text")
+        self.assertEqual(shot.by_linktxt("First item").get_attribute("href"), "/a")
+        self.assertEqual(shot.by_linktxt("Sec", partial=True).attr("href"), "/b")
+        self.assertEqual(shot.href(".pdf").text, "Third")
+        self.assertEqual(shot.img(alt="logo").attr("src"), "/logo.png")
+        self.assertEqual(shot.button("Search").attr("type"), "submit")
+        self.assertEqual(shot.by_text("Third", "a").attr("href"), "/c.pdf")
+        self.assertEqual(shot.by_tag("input", type="text").attr("name"), "q")
+        self.assertEqual(len(shot.xpath("//li", eager=True)), 3)
+        self.assertEqual(shot.locate(tag("a").has_class("item"), eager=True).size, 2)
+        self.assertEqual(self.driver.browser.total, before)
+
+    def test_finders_of_elements_search_descendants(self):
+        nav = self.take().css("ul.nav")
+        self.assertEqual(len(nav.by_tag("li", eager=True)), 3)
+        self.assertEqual(nav.xpath("./li[2]/a").text, "Second item")
+        self.assertEqual(nav.parent.attr("id"), "main")
+        self.assertEqual(nav.css("a", eager=True)[1:].texts(), ["Second item", "Third"])
+        self.assertEqual(nav.css("a").html, '<a href="/a" class="item">First  item</a>')
+
+    def test_selectors_of_locators_find_the_same_elements_with_either_parser(self):
+        shot = self.take()
+        located = [(tag("a").startswith("href", "/").endswith("href", ".pdf"), ["/c.pdf"]),
+                   (tag("a").contains("class", "sel") | tag("a").text("Third"), ["/b", "/c.pdf"]),
+                   (tag("a").has_class("item").text("Second", partial=True), ["/b"]),
+                   (tag("a").attr("class", ("item", "item selected")), ["/a", "/b"])]
+        for query, hrefs in located:
+            self.assertEqual(shot.locate(query, eager=True).attrs("href"), hrefs, query)
+        self.assertEqual(shot.css("#main > ul.nav li > a[href^='/']", eager=True).size, 3)
+        self.assertEqual(shot.xpath("//ul/li[a[contains(@href, '.pdf')]]").text, "Third")
+        self.assertEqual(shot.xpath("//li[position() > 1]/a", eager=True).texts(), ["Second item", "Third"])
+        self.assertEqual(shot.by_tag("li[2]").text, "Second item")
+        self.assertEqual(shot.xpath("//ul[count(li) = 3]").attr("class"), "nav")
+
+    def test_missing_elements_and_invalid_selectors(self):
+        shot = self.take()
+        self.assertRaises(NoSuchElementException, shot.by_id, "missing")
+        self.assertRaises(InvalidSelectorException, shot.xpath, "//li[")
+        self.wrapper.silent = True
+        self.assertIsNone(shot.by_id("missing"))
+        self.assertIsNone(shot.css("p.none", eager=True))
+
+    def test_elements_are_resolved_to_live_elements_with_one_command(self):
+        self.page.on("id", "late", appears=5)
+        self.wrapper.get(URL)
+        shot = self.take()
+        self.assertRaises(NoSuchElementException, shot.by_id, "late")
+        before = self.driver.commands["executeScript"]
+        links = shot.css("a", eager=True).live
+        self.assertIsInstance(links, SeleniumContainerWrapper)
+        self.assertEqual(self.driver.commands["executeScript"], before + 1)
+        self.assertEqual([links[i].get_attribute("href") for i in range(3)], ["/a", "/b", "/c.pdf"])
+        submit = shot.button("Search").live
+        self.assertIsInstance(submit, SeleniumWrapper)
+        self.assertTrue(submit.clock is self.clock)
+        self.assertEqual(submit.tag_name, "input")
+
+    def test_snapshot_of_element_is_relative_to_it(self):
+        form = self.wrapper.by_tag("form")
+        shot = self.take(form)
+        self.assertIsNone(shot.by_name("q").parent.parent)
+        self.assertEqual(shot.by_name("q").parent.tag_name, "form")
+        self.assertEqual(shot.by_name("q").live.get_attribute("name"), "q")
+        self.assertRaises(NoSuchElementException, shot.by_id, "main")
+
+    def test_live_raise_if_page_changed(self):
+        self.page.on("css", "li", removed=1)
+        self.wrapper.get(URL)
+        item = self.take().css("li a")
+        self.clock.advance(1)
+        self.assertRaises(StaleElementReferenceException, lambda: item.live)
+
+
+@unittest.skipIf("lxml" not in snapshot._TREES, "lxml and cssselect are required")
+class TestLxmlSnapshot(TestSnapshot):
+    parser = "lxml"
+
+
+class TestSnapshotParser(unittest.TestCase):
+    def test_unknown_parser_raise_ValueError(self):
+        wrapper = SeleniumWrapper(FakeWebDriver({URL: HTML}))
+        wrapper.get(URL)
+        self.assertRaises(ValueError, wrapper.snapshot, "html5lib")
+        self.assertIsInstance(wrapper.snapshot(), Snapshot)
+        self.assertIsInstance(wrapper.snapshot().by_id("main"), SnapshotElement)
+
+    def test_selectors_beyond_dom_raise_InvalidSelectorException(self):
+        wrapper = SeleniumWrapper(FakeWebDriver({URL: HTML}))
+        wrapper.get(URL)
+        shot = wrapper.snapshot("dom")
+        for selector in ("li:first-child", "li:nth-child(2)", "li + li", "li ~ li"):
+            self.assertRaises(InvalidSelectorException, shot.css, selector)
+        try:
+            shot.css("li:first-child")
+        except InvalidSelectorException as e:
+            self.assertTrue("seleniumwrapper[lxml]" in e.msg)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestSnapshot))
+    suite.addTests(unittest.makeSuite(TestLxmlSnapshot))
+    suite.addTests(unittest.makeSuite(TestSnapshotParser))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
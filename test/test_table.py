@@ -0,0 +1,109 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+import io
+import json
+from selenium.common.exceptions import NoSuchElementException
+from seleniumwrapper.clock import VirtualClock
+from seleniumwrapper.locator import tag
+from seleniumwrapper.table import Table, _expand
+from seleniumwrapper.wrapper import SeleniumWrapper
+from seleniumwrapper_testing.fake import FakeWebDriver
+
+URL = "http://www.example.com/"
+HTML = """<html><body>
+<table id="prices">
+  <thead>
+    <tr><th rowspan="2">Item</th><th colspan="2">Q1</th><th>Note</th></tr>
+    <tr><th>Sales</th><th>Returns</th></tr>
+  </thead>
+  <tbody>
+    <tr><td rowspan="2"><a href="/apple">Apple</a></td><td>10</td><td>1</td><td>fresh</td></tr>
+    <tr><td colspan="2">n/a</td><td><table><tr><td>nested</td></tr></table></td></tr>
+    <tr><th>Item</th><th>Sales</th><th>Returns</th><th>Note</th></tr>
+    <tr><td>Pear</td><td>7</td></tr>
+  </tbody>
+</table>
+<table class="plain">{0}</table>
+</body></html>"""
+PLAIN = "".join(["<tr><td>{0}</td><td>{1}</td></tr>".format(i, i * i) for i in range(250)])
+
+
+class TestTable(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.driver = FakeWebDriver({URL: HTML.format(PLAIN)}, clock=self.clock)
+        self.wrapper = SeleniumWrapper(self.driver, timeout=1, clock=self.clock)
+        self.wrapper.get(URL)
+
+    def scripts(self):
+        return self.driver.commands.get("executeScript", 0)
+
+    def test_spans_are_expanded_and_headers_combined(self):
+        table = self.wrapper.table("#prices")
+        self.assertEqual(table.headers, ["Item", "Q1 / Sales", "Q1 / Returns", "Note"])
+        self.assertEqual(list(table), [["Apple", "10", "1", "fresh"],
+                                       ["Apple", "n/a", "n/a", "nested"],
+                                       ["Pear", "7", "", ""]])
+        self.assertEqual(self.scripts(), 1)
+
+    def test_links(self):
+        table = self.wrapper.table(("id", "prices"), links=True)
+        self.assertEqual(table.fields[4:], ["Item href", "Q1 / Sales href", "Q1 / Returns href", "Note href"])
+        rows = list(table.records())
+        self.assertEqual(rows[1]["Item href"], "http://www.example.com/apple")
+        self.assertEqual(rows[1]["Q1 / Sales"], "n/a")
+        self.assertIsNone(rows[2]["Note href"])
+
+    def test_rows_are_read_in_chunks(self):
+        table = self.wrapper.table(tag("table").has_class("plain"), chunk_size=100, headers=["n", "square"])
+        rows = iter(table)
+        self.assertEqual(next(rows), ["0", "0"])
+        self.assertEqual(self.scripts(), 1)
+        self.assertEqual(len(list(rows)), 249)
+        self.assertEqual(self.scripts(), 3)
+        self.assertEqual(len(list(table)), 250)
+        self.assertEqual(self.scripts(), 5)
+        self.assertEqual(self.wrapper.table(".plain", chunk_size=50).headers, ["column1", "column2"])
+        self.assertRaises(ValueError, Table, None, 0)
+
+    def test_writers_stream_to_sinks(self):
+        table = self.wrapper.table(".plain", chunk_size=64, headers=["n", "square"])
+        target = io.StringIO()
+        self.assertEqual(table.to_csv(target, buffer_size=10), 250)
+        lines = target.getvalue().splitlines()
+        self.assertEqual(lines[:2], ["n,square", "0,0"])
+        self.assertEqual(lines[-1], "249,62001")
+        target = io.StringIO()
+        self.assertEqual(self.wrapper.table("#prices").to_ndjson(target), 3)
+        first = json.loads(target.getvalue().splitlines()[0])
+        self.assertEqual(first, {"Item": "Apple", "Q1 / Sales": "10", "Q1 / Returns": "1", "Note": "fresh"})
+
+    def test_missing_table_follows_silent(self):
+        self.assertRaises(NoSuchElementException, self.wrapper.table, "#none")
+        self.wrapper.silent = True
+        self.assertIsNone(self.wrapper.table("#none"))
+
+    def test_rowspan_goes_on_across_rows(self):
+        spanning = {}
+        self.assertEqual(_expand([["a", 1, 3, None], ["b", 2, 1, "/b"]], spanning),
+                         (["a", "b", "b"], [None, "/b", "/b"]))
+        self.assertEqual(_expand([["c", 1, 1, None]], spanning)[0], ["a", "c"])
+        self.assertEqual(_expand([], spanning)[0], ["a"])
+        self.assertEqual(_expand([["d", 1, 1, None]], spanning)[0], ["d"])
+        self.assertEqual(spanning, {})
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestTable))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)
@@ -0,0 +1,121 @@
+import sys
+
+sys.path.append("./../src")
+if sys.version < '2.7':
+    import unittest2 as unittest
+else:
+    import unittest
+import csv
+import json
+import os
+import shutil
+import tempfile
+import mock
+from selenium.webdriver.remote.webdriver import WebDriver
+from seleniumwrapper import scripts
+from seleniumwrapper.sinks import NDJSONSink, CSVSink
+from seleniumwrapper.timing import TimingCollector, PAGE_FIELDS, RESOURCE_FIELDS
+from seleniumwrapper.wrapper import SeleniumWrapper
+
+PAYLOAD = {"url": "http://www.example.com/",
+           "navigation": {"fetchStart": 1, "domainLookupStart": 2, "domainLookupEnd": 3, "connectStart": 3,
+                          "connectEnd": 10, "requestStart": 11, "responseStart": 40, "responseEnd": 50,
+                          "domInteractive": 120, "domContentLoadedEventEnd": 130, "domComplete": 200,
+                          "loadEventStart": 200, "loadEventEnd": 210, "transferSize": 1000,
+                          "encodedBodySize": 900, "decodedBodySize": 3000},
+           "resources": [["http://www.example.com/a.js", "script", 60, 20, 500, 400, 1200],
+                         ["http://www.example.com/b.png", "img", 70, 30, 0, 2000, 2000]],
+           "paint": {"first-paint": 100, "first-contentful-paint": 110},
+           "longtasks": [[150, 60], [300, 80]]}
+
+
+class TestSinks(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "records")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_ndjson_sink_buffers_records_and_appends(self):
+        sink = NDJSONSink(self.path, buffer_size=2)
+        sink.write({"a": 1})
+        self.assertEqual(os.path.getsize(self.path), 0)
+        sink.write({"a": 2})
+        self.assertEqual(sink.written, 2)
+        sink.close()
+        with NDJSONSink(self.path) as sink:
+            sink.write({"a": 3})
+        with open(self.path) as f:
+            self.assertEqual([json.loads(line)["a"] for line in f], [1, 2, 3])
+
+    def test_csv_sink_writes_header_once(self):
+        with CSVSink(self.path, ("a", "b")) as sink:
+            sink.write({"a": 1, "b": 2})
+        with CSVSink(self.path, ("a", "b")) as sink:
+            sink.write([3, 4])
+        with open(self.path) as f:
+            self.assertEqual(list(csv.reader(f)), [["a", "b"], ["1", "2"], ["3", "4"]])
+
+    def test_csv_sink_writes_header_once_to_file_given_in_append_mode(self):
+        for i in range(2):
+            with open(self.path, "a") as f:
+                with CSVSink(f, ("a", "b")) as sink:
+                    sink.write([i, i])
+        with open(self.path) as f:
+            self.assertEqual(list(csv.reader(f)), [["a", "b"], ["0", "0"], ["1", "1"]])
+
+
+class TestTimingCollector(unittest.TestCase):
+    def setUp(self):
+        self.driver = mock.Mock(WebDriver)
+        self.driver.execute_script.return_value = PAYLOAD
+        self.pages = mock.Mock()
+        self.resources = mock.Mock()
+
+    def test_page_is_captured_with_one_script_and_derived(self):
+        collector = TimingCollector(self.pages)
+        record = collector.collect(SeleniumWrapper(self.driver), label="top")
+        self.driver.execute_script.assert_called_once_with(scripts.PAGE_TIMING)
+        self.assertEqual(sorted(record), sorted(PAGE_FIELDS))
+        self.assertEqual((record["ttfb"], record["dom_content_loaded"], record["load"]), (40, 130, 210))
+        self.assertEqual((record["transfer_size"], record["encoded_size"], record["decoded_size"]),
+                         (1500, 3300, 6200))
+        self.assertEqual((record["first_contentful_paint"], record["long_tasks"], record["long_task_time"]),
+                         (110, 2, 140))
+        self.pages.write.assert_called_once_with(record)
+        self.assertEqual(collector.pages, 1)
+
+    def test_long_tasks_are_none_if_not_observed(self):
+        self.driver.execute_script.return_value = dict(PAYLOAD, longtasks=None)
+        record = TimingCollector(self.pages).collect(self.driver)
+        self.assertEqual((record["long_tasks"], record["long_task_time"]), (None, None))
+
+    def test_resources_are_streamed_to_resource_sink(self):
+        collector = TimingCollector(self.pages, self.resources)
+        collector.get(self.driver, "http://www.example.com/")
+        self.driver.get.assert_called_once_with("http://www.example.com/")
+        self.assertEqual(self.resources.write.call_count, 2)
+        row = self.resources.write.call_args[0][0]
+        self.assertEqual(sorted(row), sorted(RESOURCE_FIELDS))
+        self.assertEqual((row["label"], row["initiator"], row["encoded_size"]),
+                         ("http://www.example.com/", "img", 2000))
+
+    def test_unsupported_browser_is_counted_as_failure(self):
+        self.driver.execute_script.return_value = None
+        collector = TimingCollector(self.pages)
+        self.assertEqual(collector.collect(self.driver), None)
+        self.assertEqual(collector.failures, 1)
+        self.assertFalse(self.pages.write.called)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTests(unittest.makeSuite(TestSinks))
+    suite.addTests(unittest.makeSuite(TestTimingCollector))
+    return suite
+
+
+if __name__ == "__main__":
+    s = suite()
+    unittest.TextTestRunner(verbosity=2).run(s)